@@ -1,7 +1,10 @@
 """Field name constants."""
 
+FIELD_AIP_UUID = "aip_uuid"
+FIELD_CURSOR = "cursor"
 FIELD_FILE_FORMAT = "file_format"
 FIELD_FILE_TYPE = "file_type"
+FIELD_FORMAT = "format"
 FIELD_LIMIT = "limit"
 FIELD_ORIGINAL_FILES = "original_files"
 FIELD_PUID = "puid"
@@ -9,3 +12,5 @@ FIELD_STORAGE_LOCATION = "storage_location"
 FIELD_START_DATE = "start_date"
 FIELD_END_DATE = "end_date"
 FIELD_CUMULATIVE = "cumulative"
+FIELD_GRANULARITY = "granularity"
+FIELD_COLUMNAR = "columnar"
@@ -9,13 +9,23 @@ from flask import request
 from flask_restx import Namespace
 from flask_restx import Resource
 
+from AIPscan import typesense_helpers as ts_helpers
 from AIPscan.API import fields
+from AIPscan.API.ndjson import NDJSON_PARAMS
+from AIPscan.API.ndjson import STREAM_PARAMS
+from AIPscan.API.ndjson import get_stream_limit
+from AIPscan.API.ndjson import ndjson_requested
+from AIPscan.API.ndjson import ndjson_response
 from AIPscan.Data import data
+from AIPscan.Data import data_typesense
 from AIPscan.helpers import parse_bool
 from AIPscan.helpers import parse_datetime_bound
+from AIPscan.pagination import InvalidCursor
 
 api = Namespace("data", description="Retrieve data from AIPscan to shape as you desire")
 
+MAX_PAGE_SIZE = 1000
+
 """
 data = api.model('Data', {
     'id': fields.String(required=True, description='Do we need this? An identifier for the data...'),
@@ -24,6 +34,29 @@ data = api.model('Data', {
 """
 
 
+PAGE_PARAMS = {
+    fields.FIELD_CURSOR: {
+        "description": "Cursor returned as NextCursor with the previous page",
+        "in": "query",
+        "type": "str",
+    },
+    fields.FIELD_LIMIT: {
+        "description": f"Maximum number of results (default {data.DEFAULT_PAGE_SIZE}, at most {MAX_PAGE_SIZE})",
+        "in": "query",
+        "type": "int",
+    },
+}
+
+
+def _get_page_limit():
+    """Return page size requested by the caller, within bounds."""
+    try:
+        limit = int(request.args.get(fields.FIELD_LIMIT, data.DEFAULT_PAGE_SIZE))
+    except ValueError:
+        limit = data.DEFAULT_PAGE_SIZE
+    return min(max(limit, 1), MAX_PAGE_SIZE)
+
+
 @api.route("/storage-services")
 class StorageServices(Resource):
     def get(self):
@@ -56,6 +89,7 @@ class AIPList(Resource):
                 "in": "query",
                 "type": "str",
             },
+            **STREAM_PARAMS,
         },
     )
     def get(self, storage_service_id):
@@ -66,7 +100,24 @@ class AIPList(Resource):
         end_date = parse_datetime_bound(
             request.args.get(fields.FIELD_END_DATE), upper=True
         )
-        return data.aip_file_format_overview(
+        if ndjson_requested():
+            try:
+                records, next_cursor = data.aip_file_format_overview_records(
+                    storage_service_id=storage_service_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    original_files=original_files,
+                    storage_location_id=storage_location_id,
+                    cursor=request.args.get(fields.FIELD_CURSOR),
+                    limit=get_stream_limit(),
+                )
+            except InvalidCursor as err:
+                api.abort(400, str(err))
+            return ndjson_response(records, next_cursor)
+
+        data_source = data_typesense if ts_helpers.typesense_enabled() else data
+
+        return data_source.aip_file_format_overview(
             storage_service_id=storage_service_id,
             start_date=start_date,
             end_date=end_date,
@@ -75,6 +126,89 @@ class AIPList(Resource):
         )
 
 
+@api.route("/aip-list/<storage_service_id>")
+class AIPPages(Resource):
+    @api.doc(
+        "list_aips",
+        params={
+            fields.FIELD_STORAGE_LOCATION: {
+                "description": "Storage Location ID",
+                "in": "query",
+                "type": "int",
+            },
+            **PAGE_PARAMS,
+            **NDJSON_PARAMS,
+        },
+    )
+    def get(self, storage_service_id):
+        """Return a page of AIPs, with a cursor leading to the next page."""
+        storage_location_id = request.args.get(fields.FIELD_STORAGE_LOCATION)
+        try:
+            if ndjson_requested():
+                return ndjson_response(
+                    *data.aip_list_records(
+                        storage_service_id=storage_service_id,
+                        storage_location_id=storage_location_id,
+                        cursor=request.args.get(fields.FIELD_CURSOR),
+                        limit=get_stream_limit(),
+                    )
+                )
+
+            return data.aip_list(
+                storage_service_id=storage_service_id,
+                storage_location_id=storage_location_id,
+                cursor=request.args.get(fields.FIELD_CURSOR),
+                limit=_get_page_limit(),
+            )
+        except InvalidCursor as err:
+            api.abort(400, str(err))
+
+
+@api.route("/aip-files/<aip_uuid>")
+class AIPFilePages(Resource):
+    @api.doc(
+        "list_aip_files",
+        params={
+            fields.FIELD_ORIGINAL_FILES: {
+                "description": "Return data on original files or preservation derivatives",
+                "in": "query",
+                "type": "bool",
+            },
+            **PAGE_PARAMS,
+            **NDJSON_PARAMS,
+        },
+    )
+    def get(self, aip_uuid):
+        """Return a page of an AIP's files, with a cursor leading to the next page."""
+        original_files = parse_bool(request.args.get(fields.FIELD_ORIGINAL_FILES, True))
+        stream = ndjson_requested()
+        try:
+            if stream:
+                report = data.aip_files_records(
+                    aip_uuid,
+                    original_files=original_files,
+                    cursor=request.args.get(fields.FIELD_CURSOR),
+                    limit=get_stream_limit(),
+                )
+            else:
+                report = data.aip_files(
+                    aip_uuid,
+                    original_files=original_files,
+                    cursor=request.args.get(fields.FIELD_CURSOR),
+                    limit=_get_page_limit(),
+                )
+        except InvalidCursor as err:
+            api.abort(400, str(err))
+
+        if report is None:
+            api.abort(404, f"AIP not found: {aip_uuid}")
+
+        if stream:
+            return ndjson_response(*report)
+
+        return report
+
+
 @api.route("/fmt-overview/<storage_service_id>")
 class FMTList(Resource):
     @api.doc(
@@ -118,7 +252,9 @@ class DerivativeList(Resource):
     def get(self, storage_service_id):
         """List original and derivative identifiers per AIP"""
         storage_location_id = request.args.get(fields.FIELD_STORAGE_LOCATION)
-        return data.derivative_overview(
+        data_source = data_typesense if ts_helpers.typesense_enabled() else data
+
+        return data_source.derivative_overview(
             storage_service_id=storage_service_id,
             storage_location_id=storage_location_id,
         )
@@ -9,9 +9,14 @@ from flask_restx import Namespace
 from flask_restx import Resource
 
 from AIPscan.API import fields
+from AIPscan.API.ndjson import STREAM_PARAMS
+from AIPscan.API.ndjson import get_stream_limit
+from AIPscan.API.ndjson import ndjson_requested
+from AIPscan.API.ndjson import ndjson_response
 from AIPscan.Data import report_data
 from AIPscan.helpers import parse_bool
 from AIPscan.helpers import parse_datetime_bound
+from AIPscan.pagination import InvalidCursor
 
 api = Namespace(
     "report-data", description="Retrieve data optimized for AIPscan reports"
@@ -264,6 +269,49 @@ class AgentData(Resource):
         )
 
 
+@api.route("/preservation-derivatives/<storage_service_id>")
+class PreservationDerivatives(Resource):
+    @api.doc(
+        "list_preservation_derivatives",
+        params={
+            fields.FIELD_STORAGE_LOCATION: {
+                "description": "Storage Location ID",
+                "in": "query",
+                "type": "int",
+            },
+            fields.FIELD_AIP_UUID: {
+                "description": "AIP UUID",
+                "in": "query",
+                "type": "str",
+            },
+            **STREAM_PARAMS,
+        },
+    )
+    def get(self, storage_service_id):
+        """List preservation derivatives and their original files"""
+        storage_location_id = request.args.get(fields.FIELD_STORAGE_LOCATION)
+        aip_uuid = request.args.get(fields.FIELD_AIP_UUID)
+
+        if ndjson_requested():
+            try:
+                records, next_cursor = report_data.preservation_derivatives_records(
+                    storage_service_id=storage_service_id,
+                    storage_location_id=storage_location_id,
+                    aip_uuid=aip_uuid,
+                    cursor=request.args.get(fields.FIELD_CURSOR),
+                    limit=get_stream_limit(),
+                )
+            except InvalidCursor as err:
+                api.abort(400, str(err))
+            return ndjson_response(records, next_cursor)
+
+        return report_data.preservation_derivatives(
+            storage_service_id=storage_service_id,
+            storage_location_id=storage_location_id,
+            aip_uuid=aip_uuid,
+        )
+
+
 @api.route("/storage_locations/<storage_service_id>")
 class StorageLocations(Resource):
     @api.doc(
@@ -314,6 +362,16 @@ class StorageLocationsUsageOverTime(Resource):
                 "in": "query",
                 "type": "bool",
             },
+            fields.FIELD_GRANULARITY: {
+                "description": "Period to total usage by: day (default), week, month or year",
+                "in": "query",
+                "type": "str",
+            },
+            fields.FIELD_COLUMNAR: {
+                "description": "Return one list of values per location and metric, aligned with a list of periods (True), instead of a list of locations per period (False, default)",
+                "in": "query",
+                "type": "bool",
+            },
         },
     )
     def get(self, storage_service_id):
@@ -325,9 +383,21 @@ class StorageLocationsUsageOverTime(Resource):
         cumulative = parse_bool(
             request.args.get(fields.FIELD_CUMULATIVE), default=False
         )
+        granularity = request.args.get(
+            fields.FIELD_GRANULARITY, report_data.GRANULARITY_DAY
+        )
+        if parse_bool(request.args.get(fields.FIELD_COLUMNAR), default=False):
+            return report_data.storage_locations_usage_over_time_columns(
+                storage_service_id=storage_service_id,
+                start_date=start_date,
+                end_date=end_date,
+                cumulative=cumulative,
+                granularity=granularity,
+            )
         return report_data.storage_locations_usage_over_time(
             storage_service_id=storage_service_id,
             start_date=start_date,
             end_date=end_date,
             cumulative=cumulative,
+            granularity=granularity,
         )
@@ -0,0 +1,95 @@
+"""Newline delimited JSON (NDJSON) streaming
+
+Endpoints returning large numbers of records can also stream them as
+NDJSON, one JSON record per line, when a client asks for it with
+`?format=ndjson` or an `Accept: application/x-ndjson` header. Records are
+read from the database as they are sent, so neither AIPscan nor the
+client need to hold the whole result set in memory.
+
+Results can be split into pages with the `limit` parameter. The cursor
+leading to the next page is returned in the `X-Next-Cursor` header, and
+in a `Link` header, rather than in the body, so that every line of the
+body is a record.
+"""
+
+import json
+from urllib.parse import urlencode
+
+from flask import Response
+from flask import request
+from flask import stream_with_context
+
+from AIPscan.API import fields
+
+FORMAT_NDJSON = "ndjson"
+NDJSON_MIMETYPE = "application/x-ndjson"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+NDJSON_PARAMS = {
+    fields.FIELD_FORMAT: {
+        "description": f"Set to '{FORMAT_NDJSON}' to stream results as newline delimited JSON",
+        "in": "query",
+        "type": "str",
+    },
+}
+
+# Parameters for endpoints that only page through results when streaming
+STREAM_PARAMS = {
+    **NDJSON_PARAMS,
+    fields.FIELD_CURSOR: {
+        "description": f"Cursor returned in the {NEXT_CURSOR_HEADER} header with the previous page of an NDJSON stream",
+        "in": "query",
+        "type": "str",
+    },
+    fields.FIELD_LIMIT: {
+        "description": "Maximum number of results in an NDJSON stream (default is all)",
+        "in": "query",
+        "type": "int",
+    },
+}
+
+
+def ndjson_requested():
+    """Return True if the client asked for an NDJSON response."""
+    if request.args.get(fields.FIELD_FORMAT) == FORMAT_NDJSON:
+        return True
+
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def get_stream_limit():
+    """Return the page size requested for a stream, or None for no limit."""
+    try:
+        limit = int(request.args.get(fields.FIELD_LIMIT, ""))
+    except ValueError:
+        return None
+    return max(limit, 1)
+
+
+def _next_page_url(next_cursor):
+    args = request.args.to_dict(flat=False)
+    args[fields.FIELD_CURSOR] = [next_cursor]
+    return f"{request.base_url}?{urlencode(args, doseq=True)}"
+
+
+def ndjson_response(records, next_cursor=None):
+    """Return streaming response writing one record per line.
+
+    :param records: Iterable of JSON-serializable records
+    :param next_cursor: Cursor leading to the next page (str or None)
+
+    :returns: Flask response
+    """
+
+    def generate():
+        for record in records:
+            yield json.dumps(record, default=str) + "\n"
+
+    response = Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        response.headers["Link"] = f'<{_next_page_url(next_cursor)}>; rel="next"'
+
+    return response
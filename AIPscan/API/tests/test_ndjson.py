@@ -0,0 +1,104 @@
+import json
+
+import pytest
+from flask import current_app
+
+from AIPscan.API.ndjson import NDJSON_MIMETYPE
+from AIPscan.API.ndjson import NEXT_CURSOR_HEADER
+from AIPscan.Data import data
+from AIPscan.Data import fields
+from AIPscan.Data import report_data
+from AIPscan.helpers import parse_datetime_bound
+
+PRESERVATION_DERIVATIVES_URL = "/api/report-data/preservation-derivatives/1"
+
+
+def _records(response):
+    return [json.loads(line) for line in response.data.decode().splitlines()]
+
+
+@pytest.mark.parametrize(
+    "query_string,headers",
+    [
+        ("?format=ndjson", {}),
+        ("", {"Accept": NDJSON_MIMETYPE}),
+    ],
+)
+def test_preservation_derivatives_ndjson(
+    preservation_derivatives, query_string, headers
+):
+    with current_app.test_client() as test_client:
+        response = test_client.get(
+            PRESERVATION_DERIVATIVES_URL + query_string, headers=headers
+        )
+
+    assert response.status_code == 200
+    assert response.mimetype == NDJSON_MIMETYPE
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+    report = report_data.preservation_derivatives(storage_service_id=1)
+    assert sorted(_records(response), key=lambda row: row[fields.FIELD_ID]) == sorted(
+        report[fields.FIELD_FILES], key=lambda row: row[fields.FIELD_ID]
+    )
+
+
+def test_preservation_derivatives_json(preservation_derivatives):
+    with current_app.test_client() as test_client:
+        response = test_client.get(PRESERVATION_DERIVATIVES_URL)
+
+    assert response.status_code == 200
+    assert response.json == report_data.preservation_derivatives(storage_service_id=1)
+
+
+def test_preservation_derivatives_ndjson_pages(preservation_derivatives):
+    with current_app.test_client() as test_client:
+        response = test_client.get(
+            f"{PRESERVATION_DERIVATIVES_URL}?format=ndjson&limit=1"
+        )
+
+        first_page = _records(response)
+        assert len(first_page) == 1
+
+        cursor = response.headers[NEXT_CURSOR_HEADER]
+        assert f"cursor={cursor}" in response.headers["Link"]
+        assert 'rel="next"' in response.headers["Link"]
+
+        response = test_client.get(
+            f"{PRESERVATION_DERIVATIVES_URL}?format=ndjson&limit=1&cursor={cursor}"
+        )
+
+        second_page = _records(response)
+        assert len(second_page) == 1
+        assert NEXT_CURSOR_HEADER not in response.headers
+
+    assert first_page[0][fields.FIELD_ID] < second_page[0][fields.FIELD_ID]
+
+
+def test_ndjson_invalid_cursor(preservation_derivatives):
+    with current_app.test_client() as test_client:
+        response = test_client.get(
+            f"{PRESERVATION_DERIVATIVES_URL}?format=ndjson&cursor=invalid"
+        )
+
+    assert response.status_code == 400
+
+
+def test_aip_overview_ndjson(app_with_populated_files):
+    with current_app.test_client() as test_client:
+        response = test_client.get("/api/data/aip-overview/1?format=ndjson")
+
+    assert response.mimetype == NDJSON_MIMETYPE
+
+    report = data.aip_file_format_overview(
+        storage_service_id=1,
+        start_date=parse_datetime_bound(None),
+        end_date=parse_datetime_bound(None, upper=True),
+    )
+    assert _records(response) == report[fields.FIELD_AIPS]
+
+
+def test_aip_list_ndjson(app_with_populated_files):
+    with current_app.test_client() as test_client:
+        response = test_client.get("/api/data/aip-list/1?format=ndjson")
+
+    assert _records(response) == data.aip_list(storage_service_id=1)[fields.FIELD_AIPS]
@@ -19,9 +19,13 @@ from AIPscan.models import Event
 from AIPscan.models import EventAgent
 from AIPscan.models import FetchJob
 from AIPscan.models import File
+from AIPscan.models import FileFacet
 from AIPscan.models import FileType
+from AIPscan.models import Format
 from AIPscan.models import Pipeline
 from AIPscan.models import StorageLocation
+from AIPscan.models import StorageService
+from AIPscan.models import file_facet_counts
 
 logger = get_task_logger(__name__)
 
@@ -81,7 +85,10 @@ def create_event_objects(fs_entry, file_id):
 
     :param fs_entry: mets-reader-writer FSEntry object
     :param file_id: File ID
+
+    :returns: Number of events added (int)
     """
+    events_added = 0
     for premis_event in fs_entry.get_premis_events():
         event = _extract_event_detail(premis_event, file_id)
         db.session.add(event)
@@ -92,6 +99,9 @@ def create_event_objects(fs_entry, file_id):
         ):
             db.session.execute(event_relationship)
         db.session.commit()
+        events_added += 1
+
+    return events_added
 
 
 def _extract_agent_detail(agent, storage_service_id):
@@ -183,6 +193,12 @@ def delete_aip_object(aip):
 
     :param aip: AIP model instance
     """
+    FileFacet.apply_counts(
+        aip.storage_service_id,
+        aip.storage_location_id,
+        file_facet_counts(File.aip_id == aip.id),
+        sign=-1,
+    )
     db.session.delete(aip)
     db.session.commit()
 
@@ -327,12 +343,14 @@ def _get_original_file(related_uuid):
     return File.query.filter_by(uuid=related_uuid, file_type=FileType.original).first()
 
 
-def create_file_object(file_type, fs_entry, aip_id):
+def create_file_object(file_type, fs_entry, aip):
     """Add file to database
 
     :param file_type: models.FileType enum
     :param fs_entry: mets-reader-writer FSEntry object
-    :param aip_id: AIP ID
+    :param aip: AIP object
+
+    :returns: Number of events added for the file (int)
     """
     file_info = _get_file_properties(fs_entry)
 
@@ -355,21 +373,31 @@ def create_file_object(file_type, fs_entry, aip_id):
         checksum_type=file_info.get("checksum_type"),
         checksum_value=file_info.get("checksum_value"),
         original_file_id=original_file_id,
-        aip_id=aip_id,
+        aip_id=aip.id,
+        storage_service_id=aip.storage_service_id,
+        storage_location_id=aip.storage_location_id,
+        aip_create_date=aip.create_date,
+        format_id=Format.id_for(
+            file_info.get("puid"),
+            file_info.get("file_format"),
+            file_info.get("format_version"),
+        ),
     )
 
-    logger.debug("Adding file %s %s", new_file.name, aip_id)
+    logger.debug("Adding file %s %s", new_file.name, aip.id)
 
     db.session.add(new_file)
     db.session.commit()
 
-    create_event_objects(fs_entry, new_file.id)
+    events_added = create_event_objects(fs_entry, new_file.id)
 
     if file_type == FileType.preservation:
         _add_normalization_date(new_file.id)
 
     _add_premis_object_xml(fs_entry, new_file.id)
 
+    return events_added
+
 
 def collect_mets_agents(mets):
     """Collect all of the unique agents in the METS file to write to the
@@ -389,6 +417,8 @@ def process_aip_data(aip, mets):
 
     :param aip: AIP object
     :param mets: mets-reader-writer METSDocument object
+
+    :returns: Tuple of the number of files and events added (ints)
     """
     tasks.get_mets.update_state(state="IN PROGRESS")
 
@@ -398,13 +428,24 @@ def process_aip_data(aip, mets):
 
     # Parse the original files first so that they are available as foreign keys
     # when we parse preservation and derivative files.
+    events_added = 0
     original_files = [file_ for file_ in all_files if file_.use == "original"]
     for file_ in original_files:
-        create_file_object(FileType.original, file_, aip.id)
+        events_added += create_file_object(FileType.original, file_, aip)
 
     preservation_files = [file_ for file_ in all_files if file_.use == "preservation"]
     for file_ in preservation_files:
-        create_file_object(FileType.preservation, file_, aip.id)
+        events_added += create_file_object(FileType.preservation, file_, aip)
+
+    aip.update_file_counts()
+    FileFacet.apply_counts(
+        aip.storage_service_id,
+        aip.storage_location_id,
+        file_facet_counts(File.aip_id == aip.id),
+    )
+    db.session.commit()
+
+    return len(original_files) + len(preservation_files), events_added
 
 
 def create_fetch_job(datetime_obj_start, timestamp_str, storage_server_id):
@@ -458,6 +499,7 @@ def update_fetch_job(fetch_job_id, processed_packages, total_packages_count):
     obj.total_replicas = total_replicas
     obj.total_deleted_aips = total_deleted_aips
     obj.download_end = datetime.now().replace(microsecond=0)
+    StorageService.bump_data_version(obj.storage_service_id)
     db.session.commit()
 
     return obj
@@ -7,6 +7,7 @@ import requests
 from celery.utils.log import get_task_logger
 
 from AIPscan import db
+from AIPscan import metrics
 from AIPscan import typesense_helpers
 from AIPscan.Aggregator import database_helpers
 from AIPscan.Aggregator.celery_helpers import with_db_session
@@ -23,12 +24,37 @@ from AIPscan.celery import celery
 from AIPscan.models import AIP
 from AIPscan.models import Agent
 from AIPscan.models import FetchJob
+from AIPscan.models import File
+from AIPscan.models import FileFacet
 from AIPscan.models import StorageService
+from AIPscan.models import file_facet_counts
 from AIPscan.models import get_mets_tasks
 from AIPscan.models import index_tasks
 
 logger = get_task_logger(__name__)
 
+GET_METS_STAGE_SECONDS = metrics.Histogram(
+    "aipscan_get_mets_stage_seconds",
+    "Time taken by each stage of processing an AIP's METS file.",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900),
+    labelnames=("stage",),
+)
+GET_METS_DOWNLOADED_BYTES = metrics.Histogram(
+    "aipscan_get_mets_downloaded_bytes",
+    "Size of METS files downloaded from the Storage Service.",
+    buckets=(10**4, 10**5, 10**6, 10**7, 10**8, 10**9),
+)
+GET_METS_FILES_WRITTEN = metrics.Histogram(
+    "aipscan_get_mets_files_written",
+    "Number of files written to the database for each AIP.",
+    buckets=(1, 10, 100, 1000, 10000, 100000),
+)
+GET_METS_EVENTS_WRITTEN = metrics.Histogram(
+    "aipscan_get_mets_events_written",
+    "Number of PREMIS events written to the database for each AIP.",
+    buckets=(1, 10, 100, 1000, 10000, 100000, 1000000),
+)
+
 
 class TaskError(Exception):
     """Exception to call when there is a problem downloading from the
@@ -266,6 +292,10 @@ def index_task(fetch_job_id):
     # Record indexing end time
     index_task_obj.indexing_end = datetime.now()
 
+    # Reports read from the index, so responses cached while it was being
+    # populated are now out of date
+    StorageService.bump_data_version(index_task_obj.fetch_job.storage_service_id)
+
     db.session.add(index_task_obj)
     db.session.commit()
 
@@ -298,6 +328,35 @@ def get_mets(
     the task's logic is executed, using the task's "apply" method, by an
     external application like a batch script.
     """
+    try:
+        _get_mets(
+            package_uuid,
+            aip_size,
+            relative_path_to_mets,
+            timestamp_str,
+            package_list_no,
+            storage_service_id,
+            storage_location_id,
+            origin_pipeline_id,
+            fetch_job_id,
+            customlogger,
+        )
+    finally:
+        metrics.flush()
+
+
+def _get_mets(
+    package_uuid,
+    aip_size,
+    relative_path_to_mets,
+    timestamp_str,
+    package_list_no,
+    storage_service_id,
+    storage_location_id,
+    origin_pipeline_id,
+    fetch_job_id,
+    customlogger,
+):
     # Set logger
     tasklogger = logger
     if customlogger is not None:
@@ -305,13 +364,15 @@ def get_mets(
 
     # Download METS file
     storage_service = db.session.get(StorageService, storage_service_id)
-    download_file, mets_hash = download_mets(
-        storage_service,
-        package_uuid,
-        relative_path_to_mets,
-        timestamp_str,
-        package_list_no,
-    )
+    with GET_METS_STAGE_SECONDS.time(stage="download_mets"):
+        download_file, mets_hash = download_mets(
+            storage_service,
+            package_uuid,
+            relative_path_to_mets,
+            timestamp_str,
+            package_list_no,
+        )
+    GET_METS_DOWNLOADED_BYTES.observe(os.path.getsize(download_file))
     mets_name = os.path.basename(download_file)
 
     # If METS file's hash matches an existing value, this is a duplicate of an
@@ -330,13 +391,15 @@ def get_mets(
     tasklogger.info(f"Processing METS file {mets_name}")
 
     try:
-        mets = parse_mets_with_metsrw(download_file)
+        with GET_METS_STAGE_SECONDS.time(stage="parse_mets_with_metsrw"):
+            mets = parse_mets_with_metsrw(download_file)
     except METSError:
         # An error we need to log and report back to the user.
         return
 
     try:
-        original_name = get_aip_original_name(mets)
+        with GET_METS_STAGE_SECONDS.time(stage="get_aip_original_name"):
+            original_name = get_aip_original_name(mets)
     except METSError:
         # Some other error with the METS file that we might want to
         # log and act upon.
@@ -363,7 +426,10 @@ def get_mets(
         origin_pipeline_id=origin_pipeline_id,
     )
 
-    database_helpers.process_aip_data(aip, mets)
+    with GET_METS_STAGE_SECONDS.time(stage="process_aip_data"):
+        files_written, events_written = database_helpers.process_aip_data(aip, mets)
+    GET_METS_FILES_WRITTEN.observe(files_written)
+    GET_METS_EVENTS_WRITTEN.observe(events_written)
 
     # Delete downloaded METS file.
     try:
@@ -378,6 +444,27 @@ def delete_fetch_job(fetch_job_id):
     fetch_job = db.session.get(FetchJob, fetch_job_id)
     if os.path.exists(fetch_job.download_directory):
         shutil.rmtree(fetch_job.download_directory)
+
+    # Subtract the files of the fetch job's AIPs, which are deleted with
+    # it, from the facets of each location they're stored in.
+    aip_ids = db.select(AIP.id).where(AIP.fetch_job_id == fetch_job.id)
+    storage_location_ids = db.session.scalars(
+        db.select(AIP.storage_location_id)
+        .where(AIP.fetch_job_id == fetch_job.id)
+        .distinct()
+    ).all()
+    for storage_location_id in storage_location_ids:
+        FileFacet.apply_counts(
+            fetch_job.storage_service_id,
+            storage_location_id,
+            file_facet_counts(
+                File.storage_location_id == storage_location_id,
+                File.aip_id.in_(aip_ids),
+            ),
+            sign=-1,
+        )
+
+    StorageService.bump_data_version(fetch_job.storage_service_id)
     db.session.delete(fetch_job)
     db.session.commit()
 
@@ -16,6 +16,7 @@ from AIPscan.models import Agent
 from AIPscan.models import FetchJob
 from AIPscan.models import File
 from AIPscan.models import FileType
+from AIPscan.models import Format
 from AIPscan.models import Pipeline
 from AIPscan.models import StorageLocation
 from AIPscan.models import StorageService
@@ -257,10 +258,17 @@ def test_create_file_object(
     ).all()
     assert len(preservation_files) == 1
 
-    database_helpers.create_file_object(file_type, None, aip.id)
+    database_helpers.create_file_object(file_type, None, aip)
 
     files_in_db = File.query.filter_by(aip_id=aip.id).all()
     assert len(files_in_db) == 3
+    for file_ in files_in_db:
+        assert file_.storage_service_id == aip.storage_service_id
+        assert file_.storage_location_id == aip.storage_location_id
+        assert file_.aip_create_date == aip.create_date
+        assert file_.format_id == Format.id_for(
+            file_.puid, file_.file_format, file_.format_version
+        )
     if is_original:
         original_files = File.query.filter_by(
             aip_id=aip.id, file_type=FileType.original
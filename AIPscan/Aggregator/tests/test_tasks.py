@@ -8,7 +8,9 @@ import celery
 import pytest
 
 from AIPscan import db
+from AIPscan import metrics
 from AIPscan import test_helpers
+from AIPscan.Aggregator import tasks
 from AIPscan.Aggregator.tasks import TaskError
 from AIPscan.Aggregator.tasks import delete_aip
 from AIPscan.Aggregator.tasks import delete_fetch_job
@@ -29,7 +31,10 @@ from AIPscan.Aggregator.tests import MockResponse
 from AIPscan.Aggregator.types import StorageServicePackage
 from AIPscan.models import AIP
 from AIPscan.models import Agent
+from AIPscan.models import FacetType
 from AIPscan.models import FetchJob
+from AIPscan.models import FileFacet
+from AIPscan.models import FileType
 from AIPscan.models import StorageService
 from AIPscan.models import index_tasks
 
@@ -193,6 +198,60 @@ def test_get_mets_task(app_instance, tmpdir, mocker, fixture_path, package_uuid)
     )
 
 
+def test_get_mets_task_metrics(app_instance, mocker):
+    """Test that the stages of processing a METS file are measured."""
+    mets_file = os.path.join(FIXTURES_DIR, "images_mets", "images.xml")
+    download_mets = mocker.patch("AIPscan.Aggregator.tasks.download_mets")
+    download_mets.return_value = (mets_file, test_helpers.file_sha256_hash(mets_file))
+    mocker.patch("AIPscan.Aggregator.tasks.os.remove")
+
+    for metric in metrics.REGISTRY.values():
+        metric.clear()
+
+    storage_service = test_helpers.create_test_storage_service()
+    storage_location = test_helpers.create_test_storage_location(
+        storage_service_id=storage_service.id
+    )
+    mocker.patch(
+        "AIPscan.Aggregator.database_helpers.create_or_update_storage_location"
+    ).return_value = storage_location
+    pipeline = test_helpers.create_test_pipeline(storage_service_id=storage_service.id)
+    fetch_job = test_helpers.create_test_fetch_job(
+        storage_service_id=storage_service.id
+    )
+
+    get_mets(
+        package_uuid="2d718ecf-828a-4487-83ce-873cf9edca1a",
+        aip_size=1000,
+        relative_path_to_mets="test",
+        timestamp_str="2021-01-01-00-00-00",
+        package_list_no=1,
+        storage_service_id=storage_service.id,
+        storage_location_id=storage_location.id,
+        fetch_job_id=fetch_job.id,
+        origin_pipeline_id=pipeline.id,
+    )
+
+    stages = {
+        key[0]: count
+        for key, _, _, count in tasks.GET_METS_STAGE_SECONDS.state()["samples"]
+    }
+    assert stages == {
+        "download_mets": 1,
+        "parse_mets_with_metsrw": 1,
+        "get_aip_original_name": 1,
+        "process_aip_data": 1,
+    }
+
+    aip = AIP.query.one()
+    [[_, _, downloaded_bytes, _]] = tasks.GET_METS_DOWNLOADED_BYTES.state()["samples"]
+    assert downloaded_bytes == os.path.getsize(mets_file)
+    [[_, _, files_written, _]] = tasks.GET_METS_FILES_WRITTEN.state()["samples"]
+    assert files_written == aip.original_file_count + aip.preservation_file_count
+    [[_, _, events_written, _]] = tasks.GET_METS_EVENTS_WRITTEN.state()["samples"]
+    assert events_written > 0
+
+
 def test_delete_fetch_job_task(app_instance, tmpdir, mocker):
     """Test that fetch job gets deleted by delete fetch job task logic."""
     storage_service = test_helpers.create_test_storage_service()
@@ -219,6 +278,30 @@ def test_delete_fetch_job_task(app_instance, tmpdir, mocker):
     assert index_tasks_obj is None
 
 
+def test_delete_fetch_job_task_file_facets(app_instance):
+    """Test that files of a deleted fetch job's AIPs leave the facets."""
+    storage_service = test_helpers.create_test_storage_service()
+    storage_location = test_helpers.create_test_storage_location(
+        storage_service_id=storage_service.id
+    )
+    for puid in ("fmt/1", "fmt/2"):
+        fetch_job = test_helpers.create_test_fetch_job(
+            storage_service_id=storage_service.id
+        )
+        aip = test_helpers.create_test_aip(
+            storage_service_id=storage_service.id,
+            storage_location_id=storage_location.id,
+            fetch_job_id=fetch_job.id,
+        )
+        test_helpers.create_test_file(aip_id=aip.id, puid=puid)
+
+    delete_fetch_job(fetch_job.id)
+
+    assert FileFacet.values(
+        FileType.original, FacetType.puid, storage_location_id=storage_location.id
+    ) == ["fmt/1"]
+
+
 def test_delete_storage_service_task(app_instance, tmpdir, mocker):
     """Test that storage service gets deleted by delete storage service job task logic."""
     storage_service = test_helpers.create_test_storage_service()
@@ -426,8 +509,14 @@ def test_index_task(app_instance, enable_typesense, mocker):
         "AIPscan.typesense_helpers.finish_bulk_document_creation"
     )
 
+    data_version = storage_service.data_version
+
     # Start index task
     index_task.apply((fetch_job.id,), task_id=task_id)
 
     # Make sure finish bulk document creation function got called
     mock_finish_bulk_doc.assert_called()
+
+    # Finishing indexing invalidates cached reports
+    db.session.refresh(storage_service)
+    assert storage_service.data_version > data_version
@@ -1,10 +1,12 @@
 import pytest
 from flask import current_app
 
+from AIPscan import db
 from AIPscan import test_helpers
 from AIPscan.Aggregator.tasks import TaskError
 from AIPscan.Aggregator.views import _test_storage_service_connection
 from AIPscan.models import StorageService
+from AIPscan.models import get_mets_tasks
 
 
 def test_new_fetch_job_success_returns_task_id(app_instance, mocker):
@@ -140,3 +142,43 @@ def test_delete_fetch_job(app_with_populated_files, mocker):
 
         response = test_client.get("/aggregator/delete_fetch_job/1?confirm=1")
         assert response.status_code == 302
+
+
+def test_get_mets_task_status_bumps_data_version(app_instance, mocker):
+    storage_service = test_helpers.create_test_storage_service()
+    fetch_job = test_helpers.create_test_fetch_job(
+        storage_service_id=storage_service.id, download_end=None
+    )
+    db.session.add(
+        get_mets_tasks(
+            get_mets_task_id="task-1",
+            workflow_coordinator_id="coordinator",
+            package_uuid="0f2a8c1e-1f6d-4e8e-9d0b-2c5b7f1e9a33",
+            status=None,
+        )
+    )
+    db.session.commit()
+
+    async_result = mocker.patch("AIPscan.Aggregator.views.AsyncResult")
+    async_result.return_value.state = "SUCCESS"
+
+    url = (
+        "/aggregator/get_mets_task_status/coordinator"
+        f"?totalAIPs=0&fetchJobId={fetch_job.id}"
+    )
+    data_version = storage_service.data_version
+
+    with current_app.test_client() as test_client:
+        # Finished AIPs are reported once per poll
+        response = test_client.get(url)
+        assert response.get_json()[0]["state"] == "SUCCESS"
+
+        db.session.refresh(storage_service)
+        assert storage_service.data_version == data_version + 1
+
+        # Polls finding no newly finished AIPs complete the fetch job
+        response = test_client.get(url)
+        assert response.get_json() == {"state": "COMPLETED"}
+
+        db.session.refresh(storage_service)
+        assert storage_service.data_version == data_version + 2
@@ -12,6 +12,7 @@ from flask import render_template
 from flask import request
 from flask import url_for
 
+from AIPscan import database
 from AIPscan import db
 from AIPscan import decorators
 from AIPscan import typesense_helpers
@@ -138,6 +139,7 @@ def edit_storage_service(storage_service_id):
             for ss in storage_services:
                 ss.default = False
         storage_service.default = form.default.data
+        StorageService.bump_data_version(storage_service.id)
         db.session.commit()
         flash(f"Storage service {form.name.data} updated")
         return redirect(url_for("aggregator.storage_services"))
@@ -183,6 +185,7 @@ def delete_storage_service(storage_service_id):
         abort(404)
 
     tasks.delete_storage_service.delay(storage_service_id)
+    database.read_from_primary()
 
     return render_template(
         "result_message.html",
@@ -229,6 +232,7 @@ def new_fetch_job(fetch_job_id):
     task = tasks.workflow_coordinator.delay(
         timestamp_str, storage_service.id, fetch_job.id, packages_directory
     )
+    database.read_from_primary()
 
     fetch_job_id = fetch_job.id
     task_id = _wait_for_package_list_task_id(task.id)
@@ -264,6 +268,7 @@ def delete_fetch_job(fetch_job_id):
 
     storage_service = db.session.get(StorageService, fetch_job.storage_service_id)
     tasks.delete_fetch_job.delay(fetch_job_id)
+    database.read_from_primary()
 
     flash(f"Fetch job {fetch_job.download_start} is being deleted")
     return redirect(
@@ -327,6 +332,12 @@ def get_mets_task_status(coordinatorid):
             obj.status = mets_task_status
             db.session.commit()
     if len(mets_tasks) != 0:
+        if response:
+            # Invalidate cached reports once per batch of ingested AIPs,
+            # rather than from every get_mets worker
+            fetch_job = db.session.get(FetchJob, fetchJobId)
+            StorageService.bump_data_version(fetch_job.storage_service_id)
+            db.session.commit()
         return jsonify(response)
     if incomplete > 0 and totalAIPs == 0:
         response = {"state": "PENDING"}
@@ -336,6 +347,7 @@ def get_mets_task_status(coordinatorid):
     start = obj.download_start
     downloadStart = _format_date(start)
     obj.download_end = downloadEnd
+    StorageService.bump_data_version(obj.storage_service_id)
     db.session.commit()
     response = {"state": "COMPLETED"}
     flash(f"Fetch Job {downloadStart} completed")
@@ -1,5 +1,9 @@
 """Data endpoints optimized for providing general overviews of AIPs."""
 
+from itertools import chain
+from itertools import groupby
+from operator import attrgetter
+
 from AIPscan.Data import fields
 from AIPscan.Data import report_dict
 from AIPscan.helpers import _simplify_datetime
@@ -7,6 +11,14 @@ from AIPscan.models import AIP
 from AIPscan.models import File
 from AIPscan.models import FileType
 from AIPscan.models import StorageService
+from AIPscan.pagination import KeysetPagination
+from AIPscan.pagination import KeysetWindow
+
+DEFAULT_PAGE_SIZE = 100
+STREAM_BATCH_SIZE = 1000
+
+# AIPs are listed in order of creation
+AIP_KEYSET = [AIP.create_date, AIP.id]
 
 
 def storage_services():
@@ -153,15 +165,14 @@ def derivative_overview(storage_service_id, storage_location_id=None):
     """
     report = report_dict(storage_service_id, storage_location_id)
 
-    aips = AIP.query.filter_by(storage_service_id=storage_service_id)
+    aips = AIP.query.filter_by(storage_service_id=storage_service_id).filter(
+        AIP.preservation_file_count > 0
+    )
     if storage_location_id:
         aips = aips.filter_by(storage_location_id=storage_location_id)
     aips = aips.all()
     all_aips = []
     for aip in aips:
-        if not aip.preservation_file_count > 0:
-            continue
-
         aip_report = {}
         aip_report[fields.FIELD_TRANSFER_NAME] = aip.transfer_name
         aip_report[fields.FIELD_UUID] = aip.uuid
@@ -201,3 +212,235 @@ def derivative_overview(storage_service_id, storage_location_id=None):
     report[fields.FIELD_ALL_AIPS] = all_aips
 
     return report
+
+
+def _aip_list_query(storage_service_id, storage_location_id):
+    aips = AIP.query.filter_by(storage_service_id=storage_service_id)
+    if storage_location_id:
+        aips = aips.filter_by(storage_location_id=storage_location_id)
+    return aips
+
+
+def _aip_list_info(aip):
+    aip_info = {}
+    aip_info[fields.FIELD_UUID] = aip.uuid
+    aip_info[fields.FIELD_AIP_NAME] = aip.transfer_name
+    aip_info[fields.FIELD_CREATED_DATE] = _simplify_datetime(aip.create_date, False)
+    aip_info[fields.FIELD_SIZE] = aip.size
+    aip_info[fields.FIELD_FILE_COUNT] = aip.original_file_count
+    aip_info[fields.FIELD_DERIVATIVE_COUNT] = aip.preservation_file_count
+    return aip_info
+
+
+def aip_list(
+    storage_service_id,
+    storage_location_id=None,
+    cursor=None,
+    limit=DEFAULT_PAGE_SIZE,
+):
+    """Return a page of AIPs, ordered by creation date.
+
+    The cursor returned with each page leads to the next one. Unlike
+    offsets, cursors stay fast however far into the AIPs they lead.
+
+    :param storage_service_id: Storage Service ID (int)
+    :param storage_location_id: Storage Location ID (int or None)
+    :param cursor: Cursor from the previous page (str or None)
+    :param limit: Maximum number of AIPs to return (int)
+
+    :returns: Report dict
+
+    :raises InvalidCursor: if the cursor is malformed
+    """
+    report = report_dict(storage_service_id, storage_location_id)
+
+    aips = _aip_list_query(storage_service_id, storage_location_id)
+    pager = KeysetPagination(aips, AIP_KEYSET, limit, cursor)
+
+    report[fields.FIELD_AIPS] = [_aip_list_info(aip) for aip in pager.items]
+    report[fields.FIELD_TOTAL] = pager.total
+    report[fields.FIELD_NEXT_CURSOR] = pager.next_cursor
+
+    return report
+
+
+def aip_list_records(
+    storage_service_id, storage_location_id=None, cursor=None, limit=None
+):
+    """Return AIP list entries, streamed from the database a page at a time.
+
+    :param storage_service_id: Storage Service ID (int)
+    :param storage_location_id: Storage Location ID (int or None)
+    :param cursor: Cursor from the previous page (str or None)
+    :param limit: Maximum number of AIPs or None for all of them (int)
+
+    :returns: Tuple of generator of AIP info dicts and cursor leading to
+        the next page (str or None)
+
+    :raises InvalidCursor: if the cursor is malformed
+    """
+    aips = _aip_list_query(storage_service_id, storage_location_id)
+    window = KeysetWindow(aips, AIP_KEYSET, cursor, limit)
+    aips = window.apply(aips).yield_per(STREAM_BATCH_SIZE)
+
+    return (_aip_list_info(aip) for aip in aips), window.next_cursor
+
+
+def _aip_files_query(aip, original_files):
+    file_type = FileType.original if original_files else FileType.preservation
+    return File.query.filter_by(aip_id=aip.id, file_type=file_type)
+
+
+def _aip_file_info(file_):
+    file_info = {}
+    file_info[fields.FIELD_UUID] = file_.uuid
+    file_info[fields.FIELD_NAME] = file_.name
+    file_info[fields.FIELD_SIZE] = file_.size
+    file_info[fields.FIELD_PUID] = file_.puid
+    file_info[fields.FIELD_FORMAT] = file_.file_format
+    file_info[fields.FIELD_VERSION] = file_.format_version
+    return file_info
+
+
+def aip_files(aip_uuid, original_files=True, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """Return a page of an AIP's files, ordered by ID.
+
+    :param aip_uuid: AIP UUID (str)
+    :param original_files: Return original files or preservation derivatives
+        (bool)
+    :param cursor: Cursor from the previous page (str or None)
+    :param limit: Maximum number of files to return (int)
+
+    :returns: Report dict or None if there's no AIP with the UUID
+
+    :raises InvalidCursor: if the cursor is malformed
+    """
+    aip = AIP.query.filter_by(uuid=aip_uuid).first()
+    if aip is None:
+        return None
+
+    report = report_dict(aip.storage_service_id, aip.storage_location_id)
+    report[fields.FIELD_AIP_UUID] = aip.uuid
+    report[fields.FIELD_AIP_NAME] = aip.transfer_name
+
+    total = aip.original_file_count
+    if not original_files:
+        total = aip.preservation_file_count
+
+    files = _aip_files_query(aip, original_files)
+    pager = KeysetPagination(files, [File.id], limit, cursor, total=total)
+
+    report[fields.FIELD_FILES] = [_aip_file_info(file_) for file_ in pager.items]
+    report[fields.FIELD_TOTAL] = pager.total
+    report[fields.FIELD_NEXT_CURSOR] = pager.next_cursor
+
+    return report
+
+
+def aip_files_records(aip_uuid, original_files=True, cursor=None, limit=None):
+    """Return an AIP's files, streamed from the database a page at a time.
+
+    :param aip_uuid: AIP UUID (str)
+    :param original_files: Return original files or preservation derivatives
+        (bool)
+    :param cursor: Cursor from the previous page (str or None)
+    :param limit: Maximum number of files or None for all of them (int)
+
+    :returns: Tuple of generator of file info dicts and cursor leading to
+        the next page (str or None), or None if there's no AIP with the UUID
+
+    :raises InvalidCursor: if the cursor is malformed
+    """
+    aip = AIP.query.filter_by(uuid=aip_uuid).first()
+    if aip is None:
+        return None
+
+    files = _aip_files_query(aip, original_files)
+    window = KeysetWindow(files, [File.id], cursor, limit)
+    files = window.apply(files).yield_per(STREAM_BATCH_SIZE)
+
+    return (_aip_file_info(file_) for file_ in files), window.next_cursor
+
+
+def aip_file_format_overview_records(
+    storage_service_id,
+    start_date,
+    end_date,
+    original_files=True,
+    storage_location_id=None,
+    cursor=None,
+    limit=None,
+):
+    """Return aip_file_format_overview AIP entries a page at a time.
+
+    Rather than querying each AIP's files separately, a single query joins
+    AIPs to their files in keyset order and is streamed from the database,
+    so any number of AIPs can be returned using a constant amount of
+    memory.
+
+    :param storage_service_id: Storage Service ID (int)
+    :param start_date: AIP creation start date (datetime.datetime object)
+    :param end_date: AIP creation end date, exclusive
+        (datetime.datetime object)
+    :param original_files: Summarize original files or preservation
+        derivatives (bool)
+    :param storage_location_id: Storage Location ID (int or None)
+    :param cursor: Cursor from the previous page (str or None)
+    :param limit: Maximum number of AIPs or None for all of them (int)
+
+    :returns: Tuple of generator of AIP info dicts and cursor leading to
+        the next page (str or None)
+
+    :raises InvalidCursor: if the cursor is malformed
+    """
+    aips = _aip_list_query(storage_service_id, storage_location_id).filter(
+        AIP.create_date >= start_date, AIP.create_date < end_date
+    )
+    window = KeysetWindow(aips, AIP_KEYSET, cursor, limit)
+
+    file_type = FileType.original if original_files else FileType.preservation
+    files = aips.with_entities(
+        AIP.id,
+        AIP.uuid,
+        AIP.transfer_name,
+        AIP.create_date,
+        File.puid,
+        File.file_format,
+        File.format_version,
+        File.size,
+    ).outerjoin(File, (File.aip_id == AIP.id) & (File.file_type == file_type))
+    files = window.apply(files).order_by(File.id).yield_per(STREAM_BATCH_SIZE)
+
+    def records():
+        for _, aip_files in groupby(files, key=attrgetter("id")):
+            first = next(aip_files)
+
+            aip_info = {}
+            aip_info[fields.FIELD_UUID] = first.uuid
+            aip_info[fields.FIELD_AIP_NAME] = first.transfer_name
+            aip_info[fields.FIELD_CREATED_DATE] = _simplify_datetime(
+                first.create_date, False
+            )
+            aip_info[fields.FIELD_SIZE] = 0
+            aip_info[fields.FIELD_FORMATS] = {}
+
+            for file_ in chain([first], aip_files):
+                if file_.puid is None:
+                    continue
+
+                if file_.size is not None:
+                    aip_info[fields.FIELD_SIZE] += file_.size
+
+                formats = aip_info[fields.FIELD_FORMATS]
+                if file_.puid not in formats:
+                    formats[file_.puid] = {
+                        fields.FIELD_COUNT: 1,
+                        fields.FIELD_VERSION: file_.format_version,
+                        fields.FIELD_NAME: file_.file_format,
+                    }
+                else:
+                    formats[file_.puid][fields.FIELD_COUNT] += 1
+
+            yield aip_info
+
+    return records(), window.next_cursor
@@ -0,0 +1,179 @@
+"""Typesense implementations of overviews in the data module."""
+
+from collections import defaultdict
+
+from AIPscan import typesense_helpers as ts_helpers
+from AIPscan.Data import fields
+from AIPscan.Data import report_dict
+from AIPscan.Data.report_data_typesense import timestamp_to_datetime
+from AIPscan.helpers import _simplify_datetime
+from AIPscan.models import FileType
+
+
+def _document_id(document):
+    return int(document["id"])
+
+
+def _files_by_aip(documents):
+    """Return file documents grouped by AIP ID, each group ordered by ID."""
+    files = defaultdict(list)
+    for document in sorted(documents, key=_document_id):
+        files[document["aip_id"]].append(document)
+    return files
+
+
+def aip_file_format_overview(
+    storage_service_id,
+    start_date,
+    end_date,
+    original_files=True,
+    storage_location_id=None,
+):
+    report = report_dict(storage_service_id, storage_location_id)
+    report[fields.FIELD_AIPS] = []
+    formats = {}
+
+    aip_filters = [
+        ("create_date", ">=", ts_helpers.datetime_to_timestamp_int(start_date)),
+        ("create_date", "<", ts_helpers.datetime_to_timestamp_int(end_date)),
+        ("storage_service_id", "=", storage_service_id),
+    ]
+
+    if storage_location_id is not None and storage_location_id != "":
+        aip_filters.append(("storage_location_id", "=", storage_location_id))
+
+    aips = ts_helpers.export_documents(
+        "aip",
+        ts_helpers.assemble_filter_by(aip_filters),
+        "id,uuid,transfer_name,create_date",
+    )
+
+    file_type = FileType.original if original_files else FileType.preservation
+    file_filters = ts_helpers.file_filters(
+        storage_service_id, storage_location_id, start_date, end_date, file_type
+    )
+
+    files = _files_by_aip(
+        ts_helpers.export_documents(
+            "file",
+            ts_helpers.assemble_filter_by(file_filters),
+            "id,aip_id,puid,file_format,format_version,size",
+        )
+    )
+
+    for aip in sorted(aips, key=_document_id):
+        aip_info = {}
+        aip_info[fields.FIELD_UUID] = aip.get("uuid")
+        aip_info[fields.FIELD_AIP_NAME] = aip.get("transfer_name")
+        aip_info[fields.FIELD_CREATED_DATE] = _simplify_datetime(
+            timestamp_to_datetime(aip["create_date"]), False
+        )
+        aip_info[fields.FIELD_SIZE] = 0
+        aip_info[fields.FIELD_FORMATS] = {}
+
+        for file_ in files.get(_document_id(aip), []):
+            format_key = file_.get("puid")
+            if format_key is None:
+                continue
+
+            file_format = file_.get("file_format")
+            format_version = file_.get("format_version")
+
+            formats[format_key] = file_format
+            if format_version:
+                formats[format_key] = f"{file_format} {format_version}"
+
+            aip_info[fields.FIELD_SIZE] += file_.get("size", 0)
+
+            aip_formats = aip_info[fields.FIELD_FORMATS]
+            if format_key not in aip_formats:
+                aip_formats[format_key] = {
+                    fields.FIELD_COUNT: 1,
+                    fields.FIELD_VERSION: format_version,
+                    fields.FIELD_NAME: file_format,
+                }
+            else:
+                aip_formats[format_key][fields.FIELD_COUNT] += 1
+
+        report[fields.FIELD_AIPS].append(aip_info)
+
+    report[fields.FIELD_FORMATS] = formats
+
+    return report
+
+
+def derivative_overview(storage_service_id, storage_location_id=None):
+    report = report_dict(storage_service_id, storage_location_id)
+
+    filters = [("storage_service_id", "=", storage_service_id)]
+
+    if storage_location_id is not None and storage_location_id != "":
+        filters.append(("storage_location_id", "=", storage_location_id))
+
+    aips = ts_helpers.export_documents(
+        "aip",
+        ts_helpers.assemble_filter_by(filters + [("preservation_file_count", ">", 0)]),
+        "id,uuid,transfer_name,original_file_count,preservation_file_count",
+    )
+
+    originals = _files_by_aip(
+        ts_helpers.export_documents(
+            "file",
+            ts_helpers.assemble_filter_by(
+                filters + [("file_type", "=", f"'{FileType.original.value}'")]
+            ),
+            "id,aip_id,uuid,file_format,format_version,puid",
+        )
+    )
+
+    derivatives = ts_helpers.export_documents(
+        "file",
+        ts_helpers.assemble_filter_by(
+            filters + [("file_type", "=", f"'{FileType.preservation.value}'")]
+        ),
+        "id,uuid,file_format,original_file_id",
+    )
+
+    # Pair each original with its first preservation derivative
+    original_derivatives = {}
+    for derivative in sorted(derivatives, key=_document_id):
+        if "original_file_id" in derivative:
+            original_derivatives.setdefault(derivative["original_file_id"], derivative)
+
+    all_aips = []
+    for aip in sorted(aips, key=_document_id):
+        aip_report = {}
+        aip_report[fields.FIELD_TRANSFER_NAME] = aip.get("transfer_name")
+        aip_report[fields.FIELD_UUID] = aip.get("uuid")
+        aip_report[fields.FIELD_FILE_COUNT] = aip.get("original_file_count")
+        aip_report[fields.FIELD_DERIVATIVE_COUNT] = aip.get("preservation_file_count")
+        aip_report[fields.FIELD_RELATED_PAIRING] = []
+
+        for original_file in originals.get(_document_id(aip), []):
+            preservation_derivative = original_derivatives.get(
+                _document_id(original_file)
+            )
+
+            if preservation_derivative is None:
+                continue
+
+            original_format_version = original_file.get("format_version") or ""
+
+            file_derivative_pair = {}
+            file_derivative_pair[fields.FIELD_DERIVATIVE_UUID] = (
+                preservation_derivative.get("uuid")
+            )
+            file_derivative_pair[fields.FIELD_ORIGINAL_UUID] = original_file.get("uuid")
+            file_derivative_pair[fields.FIELD_ORIGINAL_FORMAT] = (
+                f"{original_file.get('file_format')} {original_format_version} ({original_file.get('puid')})"
+            )
+            file_derivative_pair[fields.FIELD_DERIVATIVE_FORMAT] = (
+                f"{preservation_derivative.get('file_format')}"
+            )
+            aip_report[fields.FIELD_RELATED_PAIRING].append(file_derivative_pair)
+
+        all_aips.append(aip_report)
+
+    report[fields.FIELD_ALL_AIPS] = all_aips
+
+    return report
@@ -29,6 +29,8 @@ FIELD_FORMAT = "Format"
 FIELD_FORMATS = "Formats"
 FIELD_FORMAT_VERSIONS = "FormatVersions"
 
+FIELD_GRANULARITY = "Granularity"
+
 FIELD_ID = "ID"
 FIELD_INGESTS = "Ingests"
 FIELD_INGEST_START_DATE = "IngestStartDate"
@@ -38,6 +40,7 @@ FIELD_LOCATIONS = "Locations"
 FIELD_LOCATIONS_USAGE_OVER_TIME = "LocationsUsageOverTime"
 
 FIELD_NAME = "Name"
+FIELD_NEXT_CURSOR = "NextCursor"
 
 FIELD_ORIGINAL_FILE = "OriginalFile"
 FIELD_ORIGINAL_FORMAT = "OriginalFormat"
@@ -46,6 +49,7 @@ FIELD_ORIGINAL_PUID = "OriginalPUID"
 FIELD_ORIGINAL_UUID = "OriginalUUID"
 FIELD_ORIGINAL_VERSION = "OriginalVersion"
 
+FIELD_PERIODS = "Periods"
 FIELD_PUID = "PUID"
 
 FIELD_RELATED_PAIRING = "RelatedPairing"
@@ -55,6 +59,7 @@ FIELD_SIZE_BYTES = "SizeBytes"
 FIELD_STORAGE_LOCATION = "StorageLocation"
 FIELD_STORAGE_NAME = "StorageName"
 
+FIELD_TOTAL = "Total"
 FIELD_TRANSFER_NAME = "TransferName"
 
 FIELD_USER = "User"
@@ -3,9 +3,8 @@
 from datetime import datetime
 from operator import itemgetter
 
-from dateutil.rrule import DAILY
-from dateutil.rrule import rrule
 from sqlalchemy import case
+from sqlalchemy.orm import aliased
 
 from AIPscan import db
 from AIPscan.Data import fields
@@ -15,11 +14,33 @@ from AIPscan.models import AIP
 from AIPscan.models import Event
 from AIPscan.models import File
 from AIPscan.models import FileType
+from AIPscan.models import Format
 from AIPscan.models import StorageLocation
 from AIPscan.models import StorageService
+from AIPscan.pagination import KeysetWindow
 
 VALID_FILE_TYPES = {item.value for item in FileType}
 
+# Number of rows fetched per round trip when streaming report rows.
+STREAM_BATCH_SIZE = 1000
+
+GRANULARITY_DAY = "day"
+GRANULARITY_WEEK = "week"
+GRANULARITY_MONTH = "month"
+GRANULARITY_YEAR = "year"
+
+# strftime format used to label each period of a usage time series. Weeks
+# are labelled by the date of the Monday they start on.
+PERIOD_FORMATS = {
+    GRANULARITY_DAY: "%Y-%m-%d",
+    GRANULARITY_WEEK: "%Y-%m-%d",
+    GRANULARITY_MONTH: "%Y-%m",
+    GRANULARITY_YEAR: "%Y",
+}
+
+# Metrics of the storage location usage matrix, in order of its last axis.
+USAGE_METRICS = (fields.FIELD_AIPS, fields.FIELD_SIZE, fields.FIELD_FILE_COUNT)
+
 
 def _get_username(agent_string):
     """Retrieve username from the standard agent string stored in the
@@ -49,25 +70,35 @@ def _formats_count_query(
     FILE_COUNT = "file_count"
     FILE_SIZE = "total_size"
 
-    results = (
+    # Files are grouped by format ID, then the much fewer formats by name.
+    formats = (
         db.session.query(
-            File.file_format.label(FILE_FORMAT),
+            File.format_id,
             db.func.count(File.id).label(FILE_COUNT),
             db.func.sum(File.size).label(FILE_SIZE),
         )
-        .join(AIP)
-        .join(StorageLocation)
-        .join(StorageService)
-        .filter(StorageService.id == storage_service_id)
+        .filter(File.storage_service_id == storage_service_id)
         .filter(File.file_type == FileType.original.value)
-        .filter(AIP.create_date >= start_date)
-        .filter(AIP.create_date < end_date)
-        .group_by(File.file_format)
-        .order_by(db.func.count(File.id).desc(), db.func.sum(File.size).desc())
+        .filter(File.aip_create_date >= start_date)
+        .filter(File.aip_create_date < end_date)
+        .group_by(File.format_id)
     )
     if storage_location_id:
-        results = results.filter(StorageLocation.id == storage_location_id)
-    return results
+        formats = formats.filter(File.storage_location_id == storage_location_id)
+    formats = formats.subquery()
+
+    file_count = db.func.sum(formats.c.file_count)
+    total_size = db.func.sum(formats.c.total_size)
+    return (
+        db.session.query(
+            Format.name.label(FILE_FORMAT),
+            file_count.label(FILE_COUNT),
+            total_size.label(FILE_SIZE),
+        )
+        .join(formats, formats.c.format_id == Format.id)
+        .group_by(Format.name)
+        .order_by(file_count.desc(), total_size.desc())
+    )
 
 
 def formats_count(storage_service_id, start_date, end_date, storage_location_id=None):
@@ -95,7 +126,7 @@ def formats_count(storage_service_id, start_date, end_date, storage_location_id=
         format_info = {}
 
         format_info[fields.FIELD_FORMAT] = format_.file_format
-        format_info[fields.FIELD_COUNT] = format_.file_count
+        format_info[fields.FIELD_COUNT] = int(format_.file_count)
         format_info[fields.FIELD_SIZE] = 0
         if format_.total_size is not None:
             format_info[fields.FIELD_SIZE] = format_.total_size
@@ -125,27 +156,38 @@ def _format_versions_count_query(
     FILE_COUNT = "file_count"
     FILE_SIZE = "total_size"
 
-    results = (
+    versions = (
         db.session.query(
-            File.puid.label(PUID),
-            File.file_format.label(FILE_FORMAT),
-            File.format_version.label(FORMAT_VERSION),
+            File.format_id,
             db.func.count(File.id).label(FILE_COUNT),
             db.func.sum(File.size).label(FILE_SIZE),
         )
-        .join(AIP)
-        .join(StorageLocation)
-        .join(StorageService)
-        .filter(StorageService.id == storage_service_id)
+        .filter(File.storage_service_id == storage_service_id)
         .filter(File.file_type == FileType.original.value)
-        .filter(AIP.create_date >= start_date)
-        .filter(AIP.create_date < end_date)
-        .group_by(File.puid, File.file_format, File.format_version)
-        .order_by(db.func.count(File.id).desc(), db.func.sum(File.size).desc())
+        .filter(File.aip_create_date >= start_date)
+        .filter(File.aip_create_date < end_date)
+        .group_by(File.format_id)
     )
     if storage_location_id:
-        results = results.filter(StorageLocation.id == storage_location_id)
-    return results
+        versions = versions.filter(File.storage_location_id == storage_location_id)
+    versions = versions.subquery()
+
+    # Formats differing only in case are counted together, as they were
+    # when files were grouped by their format columns.
+    file_count = db.func.sum(versions.c.file_count)
+    total_size = db.func.sum(versions.c.total_size)
+    return (
+        db.session.query(
+            Format.puid.label(PUID),
+            Format.name.label(FILE_FORMAT),
+            Format.version.label(FORMAT_VERSION),
+            file_count.label(FILE_COUNT),
+            total_size.label(FILE_SIZE),
+        )
+        .join(versions, versions.c.format_id == Format.id)
+        .group_by(Format.puid, Format.name, Format.version)
+        .order_by(file_count.desc(), total_size.desc())
+    )
 
 
 def format_versions_count(
@@ -180,7 +222,7 @@ def format_versions_count(
             version_info[fields.FIELD_VERSION] = version.format_version
         except AttributeError:
             pass
-        version_info[fields.FIELD_COUNT] = version.file_count
+        version_info[fields.FIELD_COUNT] = int(version.file_count)
         version_info[fields.FIELD_SIZE] = 0
         if version.total_size is not None:
             version_info[fields.FIELD_SIZE] = version.total_size
@@ -195,25 +237,40 @@ def _largest_files_query(
 ):
     """Fetch file information from database for largest files query
 
+    Only the columns needed for the report are selected, with the parent
+    AIP's name and UUID joined in, so that wide columns such as the PREMIS
+    object XML are never read and no per-row AIP lookups are required.
+
     This is separated into its own helper function to aid in testing.
     """
     files = (
-        File.query.join(AIP)
-        .join(StorageLocation)
-        .join(StorageService)
-        .filter(StorageService.id == storage_service_id)
-        .filter(AIP.create_date >= start_date)
-        .filter(AIP.create_date < end_date)
+        db.session.query(
+            File.id,
+            File.uuid,
+            File.name,
+            File.size,
+            File.aip_id,
+            File.file_type,
+            File.file_format,
+            File.format_version,
+            File.puid,
+            AIP.transfer_name.label("transfer_name"),
+            AIP.uuid.label("aip_uuid"),
+        )
+        .join(AIP, File.aip_id == AIP.id)
+        .filter(File.storage_service_id == storage_service_id)
+        .filter(File.aip_create_date >= start_date)
+        .filter(File.aip_create_date < end_date)
         .order_by(File.size.desc())
     )
     if file_type is not None and file_type in VALID_FILE_TYPES:
         files = files.filter(File.file_type == file_type)
     if storage_location_id:
-        files = files.filter(StorageLocation.id == storage_location_id)
-    return files.limit(limit)
+        files = files.filter(File.storage_location_id == storage_location_id)
+    return files.limit(limit).yield_per(STREAM_BATCH_SIZE)
 
 
-def largest_files(
+def largest_files_rows(
     storage_service_id,
     start_date,
     end_date,
@@ -221,25 +278,13 @@ def largest_files(
     file_type=None,
     limit=20,
 ):
-    """Return a summary of the largest files in a given Storage Service
+    """Yield rows for the largest files report one at a time.
 
-    :param storage_service_id: Storage Service ID
-    :param start_date: Inclusive AIP creation start date
-        (datetime.datetime object)
-    :param end_date: Inclusive AIP creation end date
-        (datetime.datetime object)
-    :param storage_location_id: Storage Location ID (int)
-    :param file_type: Optional filter for type of file to return
-        (acceptable values are "original" or "preservation")
-    :param limit: Upper limit of number of results to return
+    Parameters are the same as for largest_files. Rows are fetched from the
+    database in batches so that large exports need not be held in memory.
 
-    :returns: "report" dict containing following fields:
-        report["StorageName"]: Name of Storage Service queried
-        report["Files"]: List of result files ordered desc by size
+    :returns: generator of file info dicts ordered desc by size
     """
-    report = report_dict(storage_service_id, storage_location_id)
-    report[fields.FIELD_FILES] = []
-
     files = _largest_files_query(
         storage_service_id, start_date, end_date, storage_location_id, file_type, limit
     )
@@ -270,12 +315,47 @@ def largest_files(
         except AttributeError:
             pass
 
-        matching_aip = db.session.get(AIP, file_.aip_id)
-        if matching_aip is not None:
-            file_info[fields.FIELD_AIP_NAME] = matching_aip.transfer_name
-            file_info[fields.FIELD_AIP_UUID] = matching_aip.uuid
+        file_info[fields.FIELD_AIP_NAME] = file_.transfer_name
+        file_info[fields.FIELD_AIP_UUID] = file_.aip_uuid
+
+        yield file_info
+
+
+def largest_files(
+    storage_service_id,
+    start_date,
+    end_date,
+    storage_location_id=None,
+    file_type=None,
+    limit=20,
+):
+    """Return a summary of the largest files in a given Storage Service
+
+    :param storage_service_id: Storage Service ID
+    :param start_date: Inclusive AIP creation start date
+        (datetime.datetime object)
+    :param end_date: Inclusive AIP creation end date
+        (datetime.datetime object)
+    :param storage_location_id: Storage Location ID (int)
+    :param file_type: Optional filter for type of file to return
+        (acceptable values are "original" or "preservation")
+    :param limit: Upper limit of number of results to return
 
-        report[fields.FIELD_FILES].append(file_info)
+    :returns: "report" dict containing following fields:
+        report["StorageName"]: Name of Storage Service queried
+        report["Files"]: List of result files ordered desc by size
+    """
+    report = report_dict(storage_service_id, storage_location_id)
+    report[fields.FIELD_FILES] = list(
+        largest_files_rows(
+            storage_service_id,
+            start_date,
+            end_date,
+            storage_location_id,
+            file_type,
+            limit,
+        )
+    )
 
     return report
 
@@ -285,14 +365,12 @@ def _largest_aips_query(
 ):
     """Fetch information from database for largest AIPs query."""
     aips = (
-        AIP.query.join(StorageLocation)
-        .join(StorageService)
-        .filter(StorageService.id == storage_service_id)
+        AIP.query.filter(AIP.storage_service_id == storage_service_id)
         .filter(AIP.create_date >= start_date)
         .filter(AIP.create_date < end_date)
     )
     if storage_location_id:
-        aips = aips.filter(StorageLocation.id == storage_location_id)
+        aips = aips.filter(AIP.storage_location_id == storage_location_id)
     return aips.order_by(AIP.size.desc()).limit(limit)
 
 
@@ -366,13 +444,12 @@ def _query_aips_by_file_format_or_puid(
             db.func.sum(File.size).label(FILE_SIZE),
         )
         .join(File)
-        .join(StorageService)
-        .filter(StorageService.id == storage_service_id)
+        .filter(File.storage_service_id == storage_service_id)
         .group_by(AIP.id)
         .order_by(db.func.count(File.id).desc(), db.func.sum(File.size).desc())
     )
     if storage_location_id:
-        aips = aips.filter(AIP.storage_location_id == storage_location_id)
+        aips = aips.filter(File.storage_location_id == storage_location_id)
 
     if original_files is False:
         aips = aips.filter(File.file_type == FileType.preservation.value)
@@ -380,8 +457,10 @@ def _query_aips_by_file_format_or_puid(
         aips = aips.filter(File.file_type == FileType.original.value)
 
     if file_format:
-        return aips.filter(File.file_format == search_string)
-    return aips.filter(File.puid == search_string)
+        format_ids = db.select(Format.id).where(Format.name == search_string)
+    else:
+        format_ids = db.select(Format.id).where(Format.puid == search_string)
+    return aips.filter(File.format_id.in_(format_ids))
 
 
 def _aips_by_file_format_or_puid(
@@ -543,29 +622,123 @@ def agents_transfers(
 
 
 def _preservation_derivatives_query(storage_service_id, storage_location_id, aip_uuid):
-    """Fetch information on preservation derivatives from db.
+    """Return query fetching information on preservation derivatives.
+
+    Derivatives are joined to their AIP and, where one exists, their original
+    file so that each row carries everything the report needs. The query is
+    left unordered.
 
     :param storage_service_id: Storage Service ID (int)
     :param storage_location_id: Storage Location ID (int)
     :param aip_uuid: AIP UUID (str)
 
-    :returns: SQLAlchemy query results
+    :returns: SQLAlchemy query
     """
+    original_file = aliased(File)
     files = (
-        File.query.join(AIP)
-        .join(StorageLocation)
-        .join(StorageService)
-        .filter(StorageService.id == storage_service_id)
+        db.session.query(
+            File.id,
+            File.uuid,
+            File.name,
+            File.file_format,
+            AIP.uuid.label("aip_uuid"),
+            AIP.transfer_name.label("aip_name"),
+            original_file.id.label("original_id"),
+            original_file.uuid.label("original_uuid"),
+            original_file.name.label("original_name"),
+            original_file.file_format.label("original_format"),
+            original_file.format_version.label("original_version"),
+            original_file.puid.label("original_puid"),
+        )
+        .join(AIP, File.aip_id == AIP.id)
+        .outerjoin(original_file, File.original_file_id == original_file.id)
+        .filter(File.storage_service_id == storage_service_id)
         .filter(File.file_type == FileType.preservation)
-        .order_by(AIP.uuid, File.file_format)
     )
     if storage_location_id:
-        files = files.filter(StorageLocation.id == storage_location_id)
+        files = files.filter(File.storage_location_id == storage_location_id)
     if aip_uuid:
         files = files.filter(AIP.uuid == aip_uuid)
     return files
 
 
+def _preservation_derivative_info(file_):
+    """Return report row for a preservation derivatives query result."""
+    file_info = {}
+
+    file_info[fields.FIELD_AIP_UUID] = file_.aip_uuid
+    file_info[fields.FIELD_AIP_NAME] = file_.aip_name
+
+    file_info[fields.FIELD_ID] = file_.id
+    file_info[fields.FIELD_UUID] = file_.uuid
+    file_info[fields.FIELD_NAME] = file_.name
+    file_info[fields.FIELD_FORMAT] = file_.file_format
+
+    if file_.original_id is not None:
+        file_info[fields.FIELD_ORIGINAL_UUID] = file_.original_uuid
+        file_info[fields.FIELD_ORIGINAL_NAME] = file_.original_name
+        file_info[fields.FIELD_ORIGINAL_FORMAT] = file_.original_format
+        file_info[fields.FIELD_ORIGINAL_VERSION] = file_.original_version
+        file_info[fields.FIELD_ORIGINAL_PUID] = file_.original_puid
+
+    return file_info
+
+
+def preservation_derivatives_rows(
+    storage_service_id, storage_location_id=None, aip_uuid=None
+):
+    """Yield rows for the preservation derivatives report one at a time.
+
+    Parameters are the same as for preservation_derivatives.
+
+    :returns: generator of file info dicts
+    """
+    files = (
+        _preservation_derivatives_query(
+            storage_service_id, storage_location_id, aip_uuid
+        )
+        .order_by(AIP.uuid, File.file_format)
+        .yield_per(STREAM_BATCH_SIZE)
+    )
+
+    for file_ in files:
+        yield _preservation_derivative_info(file_)
+
+
+def preservation_derivatives_records(
+    storage_service_id,
+    storage_location_id=None,
+    aip_uuid=None,
+    cursor=None,
+    limit=None,
+):
+    """Return preservation derivatives report rows, a page at a time.
+
+    Rows are ordered by file ID and streamed from the database, so any
+    number of them can be returned using a constant amount of memory.
+
+    :param storage_service_id: Storage Service ID (int)
+    :param storage_location_id: Storage Location ID (int)
+    :param aip_uuid: AIP UUID (str)
+    :param cursor: Cursor from the previous page (str or None)
+    :param limit: Maximum number of rows or None for all rows (int)
+
+    :returns: Tuple of generator of file info dicts and cursor leading to
+        the next page (str or None)
+
+    :raises InvalidCursor: if the cursor is malformed
+    """
+    files = _preservation_derivatives_query(
+        storage_service_id, storage_location_id, aip_uuid
+    )
+    window = KeysetWindow(files, [File.id], cursor, limit)
+    files = window.apply(files).yield_per(STREAM_BATCH_SIZE)
+
+    rows = (_preservation_derivative_info(file_) for file_ in files)
+
+    return rows, window.next_cursor
+
+
 def preservation_derivatives(
     storage_service_id, storage_location_id=None, aip_uuid=None
 ):
@@ -583,41 +756,10 @@ def preservation_derivatives(
         report["Files"]: List of result files ordered desc by size
     """
     report = report_dict(storage_service_id, storage_location_id)
-    report[fields.FIELD_FILES] = []
-
-    files = _preservation_derivatives_query(
-        storage_service_id, storage_location_id, aip_uuid
+    report[fields.FIELD_FILES] = list(
+        preservation_derivatives_rows(storage_service_id, storage_location_id, aip_uuid)
     )
 
-    for file_ in files:
-        file_info = {}
-
-        file_info[fields.FIELD_AIP_UUID] = file_.aip.uuid
-        file_info[fields.FIELD_AIP_NAME] = file_.aip.transfer_name
-
-        file_info[fields.FIELD_ID] = file_.id
-        file_info[fields.FIELD_UUID] = file_.uuid
-        file_info[fields.FIELD_NAME] = file_.name
-        file_info[fields.FIELD_FORMAT] = file_.file_format
-
-        original_file = file_.original_file
-        if original_file:
-            file_info[fields.FIELD_ORIGINAL_UUID] = original_file.uuid
-            file_info[fields.FIELD_ORIGINAL_NAME] = original_file.name
-            file_info[fields.FIELD_ORIGINAL_FORMAT] = original_file.file_format
-            file_info[fields.FIELD_ORIGINAL_VERSION] = ""
-            try:
-                file_info[fields.FIELD_ORIGINAL_VERSION] = original_file.format_version
-            except AttributeError:
-                pass
-            file_info[fields.FIELD_ORIGINAL_PUID] = ""
-            try:
-                file_info[fields.FIELD_ORIGINAL_PUID] = original_file.puid
-            except AttributeError:
-                pass
-
-        report[fields.FIELD_FILES].append(file_info)
-
     return report
 
 
@@ -668,8 +810,8 @@ def storage_locations(storage_service_id, start_date, end_date):
     return report
 
 
-def _get_days_covered_by_date_range(storage_service_id, start_date, end_date):
-    """Return days covered by date range as list of ISO values.
+def _get_day_index(storage_service_id, start_date, end_date):
+    """Return days covered by date range as a pandas DatetimeIndex.
 
     First, replace datetime.min and datetime.max, if used, with more sensible
     values so that we do not end up returning every day since the beginning
@@ -681,57 +823,70 @@ def _get_days_covered_by_date_range(storage_service_id, start_date, end_date):
     :param end_date: Inclusive AIP creation end date
         (datetime.datetime object)
 
-    :returns: List of strings like "YYYY-MM-DD"
+    :returns: pandas.DatetimeIndex with one entry per day
     """
+    import pandas as pd
+
     if start_date == datetime.min:
         storage_service = db.session.get(StorageService, storage_service_id)
         start_date = storage_service.earliest_aip_created
     if end_date >= datetime.now():
         end_date = datetime.now()
 
-    return [
-        dt.isoformat()[:10] for dt in rrule(DAILY, dtstart=start_date, until=end_date)
-    ]
+    if start_date is None:
+        return pd.DatetimeIndex([])
 
+    return pd.date_range(start=start_date, end=end_date, freq="D")
 
-def storage_locations_usage_over_time(
-    storage_service_id, start_date, end_date, cumulative=False
-):
-    """Return details of AIP store locations in Storage Service over time.
+
+def _get_days_covered_by_date_range(storage_service_id, start_date, end_date):
+    """Return days covered by date range as list of ISO values.
 
     :param storage_service_id: Storage Service ID (int)
     :param start_date: Inclusive AIP creation start date
         (datetime.datetime object)
-    :param end_date: Exclusive upper bound for AIP creation timestamps
-        (datetime.datetime). Callers that work with inclusive calendar dates
-        should use ``parse_datetime_bound(..., upper=True)``.
-        For example, the range “2024-01-01 to 2024-01-31” becomes:
-          - ``start_date = 2024-01-01 00:00:00``, and
-          - ``end_date = 2024-02-01 00:00:00``
-    :param cumulative: Flag indicating whether to calculate cumulatively, where
-        each month adds to previous totals (bool)
+    :param end_date: Inclusive AIP creation end date
+        (datetime.datetime object)
 
-    :returns: "report" dict containing following fields:
-        report["StorageName"]: Name of Storage Service queried
-        report["Locations"]: List of result locations ordered desc by size
+    :returns: List of strings like "YYYY-MM-DD"
     """
-    report = {}
-    report[fields.FIELD_STORAGE_NAME] = get_storage_service_name(storage_service_id)
+    days = _get_day_index(storage_service_id, start_date, end_date)
+    return list(days.strftime(PERIOD_FORMATS[GRANULARITY_DAY]))
 
-    locations = sorted(
-        _get_storage_locations(storage_service_id), key=lambda loc: loc.id
-    )
-    location_ids = [loc.id for loc in locations]
-    days = _get_days_covered_by_date_range(storage_service_id, start_date, end_date)
 
-    # Build a single aggregated query that returns daily metrics per location.
+def _get_period_labels(days, granularity):
+    """Return the label of the period each day falls into.
+
+    :param days: Days of the time series (pandas.DatetimeIndex)
+    :param granularity: One of the GRANULARITY_* constants (str)
+
+    :returns: pandas.Index of strings, one per day
+    """
+    import pandas as pd
+
+    if granularity == GRANULARITY_WEEK:
+        days = days - pd.to_timedelta(days.dayofweek, unit="D")
+    return days.strftime(PERIOD_FORMATS[granularity])
+
+
+def _storage_locations_daily_usage_query(storage_service_id, start_date, end_date):
+    """Fetch daily metrics per storage location from db.
+
+    :param storage_service_id: Storage Service ID (int)
+    :param start_date: Inclusive AIP creation start date
+        (datetime.datetime object)
+    :param end_date: Exclusive AIP creation end date
+        (datetime.datetime object)
+
+    :returns: SQLAlchemy query results
+    """
     # MySQL: DATE(AIP.create_date) groups by calendar day.
     day_col = db.func.date(AIP.create_date).label("day")
 
     # CASE expression to count only original files.
     orig_file_case = case((File.file_type == FileType.original, 1), else_=0)
 
-    aggregated = (
+    return (
         db.session.query(
             day_col,
             AIP.storage_location_id.label("storage_location_id"),
@@ -747,65 +902,177 @@ def storage_locations_usage_over_time(
         .all()
     )
 
-    # Map aggregated rows for quick lookup.
-    daily_loc_metrics = {}  # {day_str: {loc_id: {aips,size,files}}}
-    for row in aggregated:
-        # row.day can be date/datetime; normalize to YYYY-MM-DD string
-        day_str = str(row.day)
-        loc_id = row.storage_location_id
-        day_bucket = daily_loc_metrics.setdefault(day_str, {})
-        day_bucket[loc_id] = {
-            fields.FIELD_AIPS: int(row.aips or 0),
-            fields.FIELD_SIZE: int(row.size_sum or 0),
-            fields.FIELD_FILE_COUNT: int(row.orig_files or 0),
-        }
 
-    # Prepare cumulative running totals per location if needed
-    running_totals = {
-        loc_id: {fields.FIELD_AIPS: 0, fields.FIELD_SIZE: 0, fields.FIELD_FILE_COUNT: 0}
-        for loc_id in location_ids
+def _storage_locations_usage_matrix(
+    storage_service_id, start_date, end_date, cumulative, granularity
+):
+    """Return storage location usage as a dense period x location matrix.
+
+    The aggregated daily rows are scattered into a day x location matrix,
+    which is then summed into periods of the requested granularity and,
+    optionally, accumulated with cumsum.
+
+    :returns: tuple of period labels (list of str), storage locations
+        ordered by ID (list of StorageLocation) and a numpy array of shape
+        (periods, locations, len(USAGE_METRICS))
+    """
+    # NumPy and pandas take long to import and are only needed by this
+    # report, so they are imported on first use.
+    import numpy as np
+    import pandas as pd
+
+    locations = sorted(
+        _get_storage_locations(storage_service_id), key=lambda loc: loc.id
+    )
+    days = _get_day_index(storage_service_id, start_date, end_date)
+    aggregated = _storage_locations_daily_usage_query(
+        storage_service_id, start_date, end_date
+    )
+
+    day_positions = pd.Index(
+        days.strftime(PERIOD_FORMATS[GRANULARITY_DAY])
+    ).get_indexer([str(row.day) for row in aggregated])
+    location_positions = pd.Index([loc.id for loc in locations]).get_indexer(
+        [row.storage_location_id for row in aggregated]
+    )
+    values = np.array(
+        [
+            (int(row.aips or 0), int(row.size_sum or 0), int(row.orig_files or 0))
+            for row in aggregated
+        ],
+        dtype=np.int64,
+    ).reshape(-1, len(USAGE_METRICS))
+
+    # Ignore rows for days or locations outside of the report's range.
+    in_range = (day_positions >= 0) & (location_positions >= 0)
+
+    daily_usage = np.zeros(
+        (len(days), len(locations), len(USAGE_METRICS)), dtype=np.int64
+    )
+    np.add.at(
+        daily_usage,
+        (day_positions[in_range], location_positions[in_range]),
+        values[in_range],
+    )
+
+    period_positions, periods = pd.factorize(_get_period_labels(days, granularity))
+    usage = np.zeros((len(periods), len(locations), len(USAGE_METRICS)), dtype=np.int64)
+    np.add.at(usage, period_positions, daily_usage)
+
+    if cumulative:
+        usage = usage.cumsum(axis=0)
+
+    return list(periods), locations, usage
+
+
+def storage_locations_usage_over_time_columns(
+    storage_service_id,
+    start_date,
+    end_date,
+    cumulative=False,
+    granularity=GRANULARITY_DAY,
+):
+    """Return columnar details of AIP store locations usage over time.
+
+    :param storage_service_id: Storage Service ID (int)
+    :param start_date: Inclusive AIP creation start date
+        (datetime.datetime object)
+    :param end_date: Exclusive upper bound for AIP creation timestamps
+        (datetime.datetime)
+    :param cumulative: Flag indicating whether to calculate cumulatively, where
+        each period adds to previous totals (bool)
+    :param granularity: Period to total usage by: "day" (default), "week",
+        "month" or "year" (str)
+
+    :returns: "report" dict containing following fields:
+        report["StorageName"]: Name of Storage Service queried
+        report["LocationsUsageOverTime"]: dict with the "Granularity" used,
+        the list of "Periods" and a list of "Locations", each with one value
+        per period for each of "AIPs", "Size" and "FileCount"
+    """
+    if granularity not in PERIOD_FORMATS:
+        granularity = GRANULARITY_DAY
+
+    report = {}
+    report[fields.FIELD_STORAGE_NAME] = get_storage_service_name(storage_service_id)
+
+    periods, locations, usage = _storage_locations_usage_matrix(
+        storage_service_id, start_date, end_date, cumulative, granularity
+    )
+
+    locations_data = []
+    for position, loc in enumerate(locations):
+        loc_info = {
+            fields.FIELD_ID: loc.id,
+            fields.FIELD_UUID: loc.uuid,
+            fields.FIELD_STORAGE_LOCATION: loc.description,
+        }
+        for metric, series in zip(
+            USAGE_METRICS, usage[:, position, :].T.tolist(), strict=True
+        ):
+            loc_info[metric] = series
+        locations_data.append(loc_info)
+
+    report[fields.FIELD_LOCATIONS_USAGE_OVER_TIME] = {
+        fields.FIELD_GRANULARITY: granularity,
+        fields.FIELD_PERIODS: periods,
+        fields.FIELD_LOCATIONS: locations_data,
     }
 
+    return report
+
+
+def storage_locations_usage_over_time(
+    storage_service_id,
+    start_date,
+    end_date,
+    cumulative=False,
+    granularity=GRANULARITY_DAY,
+):
+    """Return details of AIP store locations in Storage Service over time.
+
+    :param storage_service_id: Storage Service ID (int)
+    :param start_date: Inclusive AIP creation start date
+        (datetime.datetime object)
+    :param end_date: Exclusive upper bound for AIP creation timestamps
+        (datetime.datetime). Callers that work with inclusive calendar dates
+        should use ``parse_datetime_bound(..., upper=True)``.
+        For example, the range “2024-01-01 to 2024-01-31” becomes:
+          - ``start_date = 2024-01-01 00:00:00``, and
+          - ``end_date = 2024-02-01 00:00:00``
+    :param cumulative: Flag indicating whether to calculate cumulatively, where
+        each period adds to previous totals (bool)
+    :param granularity: Period to total usage by: "day" (default), "week",
+        "month" or "year" (str)
+
+    :returns: "report" dict containing following fields:
+        report["StorageName"]: Name of Storage Service queried
+        report["LocationsUsageOverTime"]: Dict of location usage lists keyed
+        by period
+    """
+    if granularity not in PERIOD_FORMATS:
+        granularity = GRANULARITY_DAY
+
+    report = {}
+    report[fields.FIELD_STORAGE_NAME] = get_storage_service_name(storage_service_id)
+
+    periods, locations, usage = _storage_locations_usage_matrix(
+        storage_service_id, start_date, end_date, cumulative, granularity
+    )
+
     results = {}
-    for day in days:
-        daily_locations_data = []
-
-        # Use aggregated metrics for the given day; default to zeros.
-        day_metrics = daily_loc_metrics.get(day, {})
-        for loc in locations:
-            base = day_metrics.get(
-                loc.id,
-                {
-                    fields.FIELD_AIPS: 0,
-                    fields.FIELD_SIZE: 0,
-                    fields.FIELD_FILE_COUNT: 0,
-                },
-            )
-
-            if cumulative:
-                run = running_totals[loc.id]
-                run[fields.FIELD_AIPS] += base[fields.FIELD_AIPS]
-                run[fields.FIELD_SIZE] += base[fields.FIELD_SIZE]
-                run[fields.FIELD_FILE_COUNT] += base[fields.FIELD_FILE_COUNT]
-                aips_val = run[fields.FIELD_AIPS]
-                size_val = run[fields.FIELD_SIZE]
-                files_val = run[fields.FIELD_FILE_COUNT]
-            else:
-                aips_val = base[fields.FIELD_AIPS]
-                size_val = base[fields.FIELD_SIZE]
-                files_val = base[fields.FIELD_FILE_COUNT]
-
-            loc_info = {
+    for period, period_usage in zip(periods, usage.tolist(), strict=True):
+        results[period] = [
+            {
                 fields.FIELD_ID: loc.id,
                 fields.FIELD_UUID: loc.uuid,
                 fields.FIELD_STORAGE_LOCATION: loc.description,
-                fields.FIELD_AIPS: aips_val,
-                fields.FIELD_SIZE: size_val,
-                fields.FIELD_FILE_COUNT: files_val,
+                fields.FIELD_AIPS: aips,
+                fields.FIELD_SIZE: size,
+                fields.FIELD_FILE_COUNT: files,
             }
-            daily_locations_data.append(loc_info)
-
-        results[day] = daily_locations_data
+            for loc, (aips, size, files) in zip(locations, period_usage, strict=True)
+        ]
 
     report[fields.FIELD_LOCATIONS_USAGE_OVER_TIME] = results
 
@@ -1,6 +1,13 @@
+from datetime import datetime
+from operator import itemgetter
+
 from AIPscan import typesense_helpers as ts_helpers
 from AIPscan.Data import fields
+from AIPscan.Data import get_storage_service_name
+from AIPscan.Data import report_data
 from AIPscan.Data import report_dict
+from AIPscan.models import FileType
+from AIPscan.models import StorageLocation
 
 
 def document_to_report_row(document, report_fields):
@@ -17,6 +24,11 @@ def document_to_report_row(document, report_fields):
     return row
 
 
+def timestamp_to_datetime(timestamp):
+    """Return datetime for a timestamp indexed by populate_index."""
+    return datetime.fromtimestamp(timestamp)
+
+
 def formats_count(
     storage_service_id,
     storage_location_id,
@@ -39,7 +51,7 @@ def formats_count(
             "filter_by": ts_helpers.assemble_filter_by(file_filters),
             "exclude_fields": "*",
             "facet_by": "file_format",
-            "max_facet_values": 10000,
+            "max_facet_values": ts_helpers.MAX_FACET_VALUES,
         },
     )
 
@@ -216,7 +228,7 @@ def format_versions_count(
             "filter_by": ts_helpers.assemble_filter_by(file_filters),
             "include_fields": "puid",
             "facet_by": "puid",
-            "max_facet_values": 10000,
+            "max_facet_values": ts_helpers.MAX_FACET_VALUES,
         },
     )
 
@@ -284,3 +296,325 @@ def format_versions_count(
         report[fields.FIELD_FORMAT_VERSIONS].append(version_info)
 
     return report
+
+
+def _aips_by_file_format_or_puid(
+    storage_service_id,
+    storage_location_id,
+    search_string,
+    original_files=True,
+    file_format=True,
+):
+    report = report_dict(storage_service_id, storage_location_id)
+
+    if file_format:
+        report[fields.FIELD_FORMAT] = search_string
+        search_field = "file_format"
+    else:
+        report[fields.FIELD_PUID] = search_string
+        search_field = "puid"
+
+    report[fields.FIELD_AIPS] = []
+
+    file_type = FileType.original if original_files else FileType.preservation
+
+    filters = [
+        ("storage_service_id", "=", storage_service_id),
+        ("file_type", "=", f"'{file_type.value}'"),
+        (search_field, "=", f"`{search_string}`"),
+    ]
+
+    if storage_location_id is not None and storage_location_id != "":
+        filters.append(("storage_location_id", "=", storage_location_id))
+
+    # Get file counts for each AIP via facet data
+    results = ts_helpers.search(
+        "file",
+        {
+            "q": "*",
+            "filter_by": ts_helpers.assemble_filter_by(filters),
+            "exclude_fields": "*",
+            "facet_by": "aip_id",
+            "max_facet_values": ts_helpers.MAX_FACET_VALUES,
+        },
+    )
+
+    aip_counts = ts_helpers.facet_value_counts(results, "aip_id")
+
+    if len(aip_counts) == 0:
+        return report
+
+    # Request AIP details and total size of matching files for each AIP
+    searches = []
+    for aip_id in aip_counts.keys():
+        aip_filters = filters.copy()
+        aip_filters.append(("aip_id", "=", aip_id))
+
+        searches.append(
+            {
+                "collection": ts_helpers.collection_prefix("file"),
+                "q": "*",
+                "include_fields": "aip_id,aip_uuid,transfer_name",
+                "filter_by": ts_helpers.assemble_filter_by(aip_filters),
+                "facet_by": "size",
+                "max_facet_values": 1,
+                "per_page": 1,
+            }
+        )
+
+    for results in ts_helpers.multi_search(searches):
+        document = results["hits"][0]["document"]
+
+        aip_info = {}
+
+        aip_info[fields.FIELD_ID] = document["aip_id"]
+        aip_info[fields.FIELD_AIP_NAME] = document.get("transfer_name")
+        aip_info[fields.FIELD_UUID] = document.get("aip_uuid")
+        aip_info[fields.FIELD_COUNT] = aip_counts[str(document["aip_id"])]
+        aip_info[fields.FIELD_SIZE] = int(ts_helpers.facet_stats_sum(results, "size"))
+
+        report[fields.FIELD_AIPS].append(aip_info)
+
+    report[fields.FIELD_AIPS].sort(
+        key=itemgetter(fields.FIELD_COUNT, fields.FIELD_SIZE), reverse=True
+    )
+
+    return report
+
+
+def aips_by_file_format(
+    storage_service_id, file_format, original_files=True, storage_location_id=None
+):
+    return _aips_by_file_format_or_puid(
+        storage_service_id=storage_service_id,
+        storage_location_id=storage_location_id,
+        search_string=file_format,
+        original_files=original_files,
+    )
+
+
+def aips_by_puid(
+    storage_service_id, puid, original_files=True, storage_location_id=None
+):
+    return _aips_by_file_format_or_puid(
+        storage_service_id=storage_service_id,
+        storage_location_id=storage_location_id,
+        search_string=puid,
+        original_files=original_files,
+        file_format=False,
+    )
+
+
+def agents_transfers(
+    storage_service_id, start_date, end_date, storage_location_id=None
+):
+    report = report_dict(storage_service_id, storage_location_id)
+    report[fields.FIELD_INGESTS] = []
+
+    if not report[fields.FIELD_STORAGE_NAME]:
+        return report
+
+    filters = [
+        ("create_date", ">=", ts_helpers.datetime_to_timestamp_int(start_date)),
+        ("create_date", "<", ts_helpers.datetime_to_timestamp_int(end_date)),
+        ("storage_service_id", "=", storage_service_id),
+    ]
+
+    if storage_location_id is not None and storage_location_id != "":
+        filters.append(("storage_location_id", "=", storage_location_id))
+
+    documents = ts_helpers.export_documents(
+        "aip",
+        ts_helpers.assemble_filter_by(filters),
+        "id,uuid,transfer_name,create_date,ingestion_date,ingestion_agent",
+    )
+
+    for document in sorted(documents, key=lambda document: int(document["id"])):
+        # AIPs without an ingestion event aren't reported, as in the SQL
+        # implementation
+        if "ingestion_date" not in document:
+            continue
+
+        log_line = {}
+        log_line[fields.FIELD_AIP_UUID] = document.get("uuid")
+        log_line[fields.FIELD_AIP_NAME] = document.get("transfer_name")
+        log_line[fields.FIELD_INGEST_START_DATE] = str(
+            timestamp_to_datetime(document["ingestion_date"])
+        )
+        log_line[fields.FIELD_INGEST_FINISH_DATE] = str(
+            timestamp_to_datetime(document["create_date"])
+        )
+        if document.get("ingestion_agent"):
+            log_line[fields.FIELD_USER] = report_data._get_username(
+                document["ingestion_agent"]
+            )
+
+        report[fields.FIELD_INGESTS].append(log_line)
+
+    return report
+
+
+def preservation_derivatives_rows(
+    storage_service_id, storage_location_id=None, aip_uuid=None
+):
+    filters = [
+        ("storage_service_id", "=", storage_service_id),
+        ("file_type", "=", f"'{FileType.preservation.value}'"),
+    ]
+
+    if storage_location_id is not None and storage_location_id != "":
+        filters.append(("storage_location_id", "=", storage_location_id))
+
+    if aip_uuid:
+        filters.append(("aip_uuid", "=", f"`{aip_uuid}`"))
+
+    derivatives = list(
+        ts_helpers.export_documents(
+            "file",
+            ts_helpers.assemble_filter_by(filters),
+            "id,uuid,name,file_format,aip_uuid,transfer_name,original_file_id",
+        )
+    )
+
+    originals = ts_helpers.documents_by_id(
+        "file",
+        {
+            derivative["original_file_id"]
+            for derivative in derivatives
+            if "original_file_id" in derivative
+        },
+        "id,uuid,name,file_format,format_version,puid",
+    )
+
+    # Order rows as the SQL implementation does
+    derivatives.sort(
+        key=lambda derivative: (
+            derivative.get("aip_uuid", ""),
+            derivative.get("file_format", ""),
+            int(derivative["id"]),
+        )
+    )
+
+    for derivative in derivatives:
+        file_info = {}
+
+        file_info[fields.FIELD_AIP_UUID] = derivative.get("aip_uuid")
+        file_info[fields.FIELD_AIP_NAME] = derivative.get("transfer_name")
+
+        file_info[fields.FIELD_ID] = int(derivative["id"])
+        file_info[fields.FIELD_UUID] = derivative.get("uuid")
+        file_info[fields.FIELD_NAME] = derivative.get("name")
+        file_info[fields.FIELD_FORMAT] = derivative.get("file_format")
+
+        original = originals.get(derivative.get("original_file_id"))
+        if original is not None:
+            file_info[fields.FIELD_ORIGINAL_UUID] = original.get("uuid")
+            file_info[fields.FIELD_ORIGINAL_NAME] = original.get("name")
+            file_info[fields.FIELD_ORIGINAL_FORMAT] = original.get("file_format")
+            file_info[fields.FIELD_ORIGINAL_VERSION] = original.get("format_version")
+            file_info[fields.FIELD_ORIGINAL_PUID] = original.get("puid")
+
+        yield file_info
+
+
+def preservation_derivatives(
+    storage_service_id, storage_location_id=None, aip_uuid=None
+):
+    report = report_dict(storage_service_id, storage_location_id)
+    report[fields.FIELD_FILES] = list(
+        preservation_derivatives_rows(storage_service_id, storage_location_id, aip_uuid)
+    )
+
+    return report
+
+
+def storage_locations(storage_service_id, start_date, end_date):
+    report = {}
+    report[fields.FIELD_STORAGE_NAME] = get_storage_service_name(storage_service_id)
+    report[fields.FIELD_LOCATIONS] = []
+
+    locations = StorageLocation.query.filter_by(
+        storage_service_id=storage_service_id
+    ).all()
+
+    if len(locations) == 0:
+        return report
+
+    # Get AIP counts for each location via facet data
+    aip_filters = [
+        ("create_date", ">=", ts_helpers.datetime_to_timestamp_int(start_date)),
+        ("create_date", "<", ts_helpers.datetime_to_timestamp_int(end_date)),
+        ("storage_service_id", "=", storage_service_id),
+    ]
+
+    results = ts_helpers.search(
+        "aip",
+        {
+            "q": "*",
+            "filter_by": ts_helpers.assemble_filter_by(aip_filters),
+            "exclude_fields": "*",
+            "facet_by": "storage_location_id",
+            "max_facet_values": ts_helpers.MAX_FACET_VALUES,
+        },
+    )
+
+    aip_counts = ts_helpers.facet_value_counts(results, "storage_location_id")
+
+    # Get original file counts for each location via facet data
+    file_filters = ts_helpers.file_filters(
+        storage_service_id, None, start_date, end_date
+    )
+
+    results = ts_helpers.search(
+        "file",
+        {
+            "q": "*",
+            "filter_by": ts_helpers.assemble_filter_by(file_filters),
+            "exclude_fields": "*",
+            "facet_by": "storage_location_id",
+            "max_facet_values": ts_helpers.MAX_FACET_VALUES,
+        },
+    )
+
+    file_counts = ts_helpers.facet_value_counts(results, "storage_location_id")
+
+    # Request total size of all files, not just originals, in each location
+    size_filters = ts_helpers.file_filters(
+        storage_service_id, None, start_date, end_date, file_type=None
+    )
+
+    searches = []
+    for location in locations:
+        location_filters = size_filters.copy()
+        location_filters.append(("storage_location_id", "=", location.id))
+
+        searches.append(
+            {
+                "collection": ts_helpers.collection_prefix("file"),
+                "q": "*",
+                "include_fields": "storage_location_id",
+                "filter_by": ts_helpers.assemble_filter_by(location_filters),
+                "facet_by": "size",
+                "max_facet_values": 1,
+                "per_page": 1,
+            }
+        )
+
+    location_searches = ts_helpers.multi_search(searches)
+
+    # Format results for report
+    for location, results in zip(locations, location_searches, strict=True):
+        loc_info = {}
+
+        loc_info[fields.FIELD_ID] = location.id
+        loc_info[fields.FIELD_UUID] = location.uuid
+        loc_info[fields.FIELD_STORAGE_LOCATION] = location.description
+        loc_info[fields.FIELD_AIPS] = aip_counts.get(str(location.id), 0)
+        loc_info[fields.FIELD_SIZE] = int(ts_helpers.facet_stats_sum(results, "size"))
+        loc_info[fields.FIELD_FILE_COUNT] = file_counts.get(str(location.id), 0)
+
+        report[fields.FIELD_LOCATIONS].append(loc_info)
+
+    report[fields.FIELD_LOCATIONS].sort(key=itemgetter(fields.FIELD_AIPS), reverse=True)
+
+    return report
@@ -4,11 +4,16 @@ the ingest log report and agents-transfers API endpoint.
 
 import pytest
 
+from AIPscan import db
+from AIPscan import typesense_helpers
+from AIPscan import typesense_test_helpers
 from AIPscan.conftest import AIP_CREATION_TIME
 from AIPscan.conftest import INGEST_EVENT_CREATION_TIME
 from AIPscan.Data import fields
 from AIPscan.Data import report_data
+from AIPscan.Data import report_data_typesense
 from AIPscan.helpers import parse_datetime_bound
+from AIPscan.models import AIP
 
 DAY_BEFORE_AIP_CREATION = parse_datetime_bound("2020-12-01")
 DAY_OF_AIP_CREATION = parse_datetime_bound("2020-12-03", upper=True)
@@ -126,3 +131,28 @@ def test_agents_transfers_no_ingestion_event(
     assert report[fields.FIELD_STORAGE_NAME] == storage_name
     assert report[fields.FIELD_STORAGE_LOCATION] == location_name
     assert len(report[fields.FIELD_INGESTS]) == number_of_ingests
+
+
+def test_agents_transfers_typesense(app_with_populated_files, enable_typesense, mocker):
+    """Test that Typesense ingest log matches the database one."""
+    aip = db.session.get(AIP, 1)
+    doc = typesense_helpers.model_instance_to_document(AIP, aip)
+    typesense_helpers.augment_aip_document_with_ingestion_data(
+        doc, typesense_helpers.aip_ingestion_cache(), aip
+    )
+    typesense_test_helpers.fake_collection(mocker, {"hits": [{"document": doc}]})
+
+    report = report_data_typesense.agents_transfers(
+        storage_service_id=1,
+        start_date=DAY_BEFORE_AIP_CREATION,
+        end_date=DAY_OF_AIP_CREATION,
+        storage_location_id=1,
+    )
+
+    assert report == report_data.agents_transfers(
+        storage_service_id=1,
+        start_date=DAY_BEFORE_AIP_CREATION,
+        end_date=DAY_OF_AIP_CREATION,
+        storage_location_id=1,
+    )
+    assert report[fields.FIELD_INGESTS][0]["User"] == "user one"
@@ -0,0 +1,64 @@
+import pytest
+
+from AIPscan import test_helpers
+from AIPscan.conftest import AIP_1_UUID
+from AIPscan.conftest import ORIGINAL_FILE_1_UUID
+from AIPscan.conftest import ORIGINAL_FILE_2_UUID
+from AIPscan.Data import data
+from AIPscan.Data import fields
+from AIPscan.models import AIP
+from AIPscan.models import FileType
+from AIPscan.pagination import InvalidCursor
+
+
+def test_aip_list(app_with_populated_files):
+    report = data.aip_list(storage_service_id=1, limit=1)
+
+    assert report[fields.FIELD_TOTAL] == 1
+    assert report[fields.FIELD_NEXT_CURSOR] is None
+    assert len(report[fields.FIELD_AIPS]) == 1
+
+    aip = report[fields.FIELD_AIPS][0]
+    assert aip[fields.FIELD_UUID] == AIP_1_UUID
+    assert aip[fields.FIELD_CREATED_DATE] == "2020-12-02 10:30:32"
+    assert aip[fields.FIELD_FILE_COUNT] == 1
+    assert aip[fields.FIELD_DERIVATIVE_COUNT] == 1
+
+
+def test_aip_list_invalid_cursor(app_with_populated_files):
+    with pytest.raises(InvalidCursor):
+        data.aip_list(storage_service_id=1, cursor="invalid")
+
+
+def test_aip_files(app_instance):
+    aip = test_helpers.create_test_aip(uuid=AIP_1_UUID)
+    for file_uuid in (ORIGINAL_FILE_1_UUID, ORIGINAL_FILE_2_UUID):
+        test_helpers.create_test_file(
+            uuid=file_uuid, file_type=FileType.original, aip_id=aip.id
+        )
+    test_helpers.create_test_file(file_type=FileType.preservation, aip_id=aip.id)
+
+    report = data.aip_files(AIP_1_UUID, limit=1)
+
+    assert report[fields.FIELD_AIP_UUID] == AIP_1_UUID
+    assert report[fields.FIELD_TOTAL] == 2
+    assert [file_[fields.FIELD_UUID] for file_ in report[fields.FIELD_FILES]] == [
+        ORIGINAL_FILE_1_UUID
+    ]
+
+    cursor = report[fields.FIELD_NEXT_CURSOR]
+    report = data.aip_files(AIP_1_UUID, cursor=cursor, limit=1)
+
+    assert [file_[fields.FIELD_UUID] for file_ in report[fields.FIELD_FILES]] == [
+        ORIGINAL_FILE_2_UUID
+    ]
+    assert report[fields.FIELD_NEXT_CURSOR] is None
+
+    report = data.aip_files(AIP_1_UUID, original_files=False)
+
+    assert report[fields.FIELD_TOTAL] == AIP.query.one().preservation_file_count == 1
+    assert len(report[fields.FIELD_FILES]) == 1
+
+
+def test_aip_files_unknown_aip(app_with_populated_files):
+    assert data.aip_files("not-an-aip") is None
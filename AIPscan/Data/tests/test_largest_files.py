@@ -1,5 +1,6 @@
 import datetime
 import uuid
+from types import SimpleNamespace
 
 import pytest
 
@@ -9,7 +10,6 @@ from AIPscan import typesense_test_helpers
 from AIPscan.Data import fields
 from AIPscan.Data import report_data
 from AIPscan.Data import report_data_typesense
-from AIPscan.Data.tests import MOCK_AIP
 from AIPscan.Data.tests import MOCK_AIP_NAME
 from AIPscan.Data.tests import MOCK_AIP_UUID
 from AIPscan.Data.tests import MOCK_STORAGE_SERVICE
@@ -61,6 +61,23 @@ TEST_FILES = [
 ]
 
 
+def _largest_files_row(file_):
+    """Return a row mimicking the projected largest files query result."""
+    return SimpleNamespace(
+        id=file_.id,
+        uuid=file_.uuid,
+        name=file_.name,
+        size=file_.size,
+        aip_id=file_.aip_id,
+        file_type=file_.file_type,
+        file_format=file_.file_format,
+        format_version=file_.format_version,
+        puid=file_.puid,
+        transfer_name=MOCK_AIP_NAME,
+        aip_uuid=MOCK_AIP_UUID,
+    )
+
+
 @pytest.mark.parametrize(
     "storage_location_id, storage_location_description, start_date, end_date, file_count, largest_file_size, second_largest_file_size",
     [
@@ -112,14 +129,11 @@ def test_largest_files_elements(
 ):
     """Test that returned file data matches expected values."""
     mock_query = mocker.patch("AIPscan.Data.report_data._largest_files_query")
-    mock_query.return_value = [test_file]
+    mock_query.return_value = [_largest_files_row(test_file)]
 
     mock_get_ss_name = mocker.patch("AIPscan.Data._get_storage_service")
     mock_get_ss_name.return_value = MOCK_STORAGE_SERVICE
 
-    mock_get_aip = mocker.patch("AIPscan.Data.report_data.db.session.get")
-    mock_get_aip.return_value = MOCK_AIP
-
     report = report_data.largest_files(
         MOCK_STORAGE_SERVICE_ID,
         start_date=parse_datetime_bound("2000-01-01"),
@@ -0,0 +1,138 @@
+"""Check that report queries use the indexes designed for them.
+
+Reports are run against a seeded database and each SELECT statement they
+send to MySQL is explained. The optimizer only prefers an index when it
+is selective, so reports are run over the last few months of AIPs
+created over five years.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+import sqlalchemy as sa
+
+from AIPscan import db
+from AIPscan.benchmarks.seeding import seed_database
+from AIPscan.conftest import truncate_tables
+from AIPscan.Data import report_data
+from AIPscan.models import File
+from AIPscan.models import FileType
+
+FILE_COUNT = 5000
+
+END_DATE = datetime.now()
+START_DATE = END_DATE - timedelta(days=90)
+
+AIP_INDEX = "ix_aip_storage_service_create_date_location"
+FILE_INDEX = "ix_file_aip_file_type_format_size"
+FILE_DATE_INDEX = "ix_file_storage_service_type_date"
+FILE_FORMAT_INDEX = "ix_file_storage_service_type_format"
+
+
+@pytest.fixture(scope="module")
+def seeded_data(app_setup):
+    with app_setup.app_context():
+        truncate_tables()
+        storage_service_id = seed_database(FILE_COUNT)
+        connection = db.session.connection()
+        for table in ("aip", "file"):
+            connection.exec_driver_sql(f"ANALYZE TABLE {table}").all()
+
+        file_ = db.session.execute(
+            sa.select(File)
+            .filter(File.file_type == FileType.original)
+            .order_by(File.id)
+            .limit(1)
+        ).scalar_one()
+
+        yield {
+            "storage_service_id": storage_service_id,
+            "file_format": file_.file_format,
+            "puid": file_.puid,
+        }
+
+        db.session.remove()
+        truncate_tables()
+
+
+@contextmanager
+def _captured_selects():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    sa.event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        sa.event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _used_indexes(report):
+    """Return names of the indexes used by the queries of a report."""
+    with _captured_selects() as statements:
+        report()
+
+    connection = db.session.connection()
+    return {
+        row["key"]
+        for statement, parameters in statements
+        for row in connection.exec_driver_sql(
+            f"EXPLAIN {statement}", parameters
+        ).mappings()
+    }
+
+
+@pytest.mark.parametrize(
+    "report, indexes",
+    [
+        (
+            lambda d: report_data.formats_count(
+                d["storage_service_id"], START_DATE, END_DATE
+            ),
+            {FILE_DATE_INDEX},
+        ),
+        (
+            lambda d: report_data.format_versions_count(
+                d["storage_service_id"], START_DATE, END_DATE
+            ),
+            {FILE_DATE_INDEX},
+        ),
+        (
+            lambda d: report_data.largest_aips(
+                d["storage_service_id"], START_DATE, END_DATE
+            ),
+            {AIP_INDEX},
+        ),
+        (
+            lambda d: report_data.storage_locations_usage_over_time(
+                d["storage_service_id"], START_DATE, END_DATE
+            ),
+            {AIP_INDEX, FILE_INDEX},
+        ),
+        (
+            lambda d: report_data.aips_by_file_format(
+                d["storage_service_id"], d["file_format"]
+            ),
+            {FILE_FORMAT_INDEX},
+        ),
+        (
+            lambda d: report_data.aips_by_puid(d["storage_service_id"], d["puid"]),
+            {FILE_FORMAT_INDEX},
+        ),
+    ],
+    ids=[
+        "formats_count",
+        "format_versions_count",
+        "largest_aips",
+        "storage_locations_usage_over_time",
+        "aips_by_file_format",
+        "aips_by_puid",
+    ],
+)
+def test_report_uses_indexes(seeded_data, report, indexes):
+    assert indexes <= _used_indexes(lambda: report(seeded_data))
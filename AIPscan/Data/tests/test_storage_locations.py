@@ -292,3 +292,58 @@ def test_storage_locations_usage_over_time(storage_locations, cumulative):
         assert second_location[fields.FIELD_AIPS] == 0
         assert second_location[fields.FIELD_SIZE] == 0
         assert second_location[fields.FIELD_FILE_COUNT] == 0
+
+
+@pytest.mark.parametrize(
+    "granularity, cumulative, periods_count, first_period, location_1_aips, location_1_size, location_2_aips",
+    [
+        # Monthly differential totals
+        ("month", False, 18, "2020-01", [1, 0, 0, 0, 0, 1], 600, 1),
+        # Monthly cumulative totals
+        ("month", True, 18, "2020-01", [1, 1, 1, 1, 1, 2], 600, 2),
+        # Yearly differential totals
+        ("year", False, 2, "2020", [2, 0], 1600, 1),
+        # Weekly periods are labelled by the Monday they start on
+        ("week", False, 75, "2019-12-30", [1, 0, 0, 0, 0, 0], 600, 1),
+        # Unknown granularities fall back to daily totals
+        ("fortnight", False, 519, "2020-01-01", [1, 0, 0, 0, 0, 0], 600, 1),
+    ],
+)
+def test_storage_locations_usage_over_time_columns(
+    storage_locations,
+    granularity,
+    cumulative,
+    periods_count,
+    first_period,
+    location_1_aips,
+    location_1_size,
+    location_2_aips,
+):
+    """Test columnar response with different granularities."""
+    report = report_data.storage_locations_usage_over_time_columns(
+        storage_service_id=1,
+        start_date=parse_datetime_bound("2020-01-01"),
+        end_date=parse_datetime_bound(DATE_AFTER_AIP_3, upper=True),
+        cumulative=cumulative,
+        granularity=granularity,
+    )
+
+    assert report[fields.FIELD_STORAGE_NAME] == "test storage service"
+
+    usage = report[fields.FIELD_LOCATIONS_USAGE_OVER_TIME]
+    periods = usage[fields.FIELD_PERIODS]
+
+    assert len(periods) == periods_count
+    assert periods[0] == first_period
+
+    first_location, second_location = usage[fields.FIELD_LOCATIONS]
+    assert first_location[fields.FIELD_UUID] == STORAGE_LOCATION_1_UUID
+    assert second_location[fields.FIELD_UUID] == STORAGE_LOCATION_2_UUID
+
+    for location in (first_location, second_location):
+        for metric in (fields.FIELD_AIPS, fields.FIELD_SIZE, fields.FIELD_FILE_COUNT):
+            assert len(location[metric]) == periods_count
+
+    assert first_location[fields.FIELD_AIPS][: len(location_1_aips)] == location_1_aips
+    assert first_location[fields.FIELD_SIZE][0] == location_1_size
+    assert sum(second_location[fields.FIELD_AIPS]) == location_2_aips
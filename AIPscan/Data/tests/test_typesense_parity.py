@@ -0,0 +1,139 @@
+"""Test that Typesense-backed reports match their database counterparts.
+
+These tests index the test database in a running Typesense server, so are
+skipped unless TYPESENSE_TEST_API_KEY is set (see CONTRIBUTING.md).
+"""
+
+import json
+import os
+
+import pytest
+import typesense
+from flask import current_app
+
+from AIPscan import typesense_helpers
+from AIPscan.conftest import JPEG_FILE_FORMAT
+from AIPscan.conftest import PUID_2
+from AIPscan.conftest import PUID_3
+from AIPscan.conftest import TIFF_FILE_FORMAT
+from AIPscan.Data import data
+from AIPscan.Data import data_typesense
+from AIPscan.Data import fields
+from AIPscan.Data import report_data
+from AIPscan.Data import report_data_typesense
+from AIPscan.helpers import parse_datetime_bound
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("TYPESENSE_TEST_API_KEY"),
+    reason="TYPESENSE_TEST_API_KEY isn't set",
+)
+
+START_DATE = parse_datetime_bound("2000-01-01")
+END_DATE = parse_datetime_bound("2030-12-31", upper=True)
+
+
+@pytest.fixture
+def typesense_server(app_instance, monkeypatch):
+    config = {
+        "TYPESENSE_API_KEY": os.getenv("TYPESENSE_TEST_API_KEY"),
+        "TYPESENSE_HOST": os.getenv("TYPESENSE_TEST_HOST", "localhost"),
+        "TYPESENSE_PORT": os.getenv("TYPESENSE_TEST_PORT", "8108"),
+        "TYPESENSE_COLLECTION_PREFIX": "aipscan_test_",
+    }
+    for key, value in config.items():
+        monkeypatch.setitem(current_app.config, key, value)
+
+    yield
+
+    ts_client = typesense_helpers.client()
+    for model in typesense_helpers.APP_MODELS:
+        table = typesense_helpers.get_model_table(model)
+        try:
+            ts_client.collections[typesense_helpers.collection_prefix(table)].delete()
+        except typesense.exceptions.ObjectNotFound:
+            pass
+
+
+def index_database():
+    typesense_helpers.initialize_index()
+    list(typesense_helpers.populate_index())
+
+
+def unordered(rows):
+    """Return rows in a stable order, for reports that may order ties
+    differently.
+    """
+    return sorted(rows, key=lambda row: json.dumps(row, sort_keys=True))
+
+
+@pytest.mark.parametrize("file_format", [JPEG_FILE_FORMAT, TIFF_FILE_FORMAT])
+@pytest.mark.parametrize("original_files", [True, False])
+def test_aips_by_file_format(
+    storage_locations, typesense_server, file_format, original_files
+):
+    index_database()
+
+    expected = report_data.aips_by_file_format(1, file_format, original_files)
+    report = report_data_typesense.aips_by_file_format(1, file_format, original_files)
+
+    assert unordered(report.pop(fields.FIELD_AIPS)) == unordered(
+        expected.pop(fields.FIELD_AIPS)
+    )
+    assert report == expected
+
+
+@pytest.mark.parametrize("puid", [PUID_2, PUID_3])
+def test_aips_by_puid(aip_contents, typesense_server, puid):
+    index_database()
+
+    expected = report_data.aips_by_puid(1, puid)
+    report = report_data_typesense.aips_by_puid(1, puid)
+
+    assert unordered(report.pop(fields.FIELD_AIPS)) == unordered(
+        expected.pop(fields.FIELD_AIPS)
+    )
+    assert report == expected
+
+
+def test_agents_transfers(app_with_populated_files, typesense_server):
+    index_database()
+
+    assert report_data_typesense.agents_transfers(
+        1, START_DATE, END_DATE
+    ) == report_data.agents_transfers(1, START_DATE, END_DATE)
+
+
+@pytest.mark.parametrize("aip_uuid", [None, "111111111111-1111-1111-11111111"])
+def test_preservation_derivatives(preservation_derivatives, typesense_server, aip_uuid):
+    index_database()
+
+    assert report_data_typesense.preservation_derivatives(
+        1, aip_uuid=aip_uuid
+    ) == report_data.preservation_derivatives(1, aip_uuid=aip_uuid)
+
+
+def test_storage_locations(storage_locations, typesense_server):
+    index_database()
+
+    expected = report_data.storage_locations(1, START_DATE, END_DATE)
+    report = report_data_typesense.storage_locations(1, START_DATE, END_DATE)
+
+    assert unordered(report.pop(fields.FIELD_LOCATIONS)) == unordered(
+        expected.pop(fields.FIELD_LOCATIONS)
+    )
+    assert report == expected
+
+
+@pytest.mark.parametrize("original_files", [True, False])
+def test_aip_file_format_overview(storage_locations, typesense_server, original_files):
+    index_database()
+
+    assert data_typesense.aip_file_format_overview(
+        1, START_DATE, END_DATE, original_files
+    ) == data.aip_file_format_overview(1, START_DATE, END_DATE, original_files)
+
+
+def test_derivative_overview(preservation_derivatives, typesense_server):
+    index_database()
+
+    assert data_typesense.derivative_overview(1) == data.derivative_overview(1)
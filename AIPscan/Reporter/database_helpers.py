@@ -1,6 +1,140 @@
+import re
+from datetime import datetime
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import union
+from sqlalchemy.dialects import mysql
+
+from AIPscan import db
+from AIPscan.models import AIP
+
+# Full UUID, e.g. "5ae66aef-1d8d-4d3e-bc3c-7b0ecb6b5c9a".
+UUID_RE = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE
+)
+# Something that could be the start of a UUID, e.g. "5ae66aef" or "5ae6-".
+UUID_PREFIX_RE = re.compile(r"^[0-9a-f][0-9a-f-]{3,35}$", re.IGNORECASE)
+# A year, month or day, e.g. "2020", "2020-05" or "2020-05-17".
+DATE_PREFIX_RE = re.compile(r"^(\d{4})(?:-(\d{2})(?:-(\d{2}))?)?$")
+
+# Characters with a special meaning in MySQL boolean mode full-text searches.
+FULLTEXT_OPERATORS_RE = re.compile(r'[+\-<>()~*"@]+')
+# Words shorter than InnoDB's default innodb_ft_min_token_size aren't indexed.
+FULLTEXT_MIN_TOKEN_SIZE = 3
+# InnoDB's default full-text stopwords, which aren't indexed either.
+FULLTEXT_STOPWORDS = frozenset(
+    (
+        "a about an are as at be by com de en for from how i in is it la of on or"
+        " that the this to was what when where who will with und www"
+    ).split()
+)
+
+
 def get_possible_storage_locations(storage_service):
     """Return list of Storage Locations if storage service provided."""
     if storage_service is None:
         return []
 
     return storage_service.storage_locations
+
+
+def _date_prefix_range(query):
+    """Return the datetime range covered by a year, month or day query.
+
+    :param query: Search query (str)
+
+    :returns: Tuple of start (inclusive) and end (exclusive) datetimes or None
+    """
+    match = DATE_PREFIX_RE.match(query)
+    if match is None:
+        return None
+
+    year, month, day = match.groups()
+    try:
+        start = datetime(int(year), int(month or 1), int(day or 1))
+    except ValueError:
+        return None
+
+    if day is not None:
+        return start, start + relativedelta(days=1)
+    if month is not None:
+        return start, start + relativedelta(months=1)
+    return start, start + relativedelta(years=1)
+
+
+def _fulltext_boolean_query(query):
+    """Turn a search query into a MySQL boolean mode full-text query.
+
+    Every word is required and matched as a prefix, so "sample tran" finds
+    "Sample transfer". Words that aren't indexed are left out.
+
+    :param query: Search query (str)
+
+    :returns: Boolean mode query (str) or None if no word can be searched
+    """
+    words = FULLTEXT_OPERATORS_RE.sub(" ", query).split()
+    terms = [
+        f"+{word}*"
+        for word in words
+        if len(word) >= FULLTEXT_MIN_TOKEN_SIZE
+        and word.lower() not in FULLTEXT_STOPWORDS
+    ]
+    if not terms:
+        return None
+
+    return " ".join(terms)
+
+
+def _transfer_name_criterion(query):
+    """Return criterion matching AIPs by transfer name.
+
+    MySQL uses the FULLTEXT index on transfer_name. Other databases, and
+    queries without any indexable word, fall back to a substring match.
+    """
+    if db.engine.dialect.name == "mysql":
+        boolean_query = _fulltext_boolean_query(query)
+        if boolean_query is not None:
+            return mysql.match(
+                AIP.transfer_name, against=boolean_query
+            ).in_boolean_mode()
+
+    return AIP.transfer_name.contains(query, autoescape=True)
+
+
+def aip_search_criteria(query):
+    """Return SQLAlchemy criterion for an AIP search query.
+
+    A full UUID only matches by UUID. Anything that could be the start of a
+    UUID or a creation date is also matched using the indexes on uuid and
+    create_date rather than searching inside every value.
+
+    MySQL can't combine a FULLTEXT index with other indexes, so ORing the
+    criteria would scan every AIP. Instead, the IDs matching each criterion
+    are looked up separately and their union is matched by primary key.
+
+    :param query: Search query (str)
+
+    :returns: SQLAlchemy criterion
+    """
+    query = query.strip()
+
+    if UUID_RE.match(query):
+        return AIP.uuid == query.lower()
+
+    criteria = [_transfer_name_criterion(query)]
+
+    if UUID_PREFIX_RE.match(query):
+        criteria.append(AIP.uuid.startswith(query.lower()))
+
+    date_range = _date_prefix_range(query)
+    if date_range is not None:
+        start, end = date_range
+        criteria.append((AIP.create_date >= start) & (AIP.create_date < end))
+
+    if len(criteria) == 1:
+        return criteria[0]
+
+    aip_ids = union(
+        *(db.select(AIP.id).where(criterion) for criterion in criteria)
+    ).subquery()
+    return AIP.id.in_(db.select(aip_ids.c.id))
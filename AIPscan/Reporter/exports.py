@@ -0,0 +1,297 @@
+"""Report CSV exports run by Celery workers.
+
+Large CSV reports can take longer to write than a proxy in front of
+AIPscan waits for a response. Requesting a report's CSV with `async=1`
+instead records an ExportJob and hands it to a Celery worker, which
+writes the CSV to a gzip compressed file under EXPORTS_ROOT. The response
+gives the URLs to check on the export and to download it once done.
+
+Exports are reused for later requests of the same report with the same
+parameters until the reported data changes. Exports are removed once
+they are older than EXPORT_MAX_AGE_SECONDS, or when a newer export of the
+same report and parameters replaces them.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+from datetime import timedelta
+
+from flask import abort
+from flask import current_app
+from flask import jsonify
+from flask import send_file
+from flask import url_for
+from sqlalchemy import update
+
+from AIPscan import db
+from AIPscan.database import primary
+from AIPscan.database import read_only
+from AIPscan.helpers import parse_bool
+from AIPscan.models import ExportJob
+from AIPscan.models import ExportStatus
+from AIPscan.models import StorageService
+from AIPscan.Reporter import download_csv
+from AIPscan.Reporter import reporter
+from AIPscan.Reporter import request_params
+from AIPscan.Reporter.helpers import generate_csv
+
+# Number of rows written between updates of an export's progress.
+PROGRESS_INTERVAL = 10000
+
+# Time for which a replaced export is kept, so that whoever requested it
+# can still download it.
+SUPERSEDED_EXPORT_GRACE_SECONDS = 300
+
+EXPORTERS = {}
+
+
+def exporter(report, filename, format_size=False):
+    """Register function returning the headers and rows of a report's CSV.
+
+    The function is passed the report's request parameters (dict) and
+    returns a tuple of headers (list of str) and rows (iterable of dicts).
+
+    :param report: Report name (str)
+    :param filename: CSV filename (str)
+    :param format_size: Flag indicating whether to format size fields (bool)
+    """
+
+    def decorator(func):
+        EXPORTERS[report] = (func, filename, format_size)
+        return func
+
+    return decorator
+
+
+def csv_response(report, args):
+    """Return report CSV, or start exporting it if asked to by args.
+
+    :param report: Name of report registered with exporter (str)
+    :param args: Request parameters (dict)
+
+    :returns: Flask response
+    """
+    if parse_bool(args.get(request_params.ASYNC), default=False):
+        export_job = start_export(report, args)
+        response = jsonify(export_info(export_job))
+        response.status_code = 202
+        response.headers["Location"] = url_for(
+            "reporter.export_status", export_job_id=export_job.id
+        )
+        return response
+
+    func, filename, format_size = EXPORTERS[report]
+    headers, rows = func(args)
+    return download_csv(headers, rows, filename, format_size=format_size)
+
+
+def _export_params(args):
+    """Return parameters that identify an export as canonical JSON."""
+    ignored = (request_params.ASYNC, request_params.CSV)
+    params = {key: value for key, value in args.items() if key not in ignored}
+    return json.dumps(params, sort_keys=True)
+
+
+def _remove_outdated_exports(report, params_hash, data_version):
+    """Remove exports older than EXPORT_MAX_AGE_SECONDS, and finished
+    exports of the report and parameters made from outdated data.
+
+    Exports being written, and replaced exports that finished within
+    SUPERSEDED_EXPORT_GRACE_SECONDS, are kept.
+    """
+    now = datetime.now()
+    expired = now - timedelta(seconds=current_app.config["EXPORT_MAX_AGE_SECONDS"])
+    grace_ended = now - timedelta(seconds=SUPERSEDED_EXPORT_GRACE_SECONDS)
+    superseded = (
+        (ExportJob.report == report)
+        & (ExportJob.params_hash == params_hash)
+        & (ExportJob.data_version != data_version)
+        & (ExportJob.finished < grace_ended)
+    )
+    outdated = (
+        ExportJob.query.filter(ExportJob.status != ExportStatus.running)
+        .filter((ExportJob.created < expired) | superseded)
+        .all()
+    )
+    for export_job in outdated:
+        _remove_export_file(export_job)
+        db.session.delete(export_job)
+    if outdated:
+        db.session.commit()
+
+
+# Export jobs are written during requests and by workers, so are read from
+# the primary database, which has the latest status.
+@primary()
+def start_export(report, args):
+    """Return export of a report, queueing a new one if needed.
+
+    :param report: Name of report registered with exporter (str)
+    :param args: Request parameters (dict)
+
+    :returns: ExportJob
+    """
+    # Imported here as the task module imports this one.
+    from AIPscan.Reporter.tasks import export_report
+
+    params = _export_params(args)
+    params_hash = hashlib.sha256(params.encode("utf-8")).hexdigest()
+    data_version = StorageService.data_version_key()
+    _remove_outdated_exports(report, params_hash, data_version)
+
+    export_job = (
+        ExportJob.query.filter_by(report=report, params_hash=params_hash)
+        .filter(ExportJob.data_version == data_version)
+        .filter(ExportJob.status != ExportStatus.failed)
+        .order_by(ExportJob.id.desc())
+        .first()
+    )
+    if export_job is not None:
+        return export_job
+
+    _, filename, _ = EXPORTERS[report]
+    export_job = ExportJob(report, params, params_hash, data_version, filename)
+    db.session.add(export_job)
+    db.session.commit()
+
+    task = export_report.delay(export_job.id)
+    export_job.task_id = task.id
+    db.session.commit()
+
+    return export_job
+
+
+def export_path(export_job):
+    """Return path of the file an export is written to."""
+    return os.path.join(
+        current_app.config["EXPORTS_ROOT"], f"export-{export_job.id}.csv.gz"
+    )
+
+
+def _remove_export_file(export_job):
+    try:
+        os.remove(export_path(export_job))
+    except FileNotFoundError:
+        pass
+
+
+def _update_progress(export_job_id, rows_written):
+    # Use a separate connection so that the session's transaction, which
+    # may be streaming the rows, isn't committed.
+    with db.engine.begin() as connection:
+        connection.execute(
+            update(ExportJob)
+            .where(ExportJob.id == export_job_id)
+            .values(rows_written=rows_written)
+        )
+
+
+def write_export(export_job_id):
+    """Write report CSV for an export job.
+
+    :param export_job_id: ExportJob ID (int)
+    """
+    export_job = db.session.get(ExportJob, export_job_id)
+    if export_job is None:
+        return
+
+    export_job.status = ExportStatus.running
+    export_job.started = datetime.now()
+    db.session.commit()
+
+    func, _, format_size = EXPORTERS[export_job.report]
+    path = export_path(export_job)
+    partial_path = f"{path}.part"
+    rows_written = 0
+
+    def count_rows(rows):
+        nonlocal rows_written
+        for row in rows:
+            yield row
+            rows_written += 1
+            if rows_written % PROGRESS_INTERVAL == 0:
+                _update_progress(export_job_id, rows_written)
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Report queries can be answered by the read-only database
+        with read_only():
+            headers, rows = func(json.loads(export_job.params))
+            with gzip.open(partial_path, "wb") as export_file:
+                for chunk in generate_csv(headers, count_rows(rows), format_size):
+                    export_file.write(chunk)
+        os.replace(partial_path, path)
+    except Exception as err:
+        db.session.rollback()
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        export_job.status = ExportStatus.failed
+        export_job.error = str(err)
+        export_job.finished = datetime.now()
+        db.session.commit()
+        raise
+
+    export_job.status = ExportStatus.done
+    export_job.rows_written = rows_written
+    export_job.finished = datetime.now()
+    db.session.commit()
+
+
+def export_info(export_job):
+    """Return status of an export.
+
+    :param export_job: ExportJob
+
+    :returns: Export status (dict)
+    """
+    info = {
+        "id": export_job.id,
+        "report": export_job.report,
+        "status": export_job.status.value,
+        "rows_written": export_job.rows_written,
+        "created": export_job.created,
+        "started": export_job.started,
+        "finished": export_job.finished,
+        "error": export_job.error,
+        "status_url": url_for("reporter.export_status", export_job_id=export_job.id),
+        "download_url": None,
+    }
+    if export_job.status == ExportStatus.done:
+        info["download_url"] = url_for(
+            "reporter.download_export", export_job_id=export_job.id
+        )
+    return info
+
+
+@reporter.route("/exports/<int:export_job_id>/", methods=["GET"])
+@primary()
+def export_status(export_job_id):
+    """Return status of a report export."""
+    export_job = db.session.get(ExportJob, export_job_id)
+    if export_job is None:
+        abort(404)
+
+    return jsonify(export_info(export_job))
+
+
+@reporter.route("/exports/<int:export_job_id>/download/", methods=["GET"])
+@primary()
+def download_export(export_job_id):
+    """Send a finished report export."""
+    export_job = db.session.get(ExportJob, export_job_id)
+    if export_job is None or export_job.status != ExportStatus.done:
+        abort(404)
+
+    path = export_path(export_job)
+    if not os.path.exists(path):
+        abort(404)
+
+    return send_file(
+        path,
+        mimetype="application/gzip",
+        as_attachment=True,
+        download_name=f"{export_job.filename}.gz",
+    )
@@ -1,15 +1,20 @@
 """Code shared across reporting modules but not outside of reporting."""
 
 import csv
+import math
 from datetime import timedelta
 from io import StringIO
 
-from flask import make_response
-from natsort import natsorted
+from flask import Response
+from flask import has_request_context
+from flask import stream_with_context
 
 from AIPscan.Data import fields
 from AIPscan.helpers import filesizeformat
 
+# Approximate number of characters buffered before a CSV chunk is sent.
+CSV_CHUNK_SIZE = 65536
+
 
 def sort_puids(puids):
     """Return PUIDs sorted in natural sorting order.
@@ -23,6 +28,8 @@ def sort_puids(puids):
 
     :returns: Sorted list of PUIDs
     """
+    from natsort import natsorted
+
     return natsorted(puids)
 
 
@@ -96,52 +103,85 @@ def _remove_primary_keys(dictionary):
             pass
 
 
-def format_size_for_csv(rows):
-    """Return data prepared for CSV file.
+def _format_size_for_csv_row(row):
+    """Return a copy of a row with a formatted size field.
 
-    :param rows: Data assembled for tabular report (list of dicts)
+    :param row: Row assembled for tabular report (dict)
 
-    :returns: rows with formatted size field (list of dicts)
+    :returns: row with formatted size field and size in bytes added after
+        it, if the row has a size field (dict)
     """
-    edited_rows = []
+    if fields.FIELD_SIZE not in row:
+        return row
 
-    for row in rows:
-        # Add size in bytes after original size column
-        row_key_list = list(row.keys())
+    edited_row = {}
+    for key, value in row.items():
+        if key == fields.FIELD_SIZE:
+            # Format original size column and add size in bytes after it
+            edited_row[key] = filesizeformat(value)
+            edited_row[fields.FIELD_SIZE_BYTES] = value
+        else:
+            edited_row[key] = value
 
-        if fields.FIELD_SIZE in row_key_list:
-            size_position = row_key_list.index(fields.FIELD_SIZE) + 1
-            row_items = list(row.items())
+    return edited_row
 
-            row_items.insert(
-                size_position, (fields.FIELD_SIZE_BYTES, row[fields.FIELD_SIZE])
-            )
-            row = dict(row_items)
 
-            # Format original size column
-            row[fields.FIELD_SIZE] = filesizeformat(row[fields.FIELD_SIZE])
+def format_size_for_csv(rows):
+    """Return data prepared for CSV file.
 
-        edited_rows.append(row)
+    :param rows: Data assembled for tabular report (list of dicts)
 
-    return edited_rows
+    :returns: rows with formatted size field (list of dicts)
+    """
+    return [_format_size_for_csv_row(row) for row in rows]
 
 
-def download_csv(headers, rows, filename="report.csv"):
-    """Write CSV from string and send it as an attachment.
+def generate_csv(headers, rows, format_size):
+    """Yield encoded CSV chunks, preparing each row as it is written.
 
     :param headers: Row headers (list of str)
-    :param rows: Data to write to CSV, returned from Data endpoint (list of dicts)
-    :param filename: CSV filename (str)
+    :param rows: Iterable of row dicts
+    :param format_size: Flag indicating whether to format size fields (bool)
     """
     string_io = StringIO()
     writer = csv.writer(string_io)
     writer.writerow(headers)
+
     for row in rows:
+        if format_size:
+            row = _format_size_for_csv_row(row)
         _remove_primary_keys(row)
         writer.writerow(row.values())
-    response = make_response(string_io.getvalue())
+
+        if string_io.tell() >= CSV_CHUNK_SIZE:
+            yield string_io.getvalue().encode("utf-8")
+            string_io.seek(0)
+            string_io.truncate()
+
+    yield string_io.getvalue().encode("utf-8")
+
+
+def download_csv(headers, rows, filename="report.csv", format_size=False):
+    """Stream CSV and send it as an attachment.
+
+    Rows are consumed lazily so that a generator of rows can be written
+    without the whole report being held in memory.
+
+    :param headers: Row headers (list of str)
+    :param rows: Data to write to CSV, returned from Data endpoint (iterable
+        of dicts)
+    :param filename: CSV filename (str)
+    :param format_size: Flag indicating whether to format the size field of
+        each row, as format_size_for_csv does (bool)
+    """
+    chunks = generate_csv(headers, rows, format_size)
+    if has_request_context():
+        # Keep the request context, and with it the database session, alive
+        # until the last row has been written.
+        chunks = stream_with_context(chunks)
+
+    response = Response(chunks, mimetype="text/csv")
     response.headers["Content-Disposition"] = f"attachment; filename={filename}"
-    response.mimetype = "text/csv"
     return response
 
 
@@ -166,5 +206,42 @@ def calculate_paging_window(pagination):
     return first_item, min(last_item, pagination.total)
 
 
+class SearchPagination:
+    """Page of search engine results shaped like a Flask-SQLAlchemy pager.
+
+    Lets templates and calculate_paging_window page through results that
+    did not come from a database query. Pages are only addressed by number,
+    so there are no cursors to pass on.
+    """
+
+    prev_cursor = None
+    next_cursor = None
+    last_cursor = None
+
+    def __init__(self, items, page, per_page, total):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+
+    @property
+    def pages(self):
+        if self.total == 0:
+            return 0
+        return math.ceil(self.total / self.per_page)
+
+    @property
+    def prev_num(self):
+        if self.page <= 1:
+            return None
+        return self.page - 1
+
+    @property
+    def next_num(self):
+        if self.page >= self.pages:
+            return None
+        return self.page + 1
+
+
 def remove_dict_none_values(values):
     return {index: "" if value is None else value for (index, value) in values.items()}
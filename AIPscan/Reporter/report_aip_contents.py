@@ -3,12 +3,13 @@ from operator import itemgetter
 from flask import render_template
 from flask import request
 
+from AIPscan import typesense_helpers as ts_helpers
 from AIPscan.Data import data
+from AIPscan.Data import data_typesense
 from AIPscan.Data import fields
 from AIPscan.helpers import parse_bool
 from AIPscan.helpers import parse_datetime_bound
-from AIPscan.Reporter import download_csv
-from AIPscan.Reporter import format_size_for_csv
+from AIPscan.Reporter import exports
 from AIPscan.Reporter import get_display_end_date
 from AIPscan.Reporter import reporter
 from AIPscan.Reporter import request_params
@@ -85,33 +86,40 @@ def _create_aip_formats_list_sorted_by_count(formats):
     return sorted(formats_list, key=itemgetter(fields.FIELD_COUNT), reverse=True)
 
 
+def _aip_data(args):
+    """Return AIP file format overview for request parameters."""
+    data_source = data_typesense if ts_helpers.typesense_enabled() else data
+
+    return data_source.aip_file_format_overview(
+        storage_service_id=args.get(request_params.STORAGE_SERVICE_ID),
+        start_date=parse_datetime_bound(args.get(request_params.START_DATE)),
+        end_date=parse_datetime_bound(args.get(request_params.END_DATE), upper=True),
+        storage_location_id=args.get(request_params.STORAGE_LOCATION_ID),
+    )
+
+
+@exports.exporter("aip_contents", "aip_contents.csv", format_size=True)
+def aip_contents_csv(args):
+    """Return headers and rows of AIP contents CSV."""
+    headers = translate_headers(CSV_HEADERS, True)
+    aips = _create_aip_formats_string_representation(
+        _aip_data(args).get(fields.FIELD_AIPS), separator="|"
+    )
+    return headers, aips
+
+
 @reporter.route("/aip_contents/", methods=["GET"])
 def aip_contents():
     """Return AIP contents organized by format."""
+    if parse_bool(request.args.get(request_params.CSV), default=False):
+        return exports.csv_response("aip_contents", request.args)
+
     storage_service_id = request.args.get(request_params.STORAGE_SERVICE_ID)
-    storage_location_id = request.args.get(request_params.STORAGE_LOCATION_ID)
     start_date = parse_datetime_bound(request.args.get(request_params.START_DATE))
     end_date = parse_datetime_bound(
         request.args.get(request_params.END_DATE), upper=True
     )
-    csv = parse_bool(request.args.get(request_params.CSV), default=False)
-
-    aip_data = data.aip_file_format_overview(
-        storage_service_id=storage_service_id,
-        start_date=start_date,
-        end_date=end_date,
-        storage_location_id=storage_location_id,
-    )
-
-    if csv:
-        headers = translate_headers(CSV_HEADERS, True)
-
-        filename = "aip_contents.csv"
-        aips = _create_aip_formats_string_representation(
-            aip_data.get(fields.FIELD_AIPS), separator="|"
-        )
-        csv_data = format_size_for_csv(aips)
-        return download_csv(headers, csv_data, filename)
+    aip_data = _aip_data(request.args)
 
     aips = _create_aip_formats_string_representation(aip_data.get(fields.FIELD_AIPS))
 
@@ -123,7 +131,7 @@ def aip_contents():
         storage_service_name=aip_data.get(fields.FIELD_STORAGE_NAME),
         storage_location_description=aip_data.get(fields.FIELD_STORAGE_LOCATION),
         columns=headers,
-        aips=aip_data.get(fields.FIELD_AIPS),
+        aips=aips,
         start_date=start_date,
         end_date=get_display_end_date(end_date),
     )
@@ -1,12 +1,13 @@
 from flask import render_template
 from flask import request
 
+from AIPscan import typesense_helpers as ts_helpers
 from AIPscan.Data import fields
 from AIPscan.Data import report_data
+from AIPscan.Data import report_data_typesense
 from AIPscan.helpers import parse_bool
 from AIPscan.models import File
 from AIPscan.Reporter import download_csv
-from AIPscan.Reporter import format_size_for_csv
 from AIPscan.Reporter import reporter
 from AIPscan.Reporter import request_params
 from AIPscan.Reporter import translate_headers
@@ -51,19 +52,25 @@ def aips_by_puid():
     original_files = parse_bool(request.args.get(request_params.ORIGINAL_FILES, True))
     csv = parse_bool(request.args.get(request_params.CSV), default=False)
 
-    aip_data = report_data.aips_by_puid(
-        storage_service_id=storage_service_id,
-        puid=puid,
-        original_files=original_files,
-        storage_location_id=storage_location_id,
-    )
+    if ts_helpers.typesense_enabled():
+        aip_data = report_data_typesense.aips_by_puid(
+            storage_service_id, puid, original_files, storage_location_id
+        )
+    else:
+        aip_data = report_data.aips_by_puid(
+            storage_service_id=storage_service_id,
+            puid=puid,
+            original_files=original_files,
+            storage_location_id=storage_location_id,
+        )
 
     if csv:
         headers = translate_headers(HEADERS, True)
 
         filename = f"aips_by_puid_{puid}.csv"
-        csv_data = format_size_for_csv(aip_data[fields.FIELD_AIPS])
-        return download_csv(headers, csv_data, filename)
+        return download_csv(
+            headers, aip_data[fields.FIELD_AIPS], filename, format_size=True
+        )
 
     headers = translate_headers(HEADERS)
 
@@ -8,7 +8,6 @@ from AIPscan.Data import report_data_typesense
 from AIPscan.helpers import parse_bool
 from AIPscan.helpers import parse_datetime_bound
 from AIPscan.Reporter import download_csv
-from AIPscan.Reporter import format_size_for_csv
 from AIPscan.Reporter import get_display_end_date
 from AIPscan.Reporter import reporter
 from AIPscan.Reporter import request_params
@@ -55,8 +54,7 @@ def report_format_versions_count():
         headers = translate_headers(HEADERS, True)
 
         filename = "format_versions.csv"
-        csv_data = format_size_for_csv(versions)
-        return download_csv(headers, csv_data, filename)
+        return download_csv(headers, versions, filename, format_size=True)
 
     headers = translate_headers(HEADERS)
 
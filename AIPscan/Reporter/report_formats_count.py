@@ -3,7 +3,6 @@ chart which describe the file formats present across the AIPs in a
 storage service with AIPs filtered by date range.
 """
 
-from collections import Counter
 from datetime import datetime
 from datetime import timedelta
 
@@ -19,11 +18,7 @@ from AIPscan.Data import report_data_typesense
 from AIPscan.helpers import filesizeformat
 from AIPscan.helpers import parse_bool
 from AIPscan.helpers import parse_datetime_bound
-from AIPscan.models import AIP
-from AIPscan.models import File
-from AIPscan.models import FileType
 from AIPscan.Reporter import download_csv
-from AIPscan.Reporter import format_size_for_csv
 from AIPscan.Reporter import get_display_end_date
 from AIPscan.Reporter import reporter
 from AIPscan.Reporter import request_params
@@ -32,6 +27,36 @@ from AIPscan.Reporter import translate_headers
 HEADERS = [fields.FIELD_FORMAT, fields.FIELD_COUNT, fields.FIELD_SIZE]
 
 
+def _get_formats_data(
+    storage_service_id,
+    storage_location_id,
+    start_date,
+    end_date,
+    include_size_data=True,
+):
+    """Return formats count report data from Typesense or the database.
+
+    Both sources aggregate file formats with the date filter applied at
+    query time, so the number of queries does not grow with the number of
+    AIPs in the Storage Service.
+    """
+    if ts_helpers.typesense_enabled():
+        return report_data_typesense.formats_count(
+            storage_service_id,
+            storage_location_id,
+            start_date,
+            end_date,
+            include_size_data,
+        )
+
+    return report_data.formats_count(
+        storage_service_id=storage_service_id,
+        start_date=start_date,
+        end_date=end_date,
+        storage_location_id=storage_location_id,
+    )
+
+
 def _chart_labels_and_values(format_counts):
     """Return chart labels and values in the same count-descending order."""
     ordered_format_counts = sorted(
@@ -56,17 +81,9 @@ def report_formats_count():
     )
     csv = parse_bool(request.args.get(request_params.CSV), default=False)
 
-    if ts_helpers.typesense_enabled():
-        formats_data = report_data_typesense.formats_count(
-            storage_service_id, storage_location_id, start_date, end_date
-        )
-    else:
-        formats_data = report_data.formats_count(
-            storage_service_id=storage_service_id,
-            start_date=start_date,
-            end_date=end_date,
-            storage_location_id=storage_location_id,
-        )
+    formats_data = _get_formats_data(
+        storage_service_id, storage_location_id, start_date, end_date
+    )
 
     formats = formats_data.get(fields.FIELD_FORMATS)
 
@@ -74,8 +91,7 @@ def report_formats_count():
         headers = translate_headers(HEADERS, True)
 
         filename = "file_formats.csv"
-        csv_data = format_size_for_csv(formats)
-        return download_csv(headers, csv_data, filename)
+        return download_csv(headers, formats, filename, format_size=True)
 
     headers = translate_headers(HEADERS)
 
@@ -109,40 +125,18 @@ def chart_formats_count():
     storage_service_id = request.args.get(request_params.STORAGE_SERVICE_ID)
     storage_location_id = request.args.get(request_params.STORAGE_LOCATION_ID)
 
-    if ts_helpers.typesense_enabled():
-        report = report_data_typesense.formats_count(
-            storage_service_id, storage_location_id, day_before, day_after, False
-        )
+    report = _get_formats_data(
+        storage_service_id,
+        storage_location_id,
+        day_before,
+        day_after,
+        include_size_data=False,
+    )
 
-        format_counts = dict(
-            zip(
-                [item["Format"] for item in report[fields.FIELD_FORMATS]],
-                [item["Count"] for item in report[fields.FIELD_FORMATS]],
-                strict=False,
-            )
-        )
-    else:
-        aips = AIP.query.filter_by(storage_service_id=storage_service_id)
-        if storage_location_id:
-            aips = aips.filter_by(storage_location_id=storage_location_id)
-        aips = aips.all()
-
-        format_labels = []
-        format_counts = []
-
-        for aip in aips:
-            original_files = File.query.filter_by(
-                aip_id=aip.id, file_type=FileType.original
-            )
-            for original in original_files:
-                if aip.create_date < day_before:
-                    continue
-                elif aip.create_date > day_after:
-                    continue
-                else:
-                    format_labels.append(original.file_format)
-
-        format_counts = Counter(format_labels)
+    format_counts = {
+        format_[fields.FIELD_FORMAT]: format_[fields.FIELD_COUNT]
+        for format_ in report[fields.FIELD_FORMATS]
+    }
 
     labels, values = _chart_labels_and_values(format_counts)
 
@@ -180,49 +174,20 @@ def plot_formats_count():
     storage_service_id = request.args.get(request_params.STORAGE_SERVICE_ID)
     storage_location_id = request.args.get(request_params.STORAGE_LOCATION_ID)
 
-    if ts_helpers.typesense_enabled():
-        report = report_data_typesense.formats_count(
-            storage_service_id, storage_location_id, day_before, day_after
-        )
+    report = _get_formats_data(
+        storage_service_id, storage_location_id, day_before, day_after
+    )
+
+    format_count = {}
+    originals_count = 0
+
+    for file_format in report[fields.FIELD_FORMATS]:
+        format_count[file_format[fields.FIELD_FORMAT]] = {
+            "count": file_format[fields.FIELD_COUNT],
+            "size": file_format.get(fields.FIELD_SIZE, 0),
+        }
 
-        format_count = {}
-        originals_count = 0
-
-        for file_format in report[fields.FIELD_FORMATS]:
-            format_count[file_format["Format"]] = {
-                "count": file_format["Count"],
-                "size": file_format["Size"],
-            }
-
-            originals_count += file_format["Count"]
-    else:
-        aips = AIP.query.filter_by(storage_service_id=storage_service_id)
-        if storage_location_id:
-            aips = aips.filter_by(storage_location_id=storage_location_id)
-        aips = aips.all()
-
-        format_count = {}
-        originals_count = 0
-
-        for aip in aips:
-            original_files = File.query.filter_by(
-                aip_id=aip.id, file_type=FileType.original
-            )
-            for original in original_files:
-                if aip.create_date < day_before:
-                    continue
-                elif aip.create_date > day_after:
-                    continue
-                else:
-                    originals_count += 1
-                    file_format = original.file_format
-                    size = original.size
-
-                    if file_format in format_count:
-                        format_count[file_format]["count"] += 1
-                        format_count[file_format]["size"] += size
-                    else:
-                        format_count.update({file_format: {"count": 1, "size": size}})
+        originals_count += file_format[fields.FIELD_COUNT]
 
     total_size = 0
     x_axis = []
@@ -2,13 +2,16 @@
 about how long they took to process.
 """
 
-import pandas as pd
-import plotly.express as px
+from flask import jsonify
 from flask import render_template
 from flask import request
+from flask import url_for
 
+from AIPscan import typesense_helpers as ts_helpers
 from AIPscan.Data import fields
 from AIPscan.Data import report_data
+from AIPscan.Data import report_data_typesense
+from AIPscan.Data import report_dict
 from AIPscan.helpers import _simplify_datetime
 from AIPscan.helpers import parse_bool
 from AIPscan.helpers import parse_datetime_bound
@@ -20,13 +23,11 @@ from AIPscan.Reporter import translate_headers
 
 # Response fields.
 TRANSFER_COUNT = "transfer_count"
-FIGURE_HTML = "figure"
 
-# Error response for the Gantt chart. Because the chart itself is
-# returned as HTML we have the opportunity to inject a useful string
-# for those using the report incorrectly, e.g. not requesting a valid
-# storage service.
-ERR_HTM = "<div>There is no data for this chart, please check you are looking at a valid storage service.</div>"
+# Gantt chart data fields, one list per field with an entry per ingest.
+CHART_USER = "User"
+CHART_START = "Start"
+CHART_FINISH = "Finish"
 
 CSV_HEADERS = [
     fields.FIELD_AIP_UUID,
@@ -38,6 +39,18 @@ CSV_HEADERS = [
 ]
 
 
+def _get_ingests(storage_service_id, start_date, end_date, storage_location_id):
+    """Return ingest log report data from Typesense or the database."""
+    if ts_helpers.typesense_enabled():
+        return report_data_typesense.agents_transfers(
+            storage_service_id, start_date, end_date, storage_location_id
+        )
+
+    return report_data.agents_transfers(
+        storage_service_id, start_date, end_date, storage_location_id
+    )
+
+
 def get_table_data(ingests):
     """Format the data needed for an ingest log table and augment it
     where needed.
@@ -65,7 +78,7 @@ def ingest_log_tabular():
     )
     csv = parse_bool(request.args.get(request_params.CSV), default=False)
 
-    ingests = report_data.agents_transfers(
+    ingests = _get_ingests(
         storage_service_id, start_date, end_date, storage_location_id
     )
     ingests = get_table_data(ingests)
@@ -86,52 +99,73 @@ def ingest_log_tabular():
     )
 
 
-def get_figure_html(ingests):
-    """Augment the ingest log data and append the Gantt's HTML source
-    for printing in the report template.
+def get_chart_data(ingests):
+    """Return the compact series needed to draw the ingest Gantt chart.
+
+    :param ingests: Report data returned by report_data.agents_transfers
+        (dict)
+
+    :returns: dict with the storage service and location names, the
+        transfer count and lists of users, start and finish dates
     """
-    pd_list = []
-    transfer_count = 0
+    chart_data = {
+        fields.FIELD_STORAGE_NAME: ingests.get(fields.FIELD_STORAGE_NAME),
+        fields.FIELD_STORAGE_LOCATION: ingests.get(fields.FIELD_STORAGE_LOCATION),
+        CHART_USER: [],
+        CHART_START: [],
+        CHART_FINISH: [],
+    }
     for ingest in ingests[fields.FIELD_INGESTS]:
-        transfer_count = transfer_count + 1
-        pd_list.append(
-            dict(
-                User=ingest[fields.FIELD_USER],
-                Start=ingest[fields.FIELD_DATE_START],
-                Finish=ingest[fields.FIELD_DATE_END],
-            )
-        )
-    if not pd_list:
-        ingests[FIGURE_HTML] = ERR_HTM
-        ingests[TRANSFER_COUNT] = transfer_count
-        return ingests
-    df = pd.DataFrame(pd_list)
-    fig = px.timeline(df, x_start="Start", x_end="Finish", y="User")
-    fig.update_yaxes(autorange="reversed")
-    ingests[FIGURE_HTML] = fig.to_html(full_html=False)
-    ingests[TRANSFER_COUNT] = transfer_count
-    return ingests
+        chart_data[CHART_USER].append(ingest.get(fields.FIELD_USER))
+        chart_data[CHART_START].append(ingest[fields.FIELD_DATE_START])
+        chart_data[CHART_FINISH].append(ingest[fields.FIELD_DATE_END])
+    chart_data[TRANSFER_COUNT] = len(chart_data[CHART_USER])
+    return chart_data
 
 
 @reporter.route("/ingest_log_gantt/", methods=["GET"])
 def ingest_log():
-    """Return the information needed to present an ingest gantt chart."""
+    """Return the page that presents an ingest gantt chart.
+
+    The chart itself is drawn in the browser from the data returned by
+    ingest_log_data.
+    """
     storage_service_id = request.args.get(request_params.STORAGE_SERVICE_ID)
     storage_location_id = request.args.get(request_params.STORAGE_LOCATION_ID)
     start_date = parse_datetime_bound(request.args.get(request_params.START_DATE))
     end_date = parse_datetime_bound(
         request.args.get(request_params.END_DATE), upper=True
     )
-    ingests = report_data.agents_transfers(
-        storage_service_id, start_date, end_date, storage_location_id
+    report = report_dict(storage_service_id, storage_location_id)
+    data_url = url_for(
+        "reporter.ingest_log_data",
+        **{
+            request_params.STORAGE_SERVICE_ID: storage_service_id,
+            request_params.STORAGE_LOCATION_ID: storage_location_id,
+            request_params.START_DATE: request.args.get(request_params.START_DATE),
+            request_params.END_DATE: request.args.get(request_params.END_DATE),
+        },
     )
-    ingests = get_figure_html(ingests)
     return render_template(
         "report_ingest_log_gantt.html",
-        storage_service_name=ingests.get(fields.FIELD_STORAGE_NAME),
-        storage_location_description=ingests.get(fields.FIELD_STORAGE_LOCATION),
-        number_of_transfers=ingests[TRANSFER_COUNT],
-        plot=ingests[FIGURE_HTML],
+        storage_service_name=report.get(fields.FIELD_STORAGE_NAME),
+        storage_location_description=report.get(fields.FIELD_STORAGE_LOCATION),
+        data_url=data_url,
         start_date=start_date,
         end_date=get_display_end_date(end_date),
     )
+
+
+@reporter.route("/ingest_log_gantt/data/", methods=["GET"])
+def ingest_log_data():
+    """Return ingest log data for client-side charting."""
+    storage_service_id = request.args.get(request_params.STORAGE_SERVICE_ID)
+    storage_location_id = request.args.get(request_params.STORAGE_LOCATION_ID)
+    start_date = parse_datetime_bound(request.args.get(request_params.START_DATE))
+    end_date = parse_datetime_bound(
+        request.args.get(request_params.END_DATE), upper=True
+    )
+    ingests = _get_ingests(
+        storage_service_id, start_date, end_date, storage_location_id
+    )
+    return jsonify(get_chart_data(ingests))
@@ -5,10 +5,12 @@ the different file formats associated with both.
 from flask import render_template
 from flask import request
 
+from AIPscan import typesense_helpers as ts_helpers
 from AIPscan.Data import fields
 from AIPscan.Data import report_data
+from AIPscan.Data import report_data_typesense
 from AIPscan.helpers import parse_bool
-from AIPscan.Reporter import download_csv
+from AIPscan.Reporter import exports
 from AIPscan.Reporter import reporter
 from AIPscan.Reporter import request_params
 from AIPscan.Reporter import translate_headers
@@ -59,30 +61,48 @@ def _get_unique_aips(derivative_files):
     ]
 
 
+@exports.exporter("preservation_derivatives", "preservation_derivatives.csv")
+def preservation_derivatives_csv(args):
+    """Return headers and rows of preservation derivatives CSV."""
+    headers = translate_headers(CSV_HEADERS)
+    report_source = (
+        report_data_typesense if ts_helpers.typesense_enabled() else report_data
+    )
+
+    rows = report_source.preservation_derivatives_rows(
+        args.get(request_params.STORAGE_SERVICE_ID),
+        args.get(request_params.STORAGE_LOCATION_ID),
+        args.get(request_params.AIP_UUID),
+    )
+    return headers, rows
+
+
 @reporter.route("preservation_derivatives/", methods=["GET"])
 def preservation_derivatives():
     """Return a report of derivative files mapped to AIPs and originals."""
+    if parse_bool(request.args.get(request_params.CSV), default=False):
+        return exports.csv_response("preservation_derivatives", request.args)
+
     storage_service_id = request.args.get(request_params.STORAGE_SERVICE_ID)
     storage_location_id = request.args.get(request_params.STORAGE_LOCATION_ID)
-    csv = parse_bool(request.args.get(request_params.CSV), default=False)
     aip_uuid = request.args.get(request_params.AIP_UUID)
 
     headers = translate_headers(HEADERS)
 
-    derivative_data = report_data.preservation_derivatives(
-        storage_service_id, storage_location_id, aip_uuid
-    )
+    if ts_helpers.typesense_enabled():
+        derivative_data = report_data_typesense.preservation_derivatives(
+            storage_service_id, storage_location_id, aip_uuid
+        )
+    else:
+        derivative_data = report_data.preservation_derivatives(
+            storage_service_id, storage_location_id, aip_uuid
+        )
     derivative_files = derivative_data[fields.FIELD_FILES]
 
     total_files = len(derivative_files)
 
     unique_aips = _get_unique_aips(derivative_files)
 
-    if csv:
-        filename = "preservation_derivatives.csv"
-        headers = translate_headers(CSV_HEADERS)
-        return download_csv(headers, derivative_files, filename)
-
     return render_template(
         "report_preservation_derivatives.html",
         storage_service_id=storage_service_id,
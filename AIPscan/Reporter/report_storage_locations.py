@@ -1,25 +1,24 @@
 import tempfile
 
-import pandas as pd
-import plotly.express as px
+from flask import jsonify
 from flask import render_template
 from flask import request
 from flask import send_file
+from flask import url_for
 
+from AIPscan import typesense_helpers as ts_helpers
 from AIPscan.Data import fields
+from AIPscan.Data import get_storage_service_name
 from AIPscan.Data import report_data
+from AIPscan.Data import report_data_typesense
 from AIPscan.helpers import parse_bool
 from AIPscan.helpers import parse_datetime_bound
 from AIPscan.Reporter import download_csv
-from AIPscan.Reporter import format_size_for_csv
 from AIPscan.Reporter import get_display_end_date
 from AIPscan.Reporter import reporter
 from AIPscan.Reporter import request_params
 from AIPscan.Reporter import translate_headers
 
-FIGURE_HTML = "figure"
-ERR_HTML = "<div>There is no data for this chart, please check you are looking at a valid storage service.</div>"
-
 HEADERS = [
     fields.FIELD_UUID,
     fields.FIELD_STORAGE_LOCATION,
@@ -39,17 +38,23 @@ def storage_locations():
     )
     csv = parse_bool(request.args.get(request_params.CSV), default=False)
 
-    locations_data = report_data.storage_locations(
-        storage_service_id=storage_service_id, start_date=start_date, end_date=end_date
-    )
+    if ts_helpers.typesense_enabled():
+        locations_data = report_data_typesense.storage_locations(
+            storage_service_id, start_date, end_date
+        )
+    else:
+        locations_data = report_data.storage_locations(
+            storage_service_id=storage_service_id,
+            start_date=start_date,
+            end_date=end_date,
+        )
     locations = locations_data.get(fields.FIELD_LOCATIONS)
 
     if csv:
         headers = translate_headers(HEADERS, True)
 
         filename = "storage_locations.csv"
-        csv_data = format_size_for_csv(locations)
-        return download_csv(headers, csv_data, filename)
+        return download_csv(headers, locations, filename, format_size=True)
 
     headers = translate_headers(HEADERS)
 
@@ -64,28 +69,58 @@ def storage_locations():
     )
 
 
-def _get_line_chart_figure_html(locations, metric="aips"):
-    """Return partial HTML of bar chart plot and the underlying pandas df."""
-    table_dict = {"days": [], "aips": [], "size": [], "files": [], "location": []}
-    for day, locations_data in locations.items():
-        for location in locations_data:
-            table_dict["days"].append(day)
-            table_dict["aips"].append(location.get(fields.FIELD_AIPS, 0))
+def _get_usage_dataframe(usage):
+    """Return storage location usage as a pandas df with one row per
+    period and location.
+
+    :param usage: Columnar storage location usage data, as returned by
+        report_data.storage_locations_usage_over_time_columns (dict)
+    """
+    import numpy as np
+    import pandas as pd
+
+    periods = usage[fields.FIELD_PERIODS]
+    locations = usage[fields.FIELD_LOCATIONS]
+    labels = [
+        f"{loc[fields.FIELD_STORAGE_LOCATION]} ({loc[fields.FIELD_UUID]})"
+        for loc in locations
+    ]
+
+    def _column(field):
+        # Flatten the per-location series period by period, so that rows
+        # are ordered by period and then by location.
+        series = np.array([loc[field] for loc in locations], dtype=np.int64)
+        return series.reshape(len(locations), len(periods)).T.ravel()
+
+    return pd.DataFrame(
+        {
+            "days": np.repeat(np.array(periods, dtype=object), len(locations)),
+            "aips": _column(fields.FIELD_AIPS),
             # Display size in GB
-            table_dict["size"].append(location.get(fields.FIELD_SIZE, 0) / 1000000)
-            table_dict["files"].append(location.get(fields.FIELD_FILE_COUNT, 0))
-            table_dict["location"].append(
-                "{} ({})".format(location["StorageLocation"], location["UUID"])
-            )
+            "size": _column(fields.FIELD_SIZE) / 1000000,
+            "files": _column(fields.FIELD_FILE_COUNT),
+            "location": np.tile(np.array(labels, dtype=object), len(periods)),
+        }
+    )
 
-    df = pd.DataFrame(table_dict)
-    fig = px.line(df, x="days", y=metric, color="location", markers=True)
-    return fig.to_html(full_html=False), df
+
+def _get_granularity():
+    """Return the requested granularity, defaulting to daily totals."""
+    granularity = request.args.get(
+        request_params.GRANULARITY, report_data.GRANULARITY_DAY
+    )
+    if granularity not in report_data.PERIOD_FORMATS:
+        granularity = report_data.GRANULARITY_DAY
+    return granularity
 
 
 @reporter.route("/storage_locations_usage_over_time/", methods=["GET"])
 def storage_location_usage_over_time():
-    """Return the information needed to present a timeseries line chart."""
+    """Return the page that presents a timeseries line chart.
+
+    The chart itself is drawn in the browser from the data returned by
+    storage_location_usage_over_time_data.
+    """
     storage_service_id = request.args.get(request_params.STORAGE_SERVICE_ID)
     start_date = parse_datetime_bound(request.args.get(request_params.START_DATE))
     end_date = parse_datetime_bound(
@@ -94,27 +129,26 @@ def storage_location_usage_over_time():
     csv = parse_bool(request.args.get(request_params.CSV), default=False)
     request_metric = request.args.get(request_params.METRIC, "aips")
     cumulative = parse_bool(request.args.get(request_params.CUMULATIVE), default=False)
+    granularity = _get_granularity()
 
     # Determine which metric we're looking to chart.
     metric = "aips"
     if request_metric in ("files", "size"):
         metric = request_metric
 
-    locations_data = report_data.storage_locations_usage_over_time(
-        storage_service_id=storage_service_id,
-        start_date=start_date,
-        end_date=end_date,
-        cumulative=cumulative,
-    )
-
-    html_figure, dataframe = _get_line_chart_figure_html(
-        locations_data.get(fields.FIELD_LOCATIONS_USAGE_OVER_TIME), metric=metric
-    )
-
     if csv:
-        # Use the pandas dataframe created as part of plotting our timeseries
-        # to download a CSV containing the data underpinning the chart that is
+        # Download a CSV containing the data underpinning the chart that is
         # currently displayed to the user in the UI.
+        locations_data = report_data.storage_locations_usage_over_time_columns(
+            storage_service_id=storage_service_id,
+            start_date=start_date,
+            end_date=end_date,
+            cumulative=cumulative,
+            granularity=granularity,
+        )
+        dataframe = _get_usage_dataframe(
+            locations_data[fields.FIELD_LOCATIONS_USAGE_OVER_TIME]
+        )
         filename = "storage_locations_usage_over_time.csv"
         with tempfile.NamedTemporaryFile() as tmp:
             dataframe.to_csv(tmp.name, encoding="utf-8", index=False)
@@ -125,13 +159,47 @@ def storage_location_usage_over_time():
                 download_name=filename,
             )
 
+    data_url = url_for(
+        "reporter.storage_location_usage_over_time_data",
+        **{
+            request_params.STORAGE_SERVICE_ID: storage_service_id,
+            request_params.START_DATE: request.args.get(request_params.START_DATE),
+            request_params.END_DATE: request.args.get(request_params.END_DATE),
+            request_params.GRANULARITY: granularity,
+        },
+    )
+
     return render_template(
         "report_storage_locations_usage_over_time.html",
         storage_service_id=storage_service_id,
-        storage_service_name=locations_data.get(fields.FIELD_STORAGE_NAME),
-        plot=html_figure,
+        storage_service_name=get_storage_service_name(storage_service_id),
+        data_url=data_url,
         start_date=start_date,
         end_date=get_display_end_date(end_date),
         metric=metric,
         cumulative=cumulative,
+        granularity=granularity,
+    )
+
+
+@reporter.route("/storage_locations_usage_over_time/data/", methods=["GET"])
+def storage_location_usage_over_time_data():
+    """Return differential storage location usage for client-side charting.
+
+    All metrics are included so that the chart can switch between them, and
+    between differential and cumulative totals, without another request.
+    """
+    storage_service_id = request.args.get(request_params.STORAGE_SERVICE_ID)
+    start_date = parse_datetime_bound(request.args.get(request_params.START_DATE))
+    end_date = parse_datetime_bound(
+        request.args.get(request_params.END_DATE), upper=True
+    )
+
+    locations_data = report_data.storage_locations_usage_over_time_columns(
+        storage_service_id=storage_service_id,
+        start_date=start_date,
+        end_date=end_date,
+        granularity=_get_granularity(),
     )
+
+    return jsonify(locations_data)
@@ -1,14 +1,18 @@
 """Request parameters."""
 
 AIP_UUID = "aip_uuid"
+ASYNC = "async"
 CSV = "csv"
+CURSOR = "cursor"
 CUMULATIVE = "cumulative"
 FILE_FORMAT = "file_format"
 FILE_TYPE = "file_type"
+GRANULARITY = "granularity"
 LIMIT = "limit"
 METRIC = "metric"
 ORIGINAL_FILES = "original_files"
 PUID = "puid"
+QUERY = "query"
 STORAGE_LOCATION_ID = "storage_location"
 STORAGE_SERVICE_ID = "amss_id"
 PAGE = "page"
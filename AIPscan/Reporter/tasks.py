@@ -0,0 +1,14 @@
+from AIPscan.Aggregator.celery_helpers import with_db_session
+from AIPscan.celery import celery
+from AIPscan.Reporter import exports
+
+
+@celery.task()
+@with_db_session
+def export_report(export_job_id):
+    """Write a report export to disk (see AIPscan.Reporter.exports)."""
+    # Workers don't import the views, whose report modules register
+    # the exporters, until they are asked to export a report.
+    from AIPscan.Reporter import views  # noqa: F401
+
+    exports.write_export(export_job_id)
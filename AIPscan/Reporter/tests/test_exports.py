@@ -0,0 +1,147 @@
+import gzip
+from datetime import timedelta
+
+import pytest
+from flask import current_app
+
+from AIPscan import db
+from AIPscan.models import ExportJob
+from AIPscan.models import ExportStatus
+from AIPscan.models import StorageService
+from AIPscan.Reporter import exports
+
+REPORT_URL = "/reporter/preservation_derivatives/?amss_id=1&csv=True"
+ASYNC_REPORT_URL = f"{REPORT_URL}&async=1"
+
+
+@pytest.fixture
+def export_task(preservation_derivatives, mocker, monkeypatch, tmp_path):
+    monkeypatch.setitem(current_app.config, "EXPORTS_ROOT", str(tmp_path))
+    task = mocker.patch("AIPscan.Reporter.tasks.export_report.delay")
+    task.return_value.id = "7bbd7d0e-ad4b-4c5e-9bb1-2a0d6b5e8bd5"
+    return task
+
+
+def test_async_export(export_task):
+    with current_app.test_client() as test_client:
+        response = test_client.get(ASYNC_REPORT_URL)
+        assert response.status_code == 202
+        assert response.json["status"] == "pending"
+        assert response.json["download_url"] is None
+        assert response.headers["Location"] == response.json["status_url"]
+
+        export_job_id = response.json["id"]
+        export_task.assert_called_once_with(export_job_id)
+
+        # The export is written by a Celery worker
+        exports.write_export(export_job_id)
+
+        response = test_client.get(response.headers["Location"])
+        assert response.status_code == 200
+        assert response.json["status"] == "done"
+        assert response.json["rows_written"] == 2
+
+        download = test_client.get(response.json["download_url"])
+        assert download.status_code == 200
+        assert download.mimetype == "application/gzip"
+        assert (
+            download.headers["Content-Disposition"]
+            == "attachment; filename=preservation_derivatives.csv.gz"
+        )
+
+        # The export matches the CSV sent synchronously
+        expected = test_client.get(REPORT_URL).data
+        assert gzip.decompress(download.data) == expected
+
+
+def test_async_export_reuse(export_task):
+    with current_app.test_client() as test_client:
+        export_job_id = test_client.get(ASYNC_REPORT_URL).json["id"]
+
+        # Exports with the same parameters are reused
+        response = test_client.get(ASYNC_REPORT_URL)
+        assert response.json["id"] == export_job_id
+        assert export_task.call_count == 1
+
+        # ...but not exports with other parameters
+        response = test_client.get(f"{ASYNC_REPORT_URL}&aip_uuid=test")
+        other_export_job_id = response.json["id"]
+        assert other_export_job_id != export_job_id
+        assert export_task.call_count == 2
+
+        # ...or once the data has changed
+        exports.write_export(export_job_id)
+        StorageService.bump_data_version(1)
+        db.session.commit()
+
+        response = test_client.get(ASYNC_REPORT_URL)
+        new_export_job_id = response.json["id"]
+        assert new_export_job_id != export_job_id
+        assert export_task.call_count == 3
+
+        # Replaced exports are kept for a while so they can be downloaded
+        assert db.session.get(ExportJob, export_job_id) is not None
+
+        export_job = db.session.get(ExportJob, export_job_id)
+        export_job.finished -= timedelta(
+            seconds=exports.SUPERSEDED_EXPORT_GRACE_SECONDS + 1
+        )
+        db.session.commit()
+
+        response = test_client.get(ASYNC_REPORT_URL)
+        assert response.json["id"] == new_export_job_id
+        assert db.session.get(ExportJob, export_job_id) is None
+
+        # Exports with other parameters are kept, as are unfinished ones
+        assert db.session.get(ExportJob, other_export_job_id) is not None
+
+
+def test_async_export_expiry(export_task, monkeypatch, tmp_path):
+    with current_app.test_client() as test_client:
+        export_job_id = test_client.get(ASYNC_REPORT_URL).json["id"]
+        exports.write_export(export_job_id)
+        assert list(tmp_path.iterdir())
+
+        # Exports older than EXPORT_MAX_AGE_SECONDS are removed
+        monkeypatch.setitem(current_app.config, "EXPORT_MAX_AGE_SECONDS", 0)
+        response = test_client.get(f"{ASYNC_REPORT_URL}&aip_uuid=test")
+        assert response.json["id"] != export_job_id
+        assert db.session.get(ExportJob, export_job_id) is None
+        assert not list(tmp_path.iterdir())
+
+
+def test_async_export_failure(export_task, mocker, tmp_path):
+    def failing_export(args):
+        raise ValueError("Report failed")
+
+    mocker.patch.dict(
+        exports.EXPORTERS,
+        {"preservation_derivatives": (failing_export, "report.csv", False)},
+    )
+
+    with current_app.test_client() as test_client:
+        export_job_id = test_client.get(ASYNC_REPORT_URL).json["id"]
+
+        with pytest.raises(ValueError):
+            exports.write_export(export_job_id)
+
+        response = test_client.get(f"/reporter/exports/{export_job_id}/")
+        assert response.json["status"] == "failed"
+        assert response.json["error"] == "Report failed"
+        assert not list(tmp_path.iterdir())
+
+        response = test_client.get(f"/reporter/exports/{export_job_id}/download/")
+        assert response.status_code == 404
+
+        # Failed exports aren't reused
+        response = test_client.get(ASYNC_REPORT_URL)
+        assert response.json["id"] != export_job_id
+        assert db.session.get(ExportJob, response.json["id"]).status == (
+            ExportStatus.pending
+        )
+
+
+def test_export_status_not_found(app_instance):
+    with current_app.test_client() as test_client:
+        response = test_client.get("/reporter/exports/1/")
+        assert response.status_code == 404
@@ -138,6 +138,27 @@ def test_format_size_for_csv(data, expected_output):
     assert helpers.format_size_for_csv(data) == expected_output
 
 
+def test_download_csv_streams_rows(app_instance, mocker):
+    """Test that CSV rows are formatted lazily and streamed in chunks."""
+    mocker.patch("AIPscan.Reporter.helpers.CSV_CHUNK_SIZE", 1)
+
+    rows = ({**row} for row in ROWS_WITH_SIZE)
+    headers = ["AIP UUID", "AIP Name", "Size", "Size (bytes)"]
+
+    with app_instance.test_request_context():
+        response = helpers.download_csv(headers, rows, format_size=True)
+
+        assert response.is_streamed
+        chunks = list(response.response)
+
+    assert len(chunks) > 1
+    assert b"".join(chunks).decode() == (
+        "AIP UUID,AIP Name,Size,Size (bytes)\r\n"
+        "test uuid,test name,1.6 MB,1560321\r\n"
+        "test uuid2,test name2,123.4 kB,123423\r\n"
+    )
+
+
 def test_get_premis_xml_lines():
     premis_xml = "First line\nSecond line"
 
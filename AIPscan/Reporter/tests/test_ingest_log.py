@@ -4,7 +4,7 @@ import pytest
 from flask import current_app
 
 from AIPscan.Data import fields
-from AIPscan.Reporter.report_ingest_log import get_figure_html
+from AIPscan.Reporter.report_ingest_log import get_chart_data
 from AIPscan.Reporter.report_ingest_log import get_table_data
 
 EXPECTED_CSV_CONTENTS = b"AIP UUID,AIP Name,Start Date,End Date,User,Duration\r\n111111111111-1111-1111-11111111,Test AIP,2020-12-02 10:00:00,2020-12-02 10:30:32,user one,0:30:32\r\n"
@@ -89,8 +89,7 @@ def test_get_table_data(agents_transfers, transfer_count, storage_name, duration
     "agents_transfers, transfer_count, storage_name",
     [
         # There is no data, e.g. the request could be for an invalid
-        # storage service. Count should be zero, a valid div is still
-        # returned with the data.
+        # storage service. Count should be zero and the series empty.
         (ZERO_TRANSFERS, 0, None),
         # One transfer with valid data.
         (ONE_TRANSFER, 1, "S1"),
@@ -98,15 +97,22 @@ def test_get_table_data(agents_transfers, transfer_count, storage_name, duration
         (THREE_TRANSFERS, 3, "S2"),
     ],
 )
-def test_get_figure_html(agents_transfers, transfer_count, storage_name):
+def test_get_chart_data(agents_transfers, transfer_count, storage_name):
     """Test that we get valid data required for the Gantt chart to be
     rendered.
     """
-    response = get_figure_html(agents_transfers)
+    response = get_chart_data(agents_transfers)
     assert response["transfer_count"] == transfer_count
     assert response["StorageName"] == storage_name
-    assert response["figure"].startswith("<div>")
-    assert response["figure"].endswith("</div>")
+    assert response["User"] == [
+        ingest["User"] for ingest in agents_transfers["Ingests"]
+    ]
+    assert response["Start"] == [
+        ingest["IngestStartDate"] for ingest in agents_transfers["Ingests"]
+    ]
+    assert response["Finish"] == [
+        ingest["IngestFinishDate"] for ingest in agents_transfers["Ingests"]
+    ]
 
 
 def test_user_ingest_log(app_with_populated_files):
@@ -127,3 +133,25 @@ def test_user_ingest_log_csv(app_with_populated_files):
         )
         assert response.mimetype == "text/csv"
         assert response.data == EXPECTED_CSV_CONTENTS
+
+
+def test_user_ingest_log_gantt(app_with_populated_files):
+    """Test that the Gantt chart page and its data are returned."""
+    with current_app.test_client() as test_client:
+        response = test_client.get("/reporter/ingest_log_gantt/?amss_id=1")
+        assert response.status_code == 200
+        assert b"/reporter/ingest_log_gantt/data/?amss_id=1" in response.data
+
+        response = test_client.get("/reporter/ingest_log_gantt/data/?amss_id=1")
+        assert response.status_code == 200
+        assert response.json["transfer_count"] == 1
+        assert response.json["User"] == ["user one"]
+        assert response.json["Start"] == ["2020-12-02 10:00:00"]
+        assert response.json["Finish"] == ["2020-12-02 10:30:32"]
+
+        # Data is not sent again to a client that already holds it.
+        response = test_client.get(
+            "/reporter/ingest_log_gantt/data/?amss_id=1",
+            headers={"If-None-Match": response.headers["ETag"]},
+        )
+        assert response.status_code == 304
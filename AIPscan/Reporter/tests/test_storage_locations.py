@@ -38,6 +38,36 @@ def test_storage_locations_usage_over_time(storage_locations):
         assert response.status_code == 200
 
 
+def test_storage_locations_usage_over_time_data(storage_locations):
+    """Test chart data endpoint and its conditional responses."""
+    with current_app.test_client() as test_client:
+        url = "/reporter/storage_locations_usage_over_time/data/?amss_id=1&start_date=2020-01-01&end_date=2020-06-30&granularity=month"
+        response = test_client.get(url)
+        assert response.status_code == 200
+        assert response.mimetype == "application/json"
+        assert response.headers["ETag"]
+
+        usage = response.json["LocationsUsageOverTime"]
+        assert usage["Granularity"] == "month"
+        assert usage["Periods"] == [
+            "2020-01",
+            "2020-02",
+            "2020-03",
+            "2020-04",
+            "2020-05",
+            "2020-06",
+            "2020-07",
+        ]
+        assert usage["Locations"][0]["AIPs"] == [1, 0, 0, 0, 0, 1, 0]
+        assert usage["Locations"][1]["AIPs"] == [0, 0, 0, 0, 0, 0, 0]
+
+        response = test_client.get(
+            url, headers={"If-None-Match": response.headers["ETag"]}
+        )
+        assert response.status_code == 304
+        assert response.data == b""
+
+
 @pytest.mark.parametrize(
     "metric, cumulative, fixture",
     [
@@ -1,10 +1,16 @@
+from datetime import datetime
+
 import pytest
 from flask import current_app
 from werkzeug.datastructures import Headers
 
 from AIPscan import test_helpers
+from AIPscan import typesense_test_helpers
+from AIPscan.models import FileType
 from AIPscan.Reporter import views
 
+AIP_UUID = "5ae66aef-1d8d-4d3e-bc3c-7b0ecb6b5c9a"
+
 
 def test_download_mets(app_with_populated_files, mocker):
     # Mock storage server API request response
@@ -47,6 +53,12 @@ def test_download_mets(app_with_populated_files, mocker):
         ("Does Not Exist", 1, 0, 0, None, None, False),  # Search doesn't match any AIP
         ("Test AIP", 1, 2, 3, None, 2, False),  # Search matches all AIPs, page 1
         ("Test AIP", 2, 2, 3, 1, None, False),  # Search matches all AIPs, page 2
+        ("5ae6", 1, 1, 2, None, None, False),  # Search matches UUID prefix
+        (AIP_UUID, 1, 1, 1, None, None, False),  # Search matches full UUID
+        ("6aef", 1, 0, 0, None, None, False),  # UUIDs are only matched by prefix
+        ("2020", 1, 1, 2, None, None, False),  # Search matches creation year
+        ("2020-05", 1, 1, 1, None, None, False),  # Search matches creation month
+        ("2020-06-01", 1, 1, 1, None, None, False),  # Search matches creation day
     ],
 )
 def test_get_aip_pager(
@@ -70,17 +82,23 @@ def test_get_aip_pager(
     )
 
     test_helpers.create_test_aip(
+        uuid=AIP_UUID,
         transfer_name="Test AIP",
+        create_date=datetime(2020, 5, 17),
         storage_service_id=storage_service.id,
         storage_location_id=default_storage_location.id,
     )
     test_helpers.create_test_aip(
+        uuid="5ae6a1f0-87e4-4b3a-9f56-0c3e2d1b4a5f",
         transfer_name="Another Test AIP",
+        create_date=datetime(2020, 6, 1),
         storage_service_id=storage_service.id,
         storage_location_id=default_storage_location.id,
     )
     test_helpers.create_test_aip(
+        uuid="c0ffee00-87e4-4b3a-9f56-0c3e2d1b4a5f",
         transfer_name="This Is Also A Test AIP",
+        create_date=datetime(2021, 1, 1),
         storage_service_id=storage_service.id,
         storage_location_id=other_storage_location.id,
     )
@@ -107,6 +125,41 @@ def test_get_aip_pager(
         assert pager.next_num == next_num
 
 
+def test_get_aip_pager_typesense(app_instance, enable_typesense, mocker):
+    storage_service = test_helpers.create_test_storage_service()
+    storage_location = test_helpers.create_test_storage_location(
+        storage_service_id=storage_service.id
+    )
+    first_aip = test_helpers.create_test_aip(
+        transfer_name="Test AIP",
+        storage_service_id=storage_service.id,
+        storage_location_id=storage_location.id,
+    )
+    second_aip = test_helpers.create_test_aip(
+        transfer_name="Another Test AIP",
+        storage_service_id=storage_service.id,
+        storage_location_id=storage_location.id,
+    )
+
+    # Typesense returns hits in order of relevance
+    fake_results = {
+        "found": 3,
+        "hits": [
+            {"document": {"id": str(second_aip.id)}},
+            {"document": {"id": str(first_aip.id)}},
+        ],
+    }
+    typesense_test_helpers.fake_collection(mocker, fake_results)
+
+    pager = views.get_aip_pager(1, 2, storage_service, query="Test")
+
+    assert pager.items == [second_aip, first_aip]
+    assert pager.total == 3
+    assert pager.pages == 2
+    assert pager.prev_num is None
+    assert pager.next_num == 2
+
+
 @pytest.mark.parametrize("page,pager_page", [(1, 1), ("bad", 1)])
 def test_get_file_pager(app_instance, mocker, page, pager_page):
     paginate_mock = mocker.Mock()
@@ -126,6 +179,37 @@ def test_get_file_pager(app_instance, mocker, page, pager_page):
     assert pager.next_num is None
 
 
+def test_get_file_pager_preservation_files(app_instance):
+    aip = test_helpers.create_test_aip()
+    original_file = test_helpers.create_test_file(
+        file_type=FileType.original, aip_id=aip.id
+    )
+    other_original_file = test_helpers.create_test_file(
+        file_type=FileType.original, aip_id=aip.id
+    )
+    preservation_file = test_helpers.create_test_file(
+        file_type=FileType.preservation,
+        original_file_id=original_file.id,
+        aip_id=aip.id,
+    )
+
+    pager = views.get_file_pager(1, 10, aip)
+
+    assert pager.total == 2
+    assert [(row.id, row.preservation_file_id) for row in pager.items] == [
+        (original_file.id, preservation_file.id),
+        (other_original_file.id, None),
+    ]
+
+
+@pytest.mark.parametrize("cursor", ["", "invalid"])
+def test_view_aips(app_with_populated_files, cursor):
+    with current_app.test_client() as test_client:
+        response = test_client.get(f"/reporter/aips/?amss_id=1&cursor={cursor}")
+        assert response.status_code == 200
+        assert b"Showing 1 to 1 of 1 entries" in response.data
+
+
 def test_view_aip(app_with_populated_files):
     with current_app.test_client() as test_client:
         response = test_client.get("/reporter/aip/1")
@@ -14,20 +14,28 @@ from flask import make_response
 from flask import render_template
 from flask import request
 from flask import session
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
 
 from AIPscan import db
+from AIPscan import typesense_helpers as ts_helpers
 from AIPscan.Aggregator.task_helpers import get_mets_url
 from AIPscan.models import AIP
 from AIPscan.models import Event
-from AIPscan.models import FetchJob
+from AIPscan.models import FacetType
 from AIPscan.models import File
+from AIPscan.models import FileFacet
 from AIPscan.models import FileType
 from AIPscan.models import Pipeline
 from AIPscan.models import StorageLocation
 from AIPscan.models import StorageService
+from AIPscan.pagination import InvalidCursor
+from AIPscan.pagination import KeysetPagination
+from AIPscan.pagination import cached_count
 
 # Flask's idiom requires code using routing decorators to be imported
 # up-front. But that means it might not be called directly by a module.
+from AIPscan.Reporter import exports  # noqa: F401
 from AIPscan.Reporter import report_aip_contents  # noqa: F401
 from AIPscan.Reporter import report_aips_by_format  # noqa: F401
 from AIPscan.Reporter import report_aips_by_puid  # noqa: F401
@@ -41,7 +49,9 @@ from AIPscan.Reporter import report_storage_locations  # noqa: F401
 from AIPscan.Reporter import reporter  # noqa: F401
 from AIPscan.Reporter import request_params  # noqa: F401
 from AIPscan.Reporter import sort_puids  # noqa: F401
+from AIPscan.Reporter.database_helpers import aip_search_criteria
 from AIPscan.Reporter.database_helpers import get_possible_storage_locations
+from AIPscan.Reporter.helpers import SearchPagination
 from AIPscan.Reporter.helpers import calculate_paging_window
 from AIPscan.Reporter.helpers import remove_dict_none_values
 
@@ -89,6 +99,37 @@ def storage_locations_with_aips(storage_locations):
     return [loc for loc in storage_locations if loc.aips]
 
 
+def _get_aip_pager_typesense(
+    page, per_page, storage_service_id, storage_location_id, query
+):
+    """Return page of AIPs matching a search query using Typesense.
+
+    Typesense returns the IDs of matching AIPs, in order of relevance, and
+    the AIPs themselves are then fetched by primary key.
+    """
+    filters = [("storage_service_id", "=", storage_service_id)]
+    if storage_location_id:
+        filters.append(("storage_location_id", "=", storage_location_id))
+
+    results = ts_helpers.search(
+        "aip",
+        {
+            "q": query,
+            "query_by": "transfer_name,uuid",
+            "filter_by": ts_helpers.assemble_filter_by(filters),
+            "include_fields": "id",
+            "page": page,
+            "per_page": per_page,
+        },
+    )
+
+    ids = [int(hit["document"]["id"]) for hit in results["hits"]]
+    aips = {aip.id: aip for aip in AIP.query.filter(AIP.id.in_(ids))}
+    items = [aips[aip_id] for aip_id in ids if aip_id in aips]
+
+    return SearchPagination(items, page, per_page, results["found"])
+
+
 def get_aip_pager(page, per_page, storage_service, **kwargs):
     storage_service_id = None
     if storage_service is not None:
@@ -98,7 +139,12 @@ def get_aip_pager(page, per_page, storage_service, **kwargs):
     if kwargs.get("storage_location", None):
         storage_location_id = kwargs["storage_location"].id
 
-    query = kwargs.get("query", None)
+    query = (kwargs.get("query", None) or "").strip()
+
+    if query and storage_service_id and ts_helpers.typesense_enabled():
+        return _get_aip_pager_typesense(
+            max(page, 1), per_page, storage_service_id, storage_location_id, query
+        )
 
     aips = AIP.query
 
@@ -110,29 +156,64 @@ def get_aip_pager(page, per_page, storage_service, **kwargs):
         aips = aips.filter_by(storage_location_id=storage_location_id)
 
     # Optionally filter by text search
-    if query is not None:
-        aips = aips.filter(
-            AIP.uuid.like(f"%{query}%")
-            | AIP.transfer_name.like(f"%{query}%")
-            | AIP.create_date.like(f"%{query}%")
-        )
+    if query:
+        aips = aips.filter(aip_search_criteria(query))
 
-    pager = aips.paginate(page=page, per_page=per_page, error_out=False)
+    return _keyset_pager(
+        aips, [AIP.create_date, AIP.id], per_page, kwargs.get("cursor"), page
+    )
 
-    return pager
 
+def get_file_pager(page, per_page, aip, cursor=None):
+    """Return page of an AIP's original files.
 
-def get_file_pager(page, per_page, aip):
+    Each original file is returned along with the ID of its preservation
+    derivative, if any, by a single query joining originals to
+    derivatives.
+    """
     try:
         page = int(page)
     except ValueError:
         page = 1
 
-    return File.query.filter_by(aip_id=aip.id, file_type=FileType.original).paginate(
-        page=page, per_page=per_page, error_out=False
+    preservation_file = aliased(File)
+
+    files = (
+        db.session.query(
+            File.id,
+            File.name,
+            File.uuid,
+            File.size,
+            File.date_created,
+            File.puid,
+            File.file_format,
+            File.format_version,
+            func.min(preservation_file.id).label("preservation_file_id"),
+        )
+        .outerjoin(
+            preservation_file,
+            (preservation_file.original_file_id == File.id)
+            & (preservation_file.file_type == FileType.preservation),
+        )
+        .filter(File.aip_id == aip.id, File.file_type == FileType.original)
+        .group_by(File.id)
+    )
+
+    # The AIP's denormalized file counter saves counting its files
+    return _keyset_pager(
+        files, [File.id], per_page, cursor, page, total=aip.original_file_count
     )
 
 
+def _keyset_pager(query, columns, per_page, cursor, page, total=None):
+    """Return KeysetPagination, starting over if the cursor is invalid."""
+    try:
+        return KeysetPagination(query, columns, per_page, cursor, page, total)
+    except InvalidCursor:
+        current_app.logger.warning(f"Ignoring invalid page cursor: {cursor}")
+        return KeysetPagination(query, columns, per_page, total=total)
+
+
 @reporter.route("/aips/", methods=["GET"])
 def view_aips():
     """Overview of AIPs in given Storage Service and Location."""
@@ -147,7 +228,7 @@ def view_aips():
             f"Failed to get storage location id={storage_location_id}"
         )
 
-    query = request.args.get("query", "")
+    query = request.args.get(request_params.QUERY, "")
 
     try:
         page = int(request.args.get(request_params.PAGE, default=1))
@@ -155,7 +236,12 @@ def view_aips():
         page = 1
 
     pager = get_aip_pager(
-        page, 10, storage_service, storage_location=storage_location, query=query
+        page,
+        10,
+        storage_service,
+        storage_location=storage_location,
+        query=query,
+        cursor=request.args.get(request_params.CURSOR),
     )
 
     first_item, last_item = calculate_paging_window(pager)
@@ -163,6 +249,7 @@ def view_aips():
     state_query_params = {
         request_params.STORAGE_SERVICE_ID: storage_service_id,
         request_params.STORAGE_LOCATION_ID: storage_location_id,
+        request_params.QUERY: query,
     }
 
     return render_template(
@@ -189,18 +276,19 @@ def view_aip(aip_id):
     if aip is None:
         abort(404)
 
-    fetch_job = db.session.get(FetchJob, aip.fetch_job_id)
-    storage_service = db.session.get(StorageService, fetch_job.storage_service_id)
+    storage_service = db.session.get(StorageService, aip.storage_service_id)
     storage_location = db.session.get(StorageLocation, aip.storage_location_id)
-    aips_count = AIP.query.filter_by(storage_service_id=storage_service.id).count()
-    original_file_count = aip.original_file_count
-    preservation_file_count = aip.preservation_file_count
+    aips_count = cached_count(
+        AIP.query.filter_by(storage_service_id=storage_service.id)
+    )
     origin_pipeline = db.session.get(Pipeline, aip.origin_pipeline_id)
 
     originals = []
 
     page = request.args.get(request_params.PAGE, default="1")
-    pager = get_file_pager(page, 10, aip)
+    pager = get_file_pager(
+        page, 10, aip, cursor=request.args.get(request_params.CURSOR)
+    )
 
     first_item, last_item = calculate_paging_window(pager)
 
@@ -214,25 +302,21 @@ def view_aip(aip_id):
         original["puid"] = file_.puid
         original["file_format"] = file_.file_format
         original["format_version"] = file_.format_version
-        preservation_file = File.query.filter_by(
-            file_type=FileType.preservation, original_file_id=file_.id
-        ).first()
-        if preservation_file is not None:
-            original["preservation_file_id"] = preservation_file.id
+        original["preservation_file_id"] = file_.preservation_file_id
         originals.append(original)
 
     return render_template(
         "aip.html",
         aip=aip,
         first_item=first_item,
-        last_iten=last_item,
+        last_item=last_item,
         pager=pager,
         storage_service=storage_service,
         storage_location=storage_location,
         aips_count=aips_count,
         originals=originals,
-        original_file_count=original_file_count,
-        preservation_file_count=preservation_file_count,
+        original_file_count=aip.original_file_count,
+        preservation_file_count=aip.preservation_file_count,
         origin_pipeline=origin_pipeline,
     )
 
@@ -280,56 +364,29 @@ def reports():
     storage_location_id = request.args.get(request_params.STORAGE_LOCATION_ID)
     storage_location = _get_storage_location(storage_location_id)
 
-    original_file_formats = []
-    preservation_file_formats = []
-    original_puids = []
-    preservation_puids = []
-
-    # Filter dropdowns by Storage Location if one is selected. If a location is
-    # not selected, populate dropdowns from Storage Service instead.
+    # Dropdown values are read, already sorted, from the file facet catalog.
+    # Filter them by Storage Location if one is selected. If a location is not
+    # selected, populate dropdowns from Storage Service instead.
+    facets = {}
     if storage_location:
-        # Original file formats and PUIDs should be present for any Storage
-        # Loocation with ingested files.
-        try:
-            original_file_formats = storage_location.unique_original_file_formats
-            original_puids = sort_puids(storage_location.unique_original_puids)
-        except AttributeError:
-            pass
-
-        # Preservation file formats and PUIDs may be present depending on
-        # a number of factors such as processing configuration choices,
-        # normalization rules, and use of manual normalization.
-        try:
-            preservation_file_formats = (
-                storage_location.unique_preservation_file_formats
-            )
-        except AttributeError:
-            pass
-        try:
-            preservation_puids = sort_puids(storage_location.unique_preservation_puids)
-        except AttributeError:
-            pass
-
-    else:
-        # Original file formats and PUIDs should be present for any Storage
-        # Service with ingested files.
-        try:
-            original_file_formats = storage_service.unique_original_file_formats
-            original_puids = sort_puids(storage_service.unique_original_puids)
-        except AttributeError:
-            pass
-
-        # Preservation file formats and PUIDs may be present depending on
-        # a number of factors such as processing configuration choices,
-        # normalization rules, and use of manual normalization.
-        try:
-            preservation_file_formats = storage_service.unique_preservation_file_formats
-        except AttributeError:
-            pass
-        try:
-            preservation_puids = sort_puids(storage_service.unique_preservation_puids)
-        except AttributeError:
-            pass
+        facets = FileFacet.all_values(storage_location_id=storage_location.id)
+    elif storage_service:
+        facets = FileFacet.all_values(storage_service_id=storage_service.id)
+
+    def _facet_values(file_type, facet_type):
+        return [value for value, _ in facets.get((file_type, facet_type), [])]
+
+    # Original file formats and PUIDs should be present for any Storage
+    # Service or Location with ingested files. Preservation file formats and
+    # PUIDs may be present depending on a number of factors such as
+    # processing configuration choices, normalization rules, and use of
+    # manual normalization.
+    original_file_formats = _facet_values(FileType.original, FacetType.file_format)
+    original_puids = _facet_values(FileType.original, FacetType.puid)
+    preservation_file_formats = _facet_values(
+        FileType.preservation, FacetType.file_format
+    )
+    preservation_puids = _facet_values(FileType.preservation, FacetType.puid)
 
     if "start_date" not in session:
         earliest_aip_created = storage_service.earliest_aip_created
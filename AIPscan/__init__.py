@@ -16,24 +16,28 @@ from flask_sqlalchemy import SQLAlchemy
 
 from AIPscan.celery import configure_celery
 from AIPscan.config import CONFIGS
+from AIPscan.database import RoutingSession
 from AIPscan.navbar import NavBar
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 
 
+def _load_config(app, config_name):
+    if config_name is None:
+        config_name = os.environ.get("FLASK_CONFIG", "default")
+    app.config.from_object(CONFIGS.get(config_name))
+    return config_name
+
+
 def create_app(config_name=None):
     """Flask app factory, returns app instance.
 
     If no config_name is passed (i.e. config_name is None), honor the
     ``FLASK_CONFIG`` environment variable; otherwise default to "default".
     """
-    if config_name is None:
-        config_name = os.environ.get("FLASK_CONFIG", "default")
-    config = CONFIGS.get(config_name)
-
     app = Flask(__name__)
-    app.config.from_object(config)
+    config_name = _load_config(app, config_name)
 
     # Set up the secret key.
     secret = os.getenv("SECRET_KEY") or app.config.get("SECRET_KEY")
@@ -76,6 +80,25 @@ def create_app(config_name=None):
 
         register_cli(app)
 
+        from AIPscan.query_profiler import register_query_profiler
+
+        # Registered first so that requests answered early are profiled too
+        register_query_profiler(app)
+
+        from AIPscan.database import register_read_routing
+
+        # Registered before HTTP caching so that validators are read from
+        # the same database as the response
+        register_read_routing(app)
+
+        from AIPscan.http_caching import register_http_caching
+
+        register_http_caching(app)
+
+        from AIPscan.metrics import register_metrics
+
+        register_metrics(app)
+
         # Define navigation bar sections and route-to-section mapping (needed
         # given that the "AIPs" and "Reports" sections are in the same Blueprint)
         navbar = NavBar()
@@ -99,3 +122,31 @@ def create_app(config_name=None):
             return render_template("error/404.html"), 404
 
         return app
+
+
+def create_worker_app(config_name=None):
+    """Flask app factory for Celery workers, returns app instance.
+
+    Only the configuration, database and Celery are set up: blueprints,
+    and the view, form and API modules they import, aren't needed to run
+    tasks and would slow down the start of every worker process.
+
+    config_name is handled as in create_app.
+    """
+    app = Flask(__name__)
+    config_name = _load_config(app, config_name)
+
+    app.logger.info("Starting AIPscan worker... (config=%s)", config_name)
+
+    with app.app_context():
+        from AIPscan import models  # noqa: F401
+
+        db.init_app(app)
+        configure_celery(app)
+
+        from AIPscan.query_profiler import register_query_profiler
+
+        # Tasks are profiled by ContextTask, which relies on the listeners
+        register_query_profiler(app)
+
+        return app
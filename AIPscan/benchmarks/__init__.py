@@ -0,0 +1,19 @@
+"""Benchmarks of the Data layer's report functions.
+
+The benchmarks are marked with the "benchmark" marker, which is
+deselected by default. To run them against the test database:
+
+    BENCHMARK_SCALE=100k pytest -m benchmark AIPscan/benchmarks
+
+Set BENCHMARK_SCALE to 10k (default), 100k or 1m files. Results are
+written as JSON to BENCHMARK_RESULTS (default
+benchmark-results-<scale>.json). When BENCHMARK_BASELINE names results
+from an earlier run, benchmarks slower than the baseline by more than
+BENCHMARK_THRESHOLD (default 0.2, i.e. 20%) fail.
+
+The Typesense implementations are benchmarked too when
+TYPESENSE_TEST_API_KEY is set.
+
+The time taken to start the web application and Celery workers is
+benchmarked too (see AIPscan.benchmarks.startup).
+"""
@@ -0,0 +1,104 @@
+"""Fixtures seeding the test database for benchmarks."""
+
+import os
+
+import pytest
+import sqlalchemy as sa
+
+from AIPscan import db
+from AIPscan import typesense_helpers
+from AIPscan.benchmarks import results
+from AIPscan.benchmarks.seeding import SCALES
+from AIPscan.benchmarks.seeding import seed_database
+from AIPscan.conftest import truncate_tables
+from AIPscan.models import AIP
+from AIPscan.models import File
+
+DEFAULT_SCALE = "10k"
+
+
+def _benchmark_scale():
+    scale = os.getenv("BENCHMARK_SCALE", DEFAULT_SCALE).lower()
+    if scale not in SCALES:
+        raise pytest.UsageError(
+            f"BENCHMARK_SCALE must be one of {', '.join(SCALES)}, not {scale}"
+        )
+    return scale
+
+
+def _enable_typesense(app):
+    """Point the app at the Typesense test server, if there is one."""
+    api_key = os.getenv("TYPESENSE_TEST_API_KEY")
+    if not api_key:
+        app.config["TYPESENSE_API_KEY"] = None
+        return False
+
+    app.config["TYPESENSE_API_KEY"] = api_key
+    app.config["TYPESENSE_HOST"] = os.getenv("TYPESENSE_TEST_HOST", "localhost")
+    app.config["TYPESENSE_PORT"] = os.getenv("TYPESENSE_TEST_PORT", "8108")
+    app.config["TYPESENSE_COLLECTION_PREFIX"] = "aipscan_benchmark_"
+    typesense_helpers.initialize_index()
+    list(typesense_helpers.populate_index())
+    return True
+
+
+@pytest.fixture(scope="session")
+def benchmark_data(app_setup):
+    """Seed the database at BENCHMARK_SCALE, returning report arguments."""
+    scale = _benchmark_scale()
+    previous_config = app_setup.config.copy()
+
+    with app_setup.app_context():
+        truncate_tables()
+        storage_service_id = seed_database(SCALES[scale])
+
+        runner = app_setup.test_cli_runner()
+        result = runner.invoke(args=["rebuild-file-facets"])
+        assert result.exit_code == 0, result.output
+
+        file_ = db.session.execute(
+            sa.select(File).order_by(File.id).limit(1)
+        ).scalar_one()
+        aip = db.session.execute(sa.select(AIP).order_by(AIP.id)).scalars().first()
+
+        yield {
+            "scale": scale,
+            "storage_service_id": storage_service_id,
+            "file_format": file_.file_format,
+            "puid": file_.puid,
+            "aip_uuid": aip.uuid,
+            "typesense": _enable_typesense(app_setup),
+        }
+
+        truncate_tables()
+
+    app_setup.config.clear()
+    app_setup.config.update(previous_config)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(benchmark_data):
+    """Collect measurements, writing them to BENCHMARK_RESULTS at the end."""
+    scale = benchmark_data["scale"]
+    collected = {"scale": scale, "benchmarks": {}}
+
+    yield collected
+
+    path = os.getenv("BENCHMARK_RESULTS", f"benchmark-results-{scale}.json")
+    results.save(path, collected)
+
+
+@pytest.fixture(scope="session")
+def benchmark_baseline(benchmark_data):
+    """Return results to compare with from BENCHMARK_BASELINE, if set."""
+    path = os.getenv("BENCHMARK_BASELINE")
+    if not path:
+        return None
+
+    baseline = results.load(path)
+    if baseline["scale"] != benchmark_data["scale"]:
+        raise pytest.UsageError(
+            f"BENCHMARK_BASELINE has {baseline['scale']} results, not "
+            f"{benchmark_data['scale']} ones"
+        )
+    return baseline
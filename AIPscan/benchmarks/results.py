@@ -0,0 +1,156 @@
+"""Measuring report functions and comparing benchmark results.
+
+Results from two runs can be compared from the command line, exiting
+with status 1 if any benchmark regressed:
+
+    python -m AIPscan.benchmarks.results baseline.json results.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+from AIPscan import db
+from AIPscan import query_profiler
+
+DEFAULT_ROUNDS = 3
+DEFAULT_THRESHOLD = 0.2
+
+
+def _consume(result):
+    # Some report functions return generators, which only query the
+    # database as they're consumed.
+    if hasattr(result, "__next__"):
+        return list(result)
+    return result
+
+
+def measure(name, func, rounds=DEFAULT_ROUNDS):
+    """Return time, query count and peak memory use of a function.
+
+    The function is first run once to count its queries and measure its
+    peak memory use, which also warms up database caches, then timed over
+    a number of rounds.
+
+    :param name: Benchmark name (str)
+    :param func: Function to measure, called without arguments
+    :param rounds: Number of times to time the function (int)
+
+    :returns: Measurements (dict)
+    """
+    db.session.remove()
+    tracemalloc.start()
+    try:
+        with query_profiler.profiled(f"benchmark {name}") as profile:
+            _consume(func())
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    durations = []
+    for _ in range(rounds):
+        db.session.remove()
+        start = time.perf_counter()
+        _consume(func())
+        durations.append(time.perf_counter() - start)
+
+    return {
+        "median_seconds": statistics.median(durations),
+        "min_seconds": min(durations),
+        "rounds": rounds,
+        "queries": profile.count if profile is not None else None,
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def load(path):
+    with open(path) as results_file:
+        return json.load(results_file)
+
+
+def save(path, results):
+    with open(path, "w") as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
+
+
+def regression(baseline, result, threshold=DEFAULT_THRESHOLD):
+    """Return how much slower a result is than its baseline, if too slow.
+
+    :param baseline: Baseline measurements (dict)
+    :param result: Measurements to compare (dict)
+    :param threshold: Allowed slowdown, as a fraction of the baseline (float)
+
+    :returns: Slowdown as a fraction of the baseline (float), or None if
+        within the threshold
+    """
+    slowdown = result["median_seconds"] / baseline["median_seconds"] - 1
+    if slowdown > threshold:
+        return slowdown
+    return None
+
+
+def compare(baseline, results, threshold=DEFAULT_THRESHOLD):
+    """Return benchmarks that regressed between two runs.
+
+    :param baseline: Results of the earlier run (dict)
+    :param results: Results of the later run (dict)
+    :param threshold: Allowed slowdown, as a fraction of the baseline (float)
+
+    :returns: Slowdowns keyed by benchmark name (dict)
+
+    :raises ValueError: if the runs used different data scales
+    """
+    if baseline["scale"] != results["scale"]:
+        raise ValueError(
+            f"Can't compare {baseline['scale']} results with {results['scale']} ones"
+        )
+
+    regressions = {}
+    for name, result in sorted(results["benchmarks"].items()):
+        if name not in baseline["benchmarks"]:
+            continue
+        slowdown = regression(baseline["benchmarks"][name], result, threshold)
+        if slowdown is not None:
+            regressions[name] = slowdown
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare benchmark results.")
+    parser.add_argument("baseline", help="results of the earlier run")
+    parser.add_argument("results", help="results of the later run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed slowdown, as a fraction of the baseline",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = load(args.baseline)
+    results = load(args.results)
+
+    for name, result in sorted(results["benchmarks"].items()):
+        before = baseline["benchmarks"].get(name)
+        if before is None:
+            print(f"{name}: {result['median_seconds']:.3f}s (new)")
+            continue
+        change = result["median_seconds"] / before["median_seconds"] - 1
+        print(
+            f"{name}: {before['median_seconds']:.3f}s -> "
+            f"{result['median_seconds']:.3f}s ({change:+.0%}), "
+            f"{before['queries']} -> {result['queries']} queries"
+        )
+
+    regressions = compare(baseline, results, args.threshold)
+    for name, slowdown in regressions.items():
+        print(f"Regression: {name} is {slowdown:.0%} slower", file=sys.stderr)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
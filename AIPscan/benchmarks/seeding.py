@@ -0,0 +1,58 @@
+"""Seeding of the test database with generated AIPs.
+
+Used by the benchmarks, and by tests that need enough rows for MySQL to
+plan queries as it would on a real repository.
+"""
+
+from pathlib import Path
+
+from tools.helpers import data
+
+# Number of original files created at each scale
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+FILES_PER_AIP = 50
+LOCATIONS = 2
+FORMAT_TYPES = 50
+PRESERVATION_RATIO = 0.5
+SEED = 1
+
+FORMAT_TYPES_CSV = (
+    Path(__file__).parents[2]
+    / "tools"
+    / "data"
+    / "generate-test-data"
+    / "format_types.csv"
+)
+
+
+def seed_database(file_count):
+    """Seed the database with generated AIPs, returning the Storage
+    Service ID.
+
+    :param file_count: Number of original files (int)
+    """
+    data.seed(SEED)
+    pipeline = data.create_or_fetch_fake_pipeline()
+    storage_service = data.create_fake_storage_service(True)
+    fetch_job = data.create_fake_fetch_job(storage_service.id)
+    format_types = data.format_types_from_csv(str(FORMAT_TYPES_CSV))[:FORMAT_TYPES]
+
+    aips_per_location = max(file_count // FILES_PER_AIP // LOCATIONS, 1)
+    for _ in range(LOCATIONS):
+        location = data.create_fake_location(storage_service.id)
+        agents = data.create_fake_agents_for_storage_service(storage_service.id)
+        data.bulk_create_fake_aips(
+            pipeline.id,
+            storage_service.id,
+            location.id,
+            fetch_job.id,
+            agents,
+            format_types,
+            aips_per_location,
+            min_files=FILES_PER_AIP,
+            max_files=FILES_PER_AIP,
+            preservation_ratio=PRESERVATION_RATIO,
+        )
+
+    return storage_service.id
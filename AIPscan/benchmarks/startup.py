@@ -0,0 +1,91 @@
+"""Measuring how long a new process takes to create an app.
+
+Each measurement runs in a fresh interpreter, as imports are cached for
+the life of a process.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+
+from AIPscan.benchmarks.results import DEFAULT_ROUNDS
+
+# Modules that only the web application, or a few reports, should import.
+HEAVY_MODULES = (
+    "flask_restx",
+    "flask_wtf",
+    "natsort",
+    "numpy",
+    "pandas",
+    "typesense",
+    "wtforms",
+)
+
+# Run in the child process with the app factory and config names as
+# arguments. The modules a Celery worker loads at startup are imported
+# too, so that both factories are compared on what a worker runs.
+SCRIPT = """
+import importlib
+import json
+import resource
+import sys
+import time
+
+started = time.perf_counter()
+
+import AIPscan
+from AIPscan.celery import celery
+
+getattr(AIPscan, sys.argv[1])(sys.argv[2])
+for module in celery.conf.include:
+    importlib.import_module(module)
+
+seconds = time.perf_counter() - started
+max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "seconds": seconds,
+    # Linux reports kilobytes, macOS bytes
+    "max_rss_bytes": max_rss * (1 if sys.platform == "darwin" else 1024),
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def start(factory, config_name="test"):
+    """Create an app in a new process, returning what it took.
+
+    :param factory: Name of an app factory of the AIPscan package, i.e.
+        "create_app" or "create_worker_app" (str)
+    :param config_name: Config name passed to the factory (str)
+
+    :returns: Dict with the seconds taken to import AIPscan and create the
+        app, the maximum resident set size of the process in bytes and the
+        names of the imported modules
+    """
+    completed = subprocess.run(
+        [sys.executable, "-c", SCRIPT, factory, config_name],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def measure(factory, rounds=DEFAULT_ROUNDS):
+    """Return startup time and memory use of an app factory.
+
+    :param factory: Name of an app factory of the AIPscan package (str)
+    :param rounds: Number of processes to start (int)
+
+    :returns: Measurements (dict), in the format of results.measure
+    """
+    runs = [start(factory) for _ in range(rounds)]
+    durations = [run["seconds"] for run in runs]
+    return {
+        "median_seconds": statistics.median(durations),
+        "min_seconds": min(durations),
+        "rounds": rounds,
+        "queries": None,
+        "peak_memory_bytes": max(run["max_rss_bytes"] for run in runs),
+    }
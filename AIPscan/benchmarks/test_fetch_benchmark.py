@@ -0,0 +1,92 @@
+"""Benchmark of fetching AIPs from a mock Storage Service."""
+
+import os
+
+import pytest
+
+from AIPscan import db
+from AIPscan.Aggregator import tasks
+from AIPscan.benchmarks import results
+from AIPscan.benchmarks.seeding import SCALES
+from AIPscan.models import StorageService
+from tools.helpers import fetch
+from tools.helpers import storage_service
+
+pytestmark = pytest.mark.benchmark
+
+# AIPs fetched per 1000 files of BENCHMARK_SCALE, so 10 at the default scale
+PACKAGES_PER_1000_FILES = 1
+FILES_PER_AIP = 50
+EVENTS_PER_FILE = 3
+PRESERVATION_RATIO = 0.5
+
+
+@pytest.fixture
+def mock_storage_service(benchmark_data):
+    mock = storage_service.MockStorageService(
+        package_count=SCALES[benchmark_data["scale"]] // 1000 * PACKAGES_PER_1000_FILES,
+        file_count=FILES_PER_AIP,
+        events_per_file=EVENTS_PER_FILE,
+        preservation_ratio=PRESERVATION_RATIO,
+        seed=1,
+    )
+    server = storage_service.serve(mock)
+
+    ss = StorageService(
+        name="Mock Storage Service",
+        url=storage_service.url_for(server),
+        user_name=mock.username,
+        api_key=mock.api_key,
+        download_limit=20,
+        download_offset=0,
+        default=False,
+    )
+    db.session.add(ss)
+    db.session.commit()
+    ss_id = ss.id
+
+    yield ss_id
+
+    server.shutdown()
+    # Remove the fetched AIPs, so that they don't skew report benchmarks
+    tasks.delete_storage_service(ss_id)
+
+
+def test_fetch(
+    mock_storage_service,
+    benchmark_results,
+    benchmark_baseline,
+    app_setup,
+    tmp_path,
+    mocker,
+):
+    mocker.patch.dict(app_setup.config, {"AGGREGATOR_DOWNLOAD_ROOT": str(tmp_path)})
+    # There's no Celery result backend to record task progress in
+    mocker.patch.object(tasks.package_lists_request, "update_state")
+    mocker.patch.object(tasks.get_mets, "update_state")
+
+    measurements = fetch.benchmark_fetch(mock_storage_service, "benchmark")
+    assert measurements["aips"] == measurements["packages"]
+
+    name = "fetch.benchmark_fetch"
+    result = {
+        "median_seconds": measurements["seconds"],
+        "min_seconds": measurements["seconds"],
+        "rounds": 1,
+        "queries": None,
+        "peak_memory_bytes": None,
+        **{
+            key: measurements[key]
+            for key in ("aips_per_second", "megabytes_per_second", "rows_per_second")
+        },
+    }
+    benchmark_results["benchmarks"][name] = result
+
+    if benchmark_baseline is None or name not in benchmark_baseline["benchmarks"]:
+        return
+
+    threshold = float(os.getenv("BENCHMARK_THRESHOLD", results.DEFAULT_THRESHOLD))
+    assert (
+        results.regression(benchmark_baseline["benchmarks"][name], result, threshold)
+        is None
+    )
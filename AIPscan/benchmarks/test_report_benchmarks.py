@@ -0,0 +1,179 @@
+"""Benchmarks of every public report function of the Data layer."""
+
+import os
+
+import pytest
+
+from AIPscan.benchmarks import results
+from AIPscan.Data import data
+from AIPscan.Data import data_typesense
+from AIPscan.Data import report_data
+from AIPscan.Data import report_data_typesense
+from AIPscan.helpers import parse_datetime_bound
+
+pytestmark = pytest.mark.benchmark
+
+START_DATE = parse_datetime_bound("2000-01-01")
+END_DATE = parse_datetime_bound("2100-01-01", upper=True)
+
+# Report functions called with the arguments of a seeded database (dict)
+DATABASE_BENCHMARKS = {
+    "report_data.formats_count": lambda d: report_data.formats_count(
+        d["storage_service_id"], START_DATE, END_DATE
+    ),
+    "report_data.format_versions_count": lambda d: report_data.format_versions_count(
+        d["storage_service_id"], START_DATE, END_DATE
+    ),
+    "report_data.largest_files": lambda d: report_data.largest_files(
+        d["storage_service_id"], START_DATE, END_DATE
+    ),
+    "report_data.largest_files_rows": lambda d: report_data.largest_files_rows(
+        d["storage_service_id"], START_DATE, END_DATE
+    ),
+    "report_data.largest_aips": lambda d: report_data.largest_aips(
+        d["storage_service_id"], START_DATE, END_DATE
+    ),
+    "report_data.aips_by_file_format": lambda d: report_data.aips_by_file_format(
+        d["storage_service_id"], d["file_format"]
+    ),
+    "report_data.aips_by_puid": lambda d: report_data.aips_by_puid(
+        d["storage_service_id"], d["puid"]
+    ),
+    "report_data.agents_transfers": lambda d: report_data.agents_transfers(
+        d["storage_service_id"], START_DATE, END_DATE
+    ),
+    "report_data.preservation_derivatives": lambda d: (
+        report_data.preservation_derivatives(d["storage_service_id"])
+    ),
+    "report_data.preservation_derivatives_rows": lambda d: (
+        report_data.preservation_derivatives_rows(d["storage_service_id"])
+    ),
+    "report_data.preservation_derivatives_records": lambda d: (
+        report_data.preservation_derivatives_records(d["storage_service_id"])[0]
+    ),
+    "report_data.storage_locations": lambda d: report_data.storage_locations(
+        d["storage_service_id"], START_DATE, END_DATE
+    ),
+    "report_data.storage_locations_usage_over_time": lambda d: (
+        report_data.storage_locations_usage_over_time(
+            d["storage_service_id"], START_DATE, END_DATE
+        )
+    ),
+    "report_data.storage_locations_usage_over_time_columns": lambda d: (
+        report_data.storage_locations_usage_over_time_columns(
+            d["storage_service_id"], START_DATE, END_DATE
+        )
+    ),
+    "data.storage_services": lambda d: data.storage_services(),
+    "data.file_format_aip_overview": lambda d: data.file_format_aip_overview(
+        d["storage_service_id"]
+    ),
+    "data.aip_file_format_overview": lambda d: data.aip_file_format_overview(
+        d["storage_service_id"], START_DATE, END_DATE
+    ),
+    "data.aip_file_format_overview_records": lambda d: (
+        data.aip_file_format_overview_records(
+            d["storage_service_id"], START_DATE, END_DATE
+        )[0]
+    ),
+    "data.derivative_overview": lambda d: data.derivative_overview(
+        d["storage_service_id"]
+    ),
+    "data.aip_list": lambda d: data.aip_list(d["storage_service_id"]),
+    "data.aip_list_records": lambda d: data.aip_list_records(d["storage_service_id"])[
+        0
+    ],
+    "data.aip_files": lambda d: data.aip_files(d["aip_uuid"]),
+    "data.aip_files_records": lambda d: data.aip_files_records(d["aip_uuid"])[0],
+}
+
+TYPESENSE_BENCHMARKS = {
+    "report_data_typesense.formats_count": lambda d: (
+        report_data_typesense.formats_count(
+            d["storage_service_id"], None, START_DATE, END_DATE
+        )
+    ),
+    "report_data_typesense.format_versions_count": lambda d: (
+        report_data_typesense.format_versions_count(
+            d["storage_service_id"], START_DATE, END_DATE
+        )
+    ),
+    "report_data_typesense.largest_files": lambda d: (
+        report_data_typesense.largest_files(
+            d["storage_service_id"], START_DATE, END_DATE, None
+        )
+    ),
+    "report_data_typesense.largest_aips": lambda d: report_data_typesense.largest_aips(
+        d["storage_service_id"], START_DATE, END_DATE, None
+    ),
+    "report_data_typesense.aips_by_file_format": lambda d: (
+        report_data_typesense.aips_by_file_format(
+            d["storage_service_id"], d["file_format"]
+        )
+    ),
+    "report_data_typesense.aips_by_puid": lambda d: report_data_typesense.aips_by_puid(
+        d["storage_service_id"], d["puid"]
+    ),
+    "report_data_typesense.agents_transfers": lambda d: (
+        report_data_typesense.agents_transfers(
+            d["storage_service_id"], START_DATE, END_DATE
+        )
+    ),
+    "report_data_typesense.preservation_derivatives": lambda d: (
+        report_data_typesense.preservation_derivatives(d["storage_service_id"])
+    ),
+    "report_data_typesense.storage_locations": lambda d: (
+        report_data_typesense.storage_locations(
+            d["storage_service_id"], START_DATE, END_DATE
+        )
+    ),
+    "data_typesense.aip_file_format_overview": lambda d: (
+        data_typesense.aip_file_format_overview(
+            d["storage_service_id"], START_DATE, END_DATE
+        )
+    ),
+    "data_typesense.derivative_overview": lambda d: data_typesense.derivative_overview(
+        d["storage_service_id"]
+    ),
+}
+
+
+def _run_benchmark(name, func, benchmark_data, benchmark_results, benchmark_baseline):
+    result = results.measure(name, lambda: func(benchmark_data))
+    benchmark_results["benchmarks"][name] = result
+
+    if benchmark_baseline is None or name not in benchmark_baseline["benchmarks"]:
+        return
+
+    threshold = float(os.getenv("BENCHMARK_THRESHOLD", results.DEFAULT_THRESHOLD))
+    baseline = benchmark_baseline["benchmarks"][name]
+    slowdown = results.regression(baseline, result, threshold)
+    assert slowdown is None, (
+        f"{name} took {result['median_seconds']:.3f}s, {slowdown:.0%} longer than "
+        f"the baseline's {baseline['median_seconds']:.3f}s"
+    )
+
+
+@pytest.mark.parametrize("name", DATABASE_BENCHMARKS)
+def test_database_report(name, benchmark_data, benchmark_results, benchmark_baseline):
+    _run_benchmark(
+        name,
+        DATABASE_BENCHMARKS[name],
+        benchmark_data,
+        benchmark_results,
+        benchmark_baseline,
+    )
+
+
+@pytest.mark.parametrize("name", TYPESENSE_BENCHMARKS)
+def test_typesense_report(name, benchmark_data, benchmark_results, benchmark_baseline):
+    if not benchmark_data["typesense"]:
+        pytest.skip("TYPESENSE_TEST_API_KEY isn't set")
+
+    _run_benchmark(
+        name,
+        TYPESENSE_BENCHMARKS[name],
+        benchmark_data,
+        benchmark_results,
+        benchmark_baseline,
+    )
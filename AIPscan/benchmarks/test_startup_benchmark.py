@@ -0,0 +1,26 @@
+"""Benchmark of the time taken to start the web application and workers."""
+
+import os
+
+import pytest
+
+from AIPscan.benchmarks import results
+from AIPscan.benchmarks import startup
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.mark.parametrize("factory", ["create_app", "create_worker_app"])
+def test_startup(factory, benchmark_results, benchmark_baseline):
+    name = f"startup.{factory}"
+    result = startup.measure(factory)
+    benchmark_results["benchmarks"][name] = result
+
+    if benchmark_baseline is None or name not in benchmark_baseline["benchmarks"]:
+        return
+
+    threshold = float(os.getenv("BENCHMARK_THRESHOLD", results.DEFAULT_THRESHOLD))
+    assert (
+        results.regression(benchmark_baseline["benchmarks"][name], result, threshold)
+        is None
+    )
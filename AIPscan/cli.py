@@ -8,10 +8,17 @@ from flask.cli import with_appcontext
 from sqlalchemy.exc import SQLAlchemyError
 
 from AIPscan import db
+from AIPscan.models import AIP
+from AIPscan.models import File
+from AIPscan.models import FileFacet
+from AIPscan.models import StorageLocation
 from AIPscan.models import StorageService
+from AIPscan.models import aip_file_counts
+from AIPscan.models import file_facet_counts
 
 DEFAULT_DOWNLOAD_LIMIT = 20
 DEFAULT_DOWNLOAD_OFFSET = 0
+DEFAULT_BACKFILL_BATCH_SIZE = 500
 WRITE_RETRY_ATTEMPTS = 3
 WRITE_RETRY_DELAY_SECONDS = 2
 
@@ -20,6 +27,8 @@ def register_cli(app):
     """Register custom CLI commands with the Flask app."""
 
     app.cli.add_command(storage_service_bootstrap)
+    app.cli.add_command(backfill_aip_file_counts)
+    app.cli.add_command(rebuild_file_facets)
 
 
 @click.command("storage-service-bootstrap")
@@ -93,6 +102,60 @@ def storage_service_bootstrap(
     ) from last_exception
 
 
+@click.command("backfill-aip-file-counts")
+@click.option(
+    "--batch-size",
+    type=int,
+    default=DEFAULT_BACKFILL_BATCH_SIZE,
+    show_default=True,
+    help="Number of AIPs to update per transaction.",
+)
+@with_appcontext
+def backfill_aip_file_counts(batch_size):
+    """Populate denormalized file counters for existing AIPs."""
+
+    updated = 0
+    last_id = 0
+
+    while True:
+        stmt = (
+            sa.select(AIP.id).where(AIP.id > last_id).order_by(AIP.id).limit(batch_size)
+        )
+        aip_ids = db.session.execute(stmt).scalars().all()
+        if not aip_ids:
+            break
+
+        counts = aip_file_counts(aip_ids)
+        db.session.execute(
+            sa.update(AIP),
+            [{"id": aip_id, **counters} for aip_id, counters in counts.items()],
+        )
+        db.session.commit()
+
+        updated += len(aip_ids)
+        last_id = aip_ids[-1]
+
+    click.echo(f"Updated file counts for {updated} AIPs.")
+
+
+@click.command("rebuild-file-facets")
+@with_appcontext
+def rebuild_file_facets():
+    """Rebuild the file format and PUID facet catalog from the file table."""
+
+    storage_locations = StorageLocation.query.order_by(StorageLocation.id).all()
+    for storage_location in storage_locations:
+        FileFacet.query.filter_by(storage_location_id=storage_location.id).delete()
+        FileFacet.apply_counts(
+            storage_location.storage_service_id,
+            storage_location.id,
+            file_facet_counts(File.storage_location_id == storage_location.id),
+        )
+        db.session.commit()
+
+    click.echo(f"Rebuilt file facets for {len(storage_locations)} storage locations.")
+
+
 def _clear_default_flags(exclude_ids=None):
     """Unset the default flag for all storage services except excluded ones."""
 
@@ -10,6 +10,7 @@ from AIPscan import create_app
 from AIPscan import db
 from AIPscan import test_helpers
 from AIPscan.models import FileType
+from AIPscan.models import Format
 
 AIP_DATE_FORMAT = "%Y-%m-%d"
 
@@ -88,6 +89,16 @@ def app_setup():
         db.engine.dispose()
 
 
+def truncate_tables():
+    """Delete the rows of every table, resetting their IDs."""
+    db.session.execute(db.text("SET FOREIGN_KEY_CHECKS=0;"))
+    for table in db.metadata.tables:
+        db.session.execute(db.text(f"TRUNCATE TABLE `{table}`;"))
+    db.session.execute(db.text("SET FOREIGN_KEY_CHECKS=1;"))
+    db.session.commit()
+    Format.id_cache.clear()
+
+
 @pytest.fixture(scope="function")
 def app_instance(app_setup):
     """Function-scoped test `Flask` application instance.
@@ -96,11 +107,7 @@ def app_instance(app_setup):
     before yielding the application instance.
     """
     with app_setup.app_context():
-        db.session.execute(db.text("SET FOREIGN_KEY_CHECKS=0;"))
-        for table in db.metadata.tables:
-            db.session.execute(db.text(f"TRUNCATE TABLE `{table}`;"))
-        db.session.execute(db.text("SET FOREIGN_KEY_CHECKS=1;"))
-        db.session.commit()
+        truncate_tables()
         yield app_setup
         db.session.remove()
 
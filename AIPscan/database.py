@@ -0,0 +1,150 @@
+"""Database engines and the session routing reads to them.
+
+Besides the primary database, an optional read-only database, usually a
+replica of the primary, can be configured with
+SQLALCHEMY_READ_ONLY_DATABASE_URI. Within a read_only block, SELECT
+statements run through the session go to it, while writes still go to
+the primary. Without a read-only database, everything goes to the
+primary.
+
+GET requests to the Reporter and API blueprints are answered within a
+read_only block, while the Aggregator, which writes, uses the primary.
+As the read-only database may lag behind, a user's requests are
+answered from the primary for READ_ONLY_STALENESS_SECONDS after one of
+their requests writes to the database, or queues a task that does (see
+read_from_primary).
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+
+from flask import current_app
+from flask import has_request_context
+from flask import request
+from flask import session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+# Key of the read-only engine in SQLALCHEMY_BINDS.
+READ_ONLY_BIND = "read_only"
+
+# Blueprints whose GET requests are answered from the read-only engine.
+READ_ONLY_BLUEPRINTS = ("reporter", "api")
+
+# Key of the Flask session holding the time until which the user's
+# requests are answered from the primary.
+PRIMARY_UNTIL_KEY = "read_from_primary_until"
+
+_read_only = contextvars.ContextVar("read_only", default=False)
+
+
+class RoutingSession(Session):
+    """Session sending SELECT statements to the read-only engine when
+    asked to.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and _read_only.get()
+            and not self._flushing
+            and (clause is None or getattr(clause, "is_select", False))
+        ):
+            engine = self._db.engines.get(READ_ONLY_BIND)
+            if engine is not None:
+                return engine
+
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session_, flush_context):
+    read_from_primary()
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _do_orm_execute(orm_execute_state):
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        read_from_primary()
+
+
+def read_from_primary():
+    """Answer the user's next requests from the primary, which has their
+    changes.
+
+    It is called whenever the session writes, and must be called by views
+    queuing tasks that write for the user.
+    """
+    if has_request_context() and READ_ONLY_BIND in current_app.config.get(
+        "SQLALCHEMY_BINDS", {}
+    ):
+        session[PRIMARY_UNTIL_KEY] = (
+            time.time() + current_app.config["READ_ONLY_STALENESS_SECONDS"]
+        )
+
+
+@contextmanager
+def read_only():
+    """Run the session's SELECT statements on the read-only engine, if
+    there is one.
+
+    Rows written outside of the block may not have been replicated yet,
+    so only queries that can tolerate some lag should be run within it.
+    """
+    token = _read_only.set(True)
+    try:
+        yield
+    finally:
+        _read_only.reset(token)
+
+
+@contextmanager
+def primary():
+    """Run the session's statements on the primary, even within a
+    read_only block.
+
+    Like read_only, it can also be used as a decorator.
+    """
+    token = _read_only.set(False)
+    try:
+        yield
+    finally:
+        _read_only.reset(token)
+
+
+def _start_request_routing():
+    if (
+        request.method in ("GET", "HEAD")
+        and request.blueprint in READ_ONLY_BLUEPRINTS
+        and session.get(PRIMARY_UNTIL_KEY, 0) <= time.time()
+    ):
+        request.environ["aipscan.read_only"] = _read_only.set(True)
+
+
+def _stop_request_routing(exc):
+    token = request.environ.pop("aipscan.read_only", None)
+    if token is not None:
+        _read_only.reset(token)
+
+
+def register_read_routing(app):
+    app.before_request(_start_request_routing)
+    app.teardown_request(_stop_request_routing)
+
+
+def dispose_engines(app):
+    """Dispose of the connection pools of an app's engines.
+
+    Connections aren't closed, as they may still be used by the process
+    the pools were inherited from.
+
+    :param app: Flask app
+    """
+    with app.app_context():
+        for engine in app.extensions["sqlalchemy"].engines.values():
+            engine.dispose(close=False)
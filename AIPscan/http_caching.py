@@ -0,0 +1,99 @@
+"""HTTP conditional request handling for Reporter and API responses.
+
+Reported data only changes when the Aggregator adds or deletes AIPs, or
+finishes updating the Typesense index, so rather than running report
+queries to find out whether a response has changed, responses are
+validated using an ETag derived from the data version of every Storage
+Service (see StorageService.bump_data_version) and the request.
+
+Requests with a matching If-None-Match header are answered with 304 Not
+Modified before the view runs. No Last-Modified header is sent, as no
+single date tells when reported data last changed.
+"""
+
+import hashlib
+from datetime import date
+
+from flask import current_app
+from flask import g
+from flask import request
+from flask import session
+from werkzeug.http import is_resource_modified
+
+import AIPscan
+from AIPscan.models import StorageService
+
+CACHED_BLUEPRINTS = ("reporter", "api")
+
+# Views whose responses don't depend only on reported data.
+UNCACHED_ENDPOINTS = (
+    "reporter.download_export",
+    "reporter.download_mets",
+    "reporter.export_status",
+)
+
+
+def _is_cacheable_request():
+    return (
+        request.method in ("GET", "HEAD")
+        and request.blueprint in CACHED_BLUEPRINTS
+        and request.endpoint not in UNCACHED_ENDPOINTS
+    )
+
+
+def get_etag():
+    """Return ETag for the current request.
+
+    Storage Service data versions are combined, rather than just those of
+    a Storage Service named in the request, because every Reporter page
+    lists all Storage Services. The date is included because some pages
+    default to showing data up to today.
+
+    :returns: ETag (str)
+    """
+    parts = [
+        AIPscan.__version__,
+        StorageService.data_version_key(),
+        request.full_path,
+        str(request.accept_mimetypes),
+        str(session.get("start_date")),
+        str(session.get("end_date")),
+        date.today().isoformat(),
+    ]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _set_validators(response, etag):
+    response.set_etag(etag, weak=True)
+    # Make clients check that their copy is still current before using it
+    response.cache_control.no_cache = True
+    response.vary.update(("Accept", "Cookie"))
+
+
+def check_not_modified():
+    """Return 304 response if the client's copy of the response is current."""
+    if not _is_cacheable_request():
+        return None
+
+    etag = get_etag()
+    g.http_etag = etag
+
+    if is_resource_modified(request.environ, etag=etag):
+        return None
+
+    response = current_app.response_class(status=304)
+    _set_validators(response, etag)
+    return response
+
+
+def add_validators(response):
+    """Add ETag header to successful responses."""
+    etag = g.pop("http_etag", None)
+    if etag is not None and response.status_code == 200:
+        _set_validators(response, etag)
+    return response
+
+
+def register_http_caching(app):
+    app.before_request(check_not_modified)
+    app.after_request(add_validators)
@@ -0,0 +1,223 @@
+"""Histograms exposed in the Prometheus text format at /metrics.
+
+Metrics are mostly recorded by Celery workers, which run in other
+processes (and often on other hosts) than the web application. When
+METRICS_DIR is set, each process writes its metrics to its own file in
+that directory whenever flush is called, and /metrics adds up the files
+of every process. The directory must be shared by the web application
+and the workers, and should be emptied when they are restarted.
+
+When METRICS_DIR isn't set, /metrics only reports the metrics recorded
+by the process answering the request.
+"""
+
+import glob
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from flask import current_app
+from flask import has_app_context
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REGISTRY = {}
+
+_process_file = None
+
+
+class Histogram:
+    """Distribution of observed values, counted in cumulative buckets."""
+
+    def __init__(self, name, documentation, buckets, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = sorted(buckets)
+        self.labelnames = tuple(labelnames)
+        self._samples = {}
+        self._lock = threading.Lock()
+        REGISTRY[name] = self
+
+    def observe(self, value, **labels):
+        """Record value, with a value for each of the histogram's labels."""
+        key = tuple(str(labels[labelname]) for labelname in self.labelnames)
+        with self._lock:
+            sample = self._samples.setdefault(
+                key, {"buckets": [0] * len(self.buckets), "sum": 0, "count": 0}
+            )
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    sample["buckets"][index] += 1
+            sample["sum"] += value
+            sample["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the number of seconds taken to run the block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def state(self):
+        """Return histogram definition and samples (JSON serializable)."""
+        with self._lock:
+            samples = [
+                [list(key), list(sample["buckets"]), sample["sum"], sample["count"]]
+                for key, sample in self._samples.items()
+            ]
+        return {
+            "documentation": self.documentation,
+            "buckets": self.buckets,
+            "labelnames": list(self.labelnames),
+            "samples": samples,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._samples = {}
+
+
+def _metrics_dir():
+    if not has_app_context():
+        return None
+    return current_app.config.get("METRICS_DIR")
+
+
+def _get_process_file(directory):
+    """Return path of this process's metrics file.
+
+    Names are unique to each process, even when process IDs are reused.
+    """
+    global _process_file
+
+    pid = os.getpid()
+    if _process_file is None or _process_file[0] != pid:
+        _process_file = (pid, f"metrics-{pid}-{uuid.uuid4().hex}.json")
+
+    return os.path.join(directory, _process_file[1])
+
+
+def flush():
+    """Write this process's metrics to METRICS_DIR, if set."""
+    directory = _metrics_dir()
+    if not directory:
+        return
+
+    os.makedirs(directory, exist_ok=True)
+    path = _get_process_file(directory)
+    state = {name: metric.state() for name, metric in REGISTRY.items()}
+
+    partial_path = f"{path}.part"
+    with open(partial_path, "w") as metrics_file:
+        json.dump(state, metrics_file)
+    os.replace(partial_path, path)
+
+
+def _merge(metrics, states):
+    for name, state in states.items():
+        merged = metrics.setdefault(
+            name,
+            {
+                "documentation": state["documentation"],
+                "buckets": state["buckets"],
+                "labelnames": state["labelnames"],
+                "samples": {},
+            },
+        )
+        # Skip samples from processes that defined the metric differently
+        if merged["buckets"] != state["buckets"]:
+            continue
+
+        for key, buckets, sum_, count in state["samples"]:
+            sample = merged["samples"].setdefault(
+                tuple(key), {"buckets": [0] * len(buckets), "sum": 0, "count": 0}
+            )
+            sample["buckets"] = [
+                total + value
+                for total, value in zip(sample["buckets"], buckets, strict=True)
+            ]
+            sample["sum"] += sum_
+            sample["count"] += count
+
+
+def collect():
+    """Return metrics of every process, keyed by name.
+
+    :returns: Metric definitions with samples keyed by label values (dict)
+    """
+    metrics = {}
+
+    directory = _metrics_dir()
+    if not directory:
+        _merge(metrics, {name: metric.state() for name, metric in REGISTRY.items()})
+        return metrics
+
+    for path in sorted(glob.glob(os.path.join(directory, "metrics-*.json"))):
+        try:
+            with open(path) as metrics_file:
+                states = json.load(metrics_file)
+        except OSError, ValueError:
+            continue
+        _merge(metrics, states)
+
+    return metrics
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\""),
+        )
+        for name, value in labels
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value):
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def generate_latest():
+    """Return metrics of every process in the Prometheus text format."""
+    lines = []
+    for name, metric in sorted(collect().items()):
+        lines.append(f"# HELP {name} {metric['documentation']}")
+        lines.append(f"# TYPE {name} histogram")
+
+        for key, sample in sorted(metric["samples"].items()):
+            labels = list(zip(metric["labelnames"], key, strict=True))
+            for upper_bound, count in zip(
+                metric["buckets"], sample["buckets"], strict=True
+            ):
+                bucket_labels = _format_labels(
+                    labels + [("le", _format_value(float(upper_bound)))]
+                )
+                lines.append(f"{name}_bucket{bucket_labels} {count}")
+            inf_labels = _format_labels(labels + [("le", "+Inf")])
+            lines.append(f"{name}_bucket{inf_labels} {sample['count']}")
+            lines.append(
+                f"{name}_sum{_format_labels(labels)} {_format_value(sample['sum'])}"
+            )
+            lines.append(f"{name}_count{_format_labels(labels)} {sample['count']}")
+
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view():
+    """Return metrics in the Prometheus text format."""
+    return current_app.response_class(generate_latest(), content_type=CONTENT_TYPE)
+
+
+def register_metrics(app):
+    app.add_url_rule("/metrics", "metrics", metrics_view)
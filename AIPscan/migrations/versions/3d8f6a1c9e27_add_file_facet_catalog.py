@@ -0,0 +1,69 @@
+"""Add file facet catalog.
+
+The catalog starts out empty; run ``flask rebuild-file-facets`` after
+upgrading to populate it from existing files.
+
+Revision ID: 3d8f6a1c9e27
+Revises: 5b1e0c7f2a94
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers are used by Alembic.
+revision = "3d8f6a1c9e27"
+down_revision = "5b1e0c7f2a94"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "file_facet",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("storage_service_id", sa.Integer(), nullable=False),
+        sa.Column("storage_location_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "file_type",
+            sa.Enum("original", "preservation", name="filetype"),
+            nullable=False,
+        ),
+        sa.Column(
+            "facet_type",
+            sa.Enum("file_format", "puid", name="facettype"),
+            nullable=False,
+        ),
+        sa.Column("value", sa.String(length=255), nullable=False),
+        sa.Column("file_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["storage_location_id"],
+            ["storage_location.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["storage_service_id"],
+            ["storage_service.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "storage_location_id",
+            "file_type",
+            "facet_type",
+            "value",
+            name="uq_file_facet_location_value",
+        ),
+    )
+    with op.batch_alter_table("file_facet", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_file_facet_storage_service_value",
+            ["storage_service_id", "file_type", "facet_type", "value"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("file_facet", schema=None) as batch_op:
+        batch_op.drop_index("ix_file_facet_storage_service_value")
+
+    op.drop_table("file_facet")
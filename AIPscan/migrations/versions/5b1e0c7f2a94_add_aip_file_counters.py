@@ -0,0 +1,45 @@
+"""Add denormalized file counters to AIP.
+
+Existing rows default to zero; run ``flask backfill-aip-file-counts`` after
+upgrading to populate them.
+
+Revision ID: 5b1e0c7f2a94
+Revises: 97da353f8361
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers are used by Alembic.
+revision = "5b1e0c7f2a94"
+down_revision = "97da353f8361"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("aip", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "original_file_count",
+                sa.Integer(),
+                server_default="0",
+                nullable=False,
+            )
+        )
+        batch_op.add_column(
+            sa.Column(
+                "preservation_file_count",
+                sa.Integer(),
+                server_default="0",
+                nullable=False,
+            )
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("aip", schema=None) as batch_op:
+        batch_op.drop_column("preservation_file_count")
+        batch_op.drop_column("original_file_count")
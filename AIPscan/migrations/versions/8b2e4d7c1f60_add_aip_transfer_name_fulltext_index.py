@@ -0,0 +1,30 @@
+"""Add AIP transfer name full-text index.
+
+Revision ID: 8b2e4d7c1f60
+Revises: 3d8f6a1c9e27
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# Revision identifiers are used by Alembic.
+revision = "8b2e4d7c1f60"
+down_revision = "3d8f6a1c9e27"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("aip", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_aip_transfer_name_fulltext",
+            ["transfer_name"],
+            unique=False,
+            mysql_prefix="FULLTEXT",
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("aip", schema=None) as batch_op:
+        batch_op.drop_index("ix_aip_transfer_name_fulltext")
@@ -0,0 +1,27 @@
+"""Add composite file type and size index.
+
+Revision ID: 97da353f8361
+Revises: c605f2284613
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# Revision identifiers are used by Alembic.
+revision = "97da353f8361"
+down_revision = "c605f2284613"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("file", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_file_file_type_size", ["file_type", "size"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("file", schema=None) as batch_op:
+        batch_op.drop_index("ix_file_file_type_size")
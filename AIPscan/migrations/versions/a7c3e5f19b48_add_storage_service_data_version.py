@@ -0,0 +1,33 @@
+"""Add storage service data version.
+
+Revision ID: a7c3e5f19b48
+Revises: e41a9c6b2d73
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers are used by Alembic.
+revision = "a7c3e5f19b48"
+down_revision = "e41a9c6b2d73"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("storage_service", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "data_version",
+                sa.Integer(),
+                server_default="0",
+                nullable=False,
+            )
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("storage_service", schema=None) as batch_op:
+        batch_op.drop_column("data_version")
@@ -0,0 +1,32 @@
+"""Add composite indexes for report queries.
+
+The file indexes for report queries are added once files refer to their
+format by ID (see e2b9d4f7a1c6), so that they're only built once.
+
+Revision ID: b8e4f1a6c3d2
+Revises: f3c9a2d7b5e1
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# Revision identifiers are used by Alembic.
+revision = "b8e4f1a6c3d2"
+down_revision = "f3c9a2d7b5e1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("aip", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_aip_storage_service_create_date_location",
+            ["storage_service_id", "create_date", "storage_location_id"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("aip", schema=None) as batch_op:
+        batch_op.drop_index("ix_aip_storage_service_create_date_location")
@@ -0,0 +1,75 @@
+"""Copy AIP storage and date columns to file.
+
+Files get the storage service, storage location and creation date of their
+AIP, so that reports can filter files without joining the aip table. Existing
+files are backfilled in batches of file IDs. Indexes including the format of
+files are added along with the format table (see e2b9d4f7a1c6).
+
+Revision ID: d5a7c2e9f184
+Revises: b8e4f1a6c3d2
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers are used by Alembic.
+revision = "d5a7c2e9f184"
+down_revision = "b8e4f1a6c3d2"
+branch_labels = None
+depends_on = None
+
+# Number of file IDs backfilled per statement.
+BATCH_SIZE = 50000
+
+
+def _backfill():
+    connection = op.get_bind()
+    max_id = connection.execute(sa.text("SELECT MAX(id) FROM file")).scalar()
+    if max_id is None:
+        return
+
+    statement = sa.text(
+        "UPDATE file JOIN aip ON aip.id = file.aip_id "
+        "SET file.storage_service_id = aip.storage_service_id, "
+        "file.storage_location_id = aip.storage_location_id, "
+        "file.aip_create_date = aip.create_date "
+        "WHERE file.id >= :start AND file.id < :end"
+    )
+    for start in range(1, max_id + 1, BATCH_SIZE):
+        connection.execute(statement, {"start": start, "end": start + BATCH_SIZE})
+
+
+def upgrade():
+    with op.batch_alter_table("file", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("storage_service_id", sa.Integer(), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column("storage_location_id", sa.Integer(), nullable=True)
+        )
+        batch_op.add_column(sa.Column("aip_create_date", sa.DateTime(), nullable=True))
+
+    _backfill()
+
+    with op.batch_alter_table("file", schema=None) as batch_op:
+        batch_op.alter_column(
+            "storage_service_id", existing_type=sa.Integer(), nullable=False
+        )
+        batch_op.alter_column(
+            "storage_location_id", existing_type=sa.Integer(), nullable=False
+        )
+        batch_op.create_index(
+            "ix_file_storage_location_date",
+            ["storage_location_id", "aip_create_date", "file_type", "size"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("file", schema=None) as batch_op:
+        batch_op.drop_index("ix_file_storage_location_date")
+        batch_op.drop_column("aip_create_date")
+        batch_op.drop_column("storage_location_id")
+        batch_op.drop_column("storage_service_id")
@@ -0,0 +1,145 @@
+"""Add format table.
+
+Each distinct combination of PUID, format name and format version gets a
+format row, which files refer to by ID so that reports group files by an
+integer instead of three strings. Existing files are backfilled in batches
+of file IDs, then the file indexes covering format reports are added.
+
+Revision ID: e2b9d4f7a1c6
+Revises: d5a7c2e9f184
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+import hashlib
+import json
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers are used by Alembic.
+revision = "e2b9d4f7a1c6"
+down_revision = "d5a7c2e9f184"
+branch_labels = None
+depends_on = None
+
+# Number of file IDs backfilled per statement.
+BATCH_SIZE = 50000
+
+FORMAT_FOREIGN_KEY = "fk_file_format_id_format"
+
+
+def _digest(puid, name, version):
+    # Must match AIPscan.models.Format.digest_of
+    key = json.dumps([puid, name, version])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def _backfill():
+    connection = op.get_bind()
+    formats = connection.execute(
+        sa.text("SELECT DISTINCT puid, file_format, format_version FROM file")
+    ).all()
+    if formats:
+        connection.execute(
+            sa.text(
+                "INSERT INTO format (digest, puid, name, version) "
+                "VALUES (:digest, :puid, :name, :version)"
+            ),
+            [
+                {
+                    "digest": _digest(puid, name, version),
+                    "puid": puid,
+                    "name": name,
+                    "version": version,
+                }
+                for puid, name, version in formats
+            ],
+        )
+
+    max_id = connection.execute(sa.text("SELECT MAX(id) FROM file")).scalar()
+    if max_id is None:
+        return
+
+    statement = sa.text(
+        "UPDATE file JOIN format ON file.puid <=> format.puid "
+        "AND file.file_format <=> format.name "
+        "AND file.format_version <=> format.version "
+        "SET file.format_id = format.id "
+        "WHERE file.id >= :start AND file.id < :end"
+    )
+    for start in range(1, max_id + 1, BATCH_SIZE):
+        connection.execute(statement, {"start": start, "end": start + BATCH_SIZE})
+
+
+def upgrade():
+    op.create_table(
+        "format",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("digest", sa.String(length=40), nullable=False),
+        sa.Column("puid", sa.String(length=255), nullable=True),
+        sa.Column("name", sa.String(length=255), nullable=True),
+        sa.Column("version", sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("digest"),
+    )
+    with op.batch_alter_table("format", schema=None) as batch_op:
+        batch_op.create_index(batch_op.f("ix_format_puid"), ["puid"], unique=False)
+        batch_op.create_index(batch_op.f("ix_format_name"), ["name"], unique=False)
+
+    with op.batch_alter_table("file", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("format_id", sa.Integer(), nullable=True))
+
+    _backfill()
+
+    with op.batch_alter_table("file", schema=None) as batch_op:
+        batch_op.alter_column("format_id", existing_type=sa.Integer(), nullable=False)
+        batch_op.create_index(
+            batch_op.f("ix_file_format_id"), ["format_id"], unique=False
+        )
+        batch_op.create_foreign_key(FORMAT_FOREIGN_KEY, "format", ["format_id"], ["id"])
+        batch_op.create_index(
+            "ix_file_aip_file_type_format_size",
+            ["aip_id", "file_type", "format_id", "size"],
+            unique=False,
+        )
+        batch_op.create_index(
+            "ix_file_storage_service_type_date",
+            [
+                "storage_service_id",
+                "file_type",
+                "aip_create_date",
+                "storage_location_id",
+                "format_id",
+                "size",
+            ],
+            unique=False,
+        )
+        batch_op.create_index(
+            "ix_file_storage_service_type_format",
+            [
+                "storage_service_id",
+                "file_type",
+                "format_id",
+                "storage_location_id",
+                "aip_id",
+                "size",
+            ],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("file", schema=None) as batch_op:
+        batch_op.drop_index("ix_file_storage_service_type_format")
+        batch_op.drop_index("ix_file_storage_service_type_date")
+        batch_op.drop_index("ix_file_aip_file_type_format_size")
+        batch_op.drop_constraint(FORMAT_FOREIGN_KEY, type_="foreignkey")
+        batch_op.drop_index(batch_op.f("ix_file_format_id"))
+        batch_op.drop_column("format_id")
+
+    with op.batch_alter_table("format", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_format_name"))
+        batch_op.drop_index(batch_op.f("ix_format_puid"))
+
+    op.drop_table("format")
@@ -0,0 +1,37 @@
+"""Add indexes for keyset pagination of AIPs and files.
+
+Revision ID: e41a9c6b2d73
+Revises: 8b2e4d7c1f60
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# Revision identifiers are used by Alembic.
+revision = "e41a9c6b2d73"
+down_revision = "8b2e4d7c1f60"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("aip", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_aip_storage_service_create_date",
+            ["storage_service_id", "create_date", "id"],
+            unique=False,
+        )
+
+    with op.batch_alter_table("file", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_file_aip_file_type", ["aip_id", "file_type", "id"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("file", schema=None) as batch_op:
+        batch_op.drop_index("ix_file_aip_file_type")
+
+    with op.batch_alter_table("aip", schema=None) as batch_op:
+        batch_op.drop_index("ix_aip_storage_service_create_date")
@@ -0,0 +1,51 @@
+"""Add export jobs.
+
+Revision ID: f3c9a2d7b5e1
+Revises: a7c3e5f19b48
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers are used by Alembic.
+revision = "f3c9a2d7b5e1"
+down_revision = "a7c3e5f19b48"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "export_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("report", sa.String(length=64), nullable=False),
+        sa.Column("params", sa.Text(), nullable=False),
+        sa.Column("params_hash", sa.String(length=64), nullable=False),
+        sa.Column("data_version", sa.String(length=40), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("pending", "running", "done", "failed", name="exportstatus"),
+            nullable=False,
+        ),
+        sa.Column("task_id", sa.String(length=36), nullable=True),
+        sa.Column("rows_written", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("filename", sa.String(length=255), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created", sa.DateTime(), nullable=False),
+        sa.Column("started", sa.DateTime(), nullable=True),
+        sa.Column("finished", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("export_jobs", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_export_jobs_report_params", ["report", "params_hash"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("export_jobs", schema=None) as batch_op:
+        batch_op.drop_index("ix_export_jobs_report_params")
+
+    op.drop_table("export_jobs")
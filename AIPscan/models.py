@@ -1,8 +1,11 @@
 import enum
+import hashlib
+import json
 import re
 from datetime import date
 from datetime import datetime
 
+from sqlalchemy import event
 from sqlalchemy.dialects import mysql
 
 from AIPscan import db
@@ -45,6 +48,12 @@ class StorageService(db.Model):
     download_limit = db.Column(db.Integer())
     download_offset = db.Column(db.Integer())
     default = db.Column(db.Boolean)
+    # Incremented whenever data reported on for this Storage Service changes
+    # (see bump_data_version) so that HTTP validators can be derived from it
+    # without looking at the data itself.
+    data_version = db.Column(
+        db.Integer(), nullable=False, default=0, server_default="0"
+    )
     fetch_jobs = db.relationship(
         "FetchJob", cascade="all,delete", backref="storage_service", lazy=True
     )
@@ -66,6 +75,35 @@ class StorageService(db.Model):
     def __repr__(self):
         return f"<Storage Service '{self.name}'>"
 
+    @classmethod
+    def bump_data_version(cls, storage_service_id):
+        """Record that data for a Storage Service has changed.
+
+        The increment is done in the database so that concurrent workers
+        don't overwrite each other's changes. The caller is responsible for
+        committing the session.
+
+        :param storage_service_id: Storage Service ID (int)
+        """
+        cls.query.filter_by(id=storage_service_id).update(
+            {cls.data_version: cls.data_version + 1}, synchronize_session=False
+        )
+
+    @classmethod
+    def data_version_key(cls):
+        """Return key that changes whenever any reported data changes.
+
+        The key combines the data versions of every Storage Service, so it
+        also changes when a Storage Service is added or deleted.
+
+        :returns: Hex digest (str)
+        """
+        versions = db.session.execute(
+            db.select(cls.id, cls.data_version).order_by(cls.id)
+        ).all()
+        key = ",".join(f"{id_}:{version}" for id_, version in versions)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
     @property
     def earliest_aip_created(self):
         results = (
@@ -76,49 +114,29 @@ class StorageService(db.Model):
         except TypeError:
             return date.today()
 
-    @property
-    def unique_file_formats(self):
-        return (
-            db.session.query(File.file_format.distinct().label("name"))
-            .join(AIP)
-            .join(StorageService)
-            .filter(StorageService.id == self.id)
-            .order_by(File.file_format)
-        )
-
     @property
     def unique_original_file_formats(self):
-        formats = self.unique_file_formats
-        original_formats = formats.filter(File.file_type == FileType.original)
-        return [format_.name for format_ in original_formats]
+        return FileFacet.values(
+            FileType.original, FacetType.file_format, storage_service_id=self.id
+        )
 
     @property
     def unique_preservation_file_formats(self):
-        formats = self.unique_file_formats
-        preservation_formats = formats.filter(File.file_type == FileType.preservation)
-        return [format_.name for format_ in preservation_formats]
-
-    @property
-    def unique_puids(self):
-        return (
-            db.session.query(File.puid.distinct().label("puid"))
-            .join(AIP)
-            .join(StorageService)
-            .filter(StorageService.id == self.id)
-            .order_by(File.puid)
+        return FileFacet.values(
+            FileType.preservation, FacetType.file_format, storage_service_id=self.id
         )
 
     @property
     def unique_original_puids(self):
-        puids = self.unique_puids
-        original_puids = puids.filter(File.file_type == FileType.original)
-        return [puid.puid for puid in original_puids if puid.puid is not None]
+        return FileFacet.values(
+            FileType.original, FacetType.puid, storage_service_id=self.id
+        )
 
     @property
     def unique_preservation_puids(self):
-        puids = self.unique_puids
-        preservation_puids = puids.filter(File.file_type == FileType.preservation)
-        return [puid.puid for puid in preservation_puids if puid.puid is not None]
+        return FileFacet.values(
+            FileType.preservation, FacetType.puid, storage_service_id=self.id
+        )
 
 
 class StorageLocation(db.Model):
@@ -132,6 +150,7 @@ class StorageLocation(db.Model):
     aips = db.relationship(
         "AIP", cascade="all,delete", backref="storage_location", lazy=True
     )
+    file_facets = db.relationship("FileFacet", cascade="all,delete", lazy=True)
 
     def __init__(self, current_location, description, storage_service_id):
         self.current_location = current_location
@@ -148,49 +167,29 @@ class StorageLocation(db.Model):
             return match.group(0)
         return None
 
-    @property
-    def unique_file_formats(self):
-        return (
-            db.session.query(File.file_format.distinct().label("name"))
-            .join(AIP)
-            .join(StorageLocation)
-            .filter(StorageLocation.id == self.id)
-            .order_by(File.file_format)
-        )
-
     @property
     def unique_original_file_formats(self):
-        formats = self.unique_file_formats
-        original_formats = formats.filter(File.file_type == FileType.original)
-        return [format_.name for format_ in original_formats]
+        return FileFacet.values(
+            FileType.original, FacetType.file_format, storage_location_id=self.id
+        )
 
     @property
     def unique_preservation_file_formats(self):
-        formats = self.unique_file_formats
-        preservation_formats = formats.filter(File.file_type == FileType.preservation)
-        return [format_.name for format_ in preservation_formats]
-
-    @property
-    def unique_puids(self):
-        return (
-            db.session.query(File.puid.distinct().label("puid"))
-            .join(AIP)
-            .join(StorageLocation)
-            .filter(StorageLocation.id == self.id)
-            .order_by(File.puid)
+        return FileFacet.values(
+            FileType.preservation, FacetType.file_format, storage_location_id=self.id
         )
 
     @property
     def unique_original_puids(self):
-        puids = self.unique_puids
-        original_puids = puids.filter(File.file_type == FileType.original)
-        return [puid.puid for puid in original_puids if puid.puid is not None]
+        return FileFacet.values(
+            FileType.original, FacetType.puid, storage_location_id=self.id
+        )
 
     @property
     def unique_preservation_puids(self):
-        puids = self.unique_puids
-        preservation_puids = puids.filter(File.file_type == FileType.preservation)
-        return [puid.puid for puid in preservation_puids if puid.puid is not None]
+        return FileFacet.values(
+            FileType.preservation, FacetType.puid, storage_location_id=self.id
+        )
 
     def aip_count(self, start_date=None, end_date=None):
         """Return count of AIPs in this location."""
@@ -201,7 +200,6 @@ class StorageLocation(db.Model):
             end_date = datetime.max
         results = (
             db.session.query(db.func.count(AIP.id))
-            .join(StorageLocation)
             .filter(AIP.storage_location_id == self.id)
             .filter(AIP.create_date >= start_date)
             .filter(AIP.create_date < end_date)
@@ -221,11 +219,9 @@ class StorageLocation(db.Model):
             end_date = datetime.max
         results = (
             db.session.query(db.func.sum(File.size))
-            .join(AIP)
-            .join(StorageLocation)
-            .filter(AIP.storage_location_id == self.id)
-            .filter(AIP.create_date >= start_date)
-            .filter(AIP.create_date < end_date)
+            .filter(File.storage_location_id == self.id)
+            .filter(File.aip_create_date >= start_date)
+            .filter(File.aip_create_date < end_date)
             .first()
         )
         if results[0]:
@@ -243,11 +239,9 @@ class StorageLocation(db.Model):
             end_date = datetime.max
         files = (
             db.session.query(File)
-            .join(AIP)
-            .join(StorageLocation)
-            .filter(AIP.storage_location_id == self.id)
-            .filter(AIP.create_date >= start_date)
-            .filter(AIP.create_date < end_date)
+            .filter(File.storage_location_id == self.id)
+            .filter(File.aip_create_date >= start_date)
+            .filter(File.aip_create_date < end_date)
         )
         if originals:
             files = files.filter(File.file_type == FileType.original)
@@ -322,6 +316,29 @@ class Pipeline(db.Model):
 
 class AIP(db.Model):
     __tablename__ = "aip"
+    __table_args__ = (
+        # Supports searching AIPs by transfer name on MySQL. Other databases
+        # create a regular index, which searches don't use.
+        db.Index(
+            "ix_aip_transfer_name_fulltext", "transfer_name", mysql_prefix="FULLTEXT"
+        ),
+        # Supports listing a storage service's AIPs a page at a time, seeking
+        # on (create_date, id) (see AIPscan.pagination).
+        db.Index(
+            "ix_aip_storage_service_create_date",
+            "storage_service_id",
+            "create_date",
+            "id",
+        ),
+        # Supports reports, which filter a storage service's AIPs on
+        # creation date and, optionally, storage location.
+        db.Index(
+            "ix_aip_storage_service_create_date_location",
+            "storage_service_id",
+            "create_date",
+            "storage_location_id",
+        ),
+    )
     id = db.Column(db.Integer(), primary_key=True)
     uuid = db.Column(db.String(255), index=True)
     transfer_name = db.Column(db.String(255))
@@ -340,6 +357,15 @@ class AIP(db.Model):
     origin_pipeline_id = db.Column(
         db.Integer(), db.ForeignKey("pipeline.id"), nullable=False
     )
+    # Denormalized file counters, populated when the AIP's files are
+    # written (see update_file_counts) so that listings and reports do not
+    # need to count rows in the file table for every AIP.
+    original_file_count = db.Column(
+        db.Integer(), nullable=False, default=0, server_default="0"
+    )
+    preservation_file_count = db.Column(
+        db.Integer(), nullable=False, default=0, server_default="0"
+    )
     files = db.relationship("File", cascade="all,delete", backref="aip", lazy=True)
 
     def __init__(
@@ -363,19 +389,20 @@ class AIP(db.Model):
         self.storage_location_id = storage_location_id
         self.fetch_job_id = fetch_job_id
         self.origin_pipeline_id = origin_pipeline_id
+        self.original_file_count = 0
+        self.preservation_file_count = 0
 
     def __repr__(self):
         return f"<AIP '{self.transfer_name}'>"
 
-    @property
-    def original_file_count(self):
-        return File.query.filter_by(aip_id=self.id, file_type=FileType.original).count()
+    def update_file_counts(self):
+        """Recalculate denormalized file counters from the file table.
 
-    @property
-    def preservation_file_count(self):
-        return File.query.filter_by(
-            aip_id=self.id, file_type=FileType.preservation
-        ).count()
+        The caller is responsible for committing the session.
+        """
+        counts = aip_file_counts([self.id])[self.id]
+        for attr, value in counts.items():
+            setattr(self, attr, value)
 
 
 class FileType(enum.Enum):
@@ -383,8 +410,133 @@ class FileType(enum.Enum):
     preservation = "preservation"
 
 
+class Format(db.Model):
+    """A distinct combination of PUID, format name and version.
+
+    Files refer to their format by ID, so that reports group files by an
+    integer and read the names of the few resulting formats from this table
+    afterwards. Rows are added as new formats are ingested (see id_for) and
+    are never changed or deleted.
+    """
+
+    __tablename__ = "format"
+    id = db.Column(db.Integer(), primary_key=True)
+    # Digest of the PUID, name and version, which may be NULL and so can't
+    # be relied on by a unique constraint of their own.
+    digest = db.Column(db.String(40), nullable=False, unique=True)
+    puid = db.Column(db.String(255), index=True)
+    name = db.Column(db.String(255), index=True)
+    version = db.Column(db.String(255))
+
+    # Format IDs keyed by digest, shared by every session of the process.
+    id_cache = {}
+
+    def __init__(self, puid, name, version):
+        self.digest = self.digest_of(puid, name, version)
+        self.puid = puid
+        self.name = name
+        self.version = version
+
+    def __repr__(self):
+        return f"<Format '{self.puid}' - '{self.name}' - '{self.version}'>"
+
+    @staticmethod
+    def digest_of(puid, name, version):
+        """Return digest identifying a format.
+
+        :param puid: PUID (str or None)
+        :param name: Format name (str or None)
+        :param version: Format version (str or None)
+
+        :returns: Hex digest (str)
+        """
+        key = json.dumps([puid, name, version])
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def id_for(cls, puid, name, version):
+        """Return ID of a format, adding the format if it's new.
+
+        IDs are cached, so the database is only queried the first time a
+        process sees a format. New formats are upserted and committed on a
+        connection of their own, so that their IDs stay valid if the
+        caller's transaction is rolled back and concurrent workers ingesting
+        the same new format don't wait on each other's transactions.
+
+        :param puid: PUID (str or None)
+        :param name: Format name (str or None)
+        :param version: Format version (str or None)
+
+        :returns: Format ID (int)
+        """
+        digest = cls.digest_of(puid, name, version)
+        format_id = cls.id_cache.get(digest)
+        if format_id is not None:
+            return format_id
+
+        insert = mysql.insert(cls.__table__).values(
+            digest=digest, puid=puid, name=name, version=version
+        )
+        with db.engine.begin() as connection:
+            connection.execute(
+                insert.on_duplicate_key_update(digest=insert.inserted.digest)
+            )
+            format_id = connection.execute(
+                db.select(cls.id).where(cls.digest == digest)
+            ).scalar_one()
+
+        cls.id_cache[digest] = format_id
+        return format_id
+
+
 class File(db.Model):
     __tablename__ = "file"
+    __table_args__ = (
+        # Supports "largest files" style queries, which filter on file type
+        # and return the top N files ordered by size.
+        db.Index("ix_file_file_type_size", "file_type", "size"),
+        # Supports listing an AIP's files a page at a time, seeking on id.
+        db.Index("ix_file_aip_file_type", "aip_id", "file_type", "id"),
+        # Cover the files of the AIPs selected by reports counting files
+        # and their size by format, so that rows aren't read.
+        db.Index(
+            "ix_file_aip_file_type_format_size",
+            "aip_id",
+            "file_type",
+            "format_id",
+            "size",
+        ),
+        # Cover reports counting a storage service's files by format, which
+        # filter on the creation date of their AIP and, optionally, storage
+        # location, without reading rows or joining the aip table.
+        db.Index(
+            "ix_file_storage_service_type_date",
+            "storage_service_id",
+            "file_type",
+            "aip_create_date",
+            "storage_location_id",
+            "format_id",
+            "size",
+        ),
+        # Support finding the AIPs containing files of a format or PUID.
+        db.Index(
+            "ix_file_storage_service_type_format",
+            "storage_service_id",
+            "file_type",
+            "format_id",
+            "storage_location_id",
+            "aip_id",
+            "size",
+        ),
+        # Cover the totals of a storage location's files.
+        db.Index(
+            "ix_file_storage_location_date",
+            "storage_location_id",
+            "aip_create_date",
+            "file_type",
+            "size",
+        ),
+    )
     id = db.Column(db.Integer(), primary_key=True)
     name = db.Column(db.String(255), index=True)
     filepath = db.Column(db.Text(), nullable=True)  # Accommodate long filepaths.
@@ -398,6 +550,11 @@ class File(db.Model):
     puid = db.Column(db.String(255), index=True)
     file_format = db.Column(db.String(255))
     format_version = db.Column(db.String(255))
+    # Format of the PUID, file format and format version above, which
+    # reports group files by (see Format.id_for).
+    format_id = db.Column(
+        db.Integer(), db.ForeignKey("format.id"), nullable=False, index=True
+    )
     checksum_type = db.Column(db.String(255))
     checksum_value = db.Column(db.String(255), index=True)
     premis_object = db.Column(mysql.LONGTEXT)
@@ -410,6 +567,14 @@ class File(db.Model):
     )
 
     aip_id = db.Column(db.Integer(), db.ForeignKey("aip.id"), nullable=False)
+    # Copies of the AIP's columns, which don't change once the AIP is
+    # written, so that reports can filter files without joining the aip
+    # table. They are set from the AIP when not passed in (see
+    # _copy_aip_columns). Files are deleted with their AIP, so there are
+    # no foreign keys to slow down inserts.
+    storage_service_id = db.Column(db.Integer(), nullable=False)
+    storage_location_id = db.Column(db.Integer(), nullable=False)
+    aip_create_date = db.Column(db.DateTime())
     events = db.relationship("Event", cascade="all,delete", backref="file", lazy=True)
 
     def __init__(
@@ -428,6 +593,10 @@ class File(db.Model):
         format_version=None,
         puid=None,
         original_file_id=None,
+        storage_service_id=None,
+        storage_location_id=None,
+        aip_create_date=None,
+        format_id=None,
     ):
         self.name = name
         self.filepath = filepath
@@ -443,6 +612,10 @@ class File(db.Model):
         self.premis_object = premis_object
         self.original_file_id = original_file_id
         self.aip_id = aip_id
+        self.storage_service_id = storage_service_id
+        self.storage_location_id = storage_location_id
+        self.aip_create_date = aip_create_date
+        self.format_id = format_id
 
     def __repr__(self):
         return f"<File '{self.id}' - '{self.name}'"
@@ -455,6 +628,283 @@ class File(db.Model):
         return str(value).splitlines()
 
 
+@event.listens_for(File, "before_insert")
+def _copy_aip_columns(mapper, connection, target):
+    """Copy the columns of a file's AIP that it wasn't created with."""
+    if target.storage_service_id is not None and target.storage_location_id is not None:
+        return
+
+    aip = connection.execute(
+        db.select(
+            AIP.storage_service_id, AIP.storage_location_id, AIP.create_date
+        ).where(AIP.id == target.aip_id)
+    ).one()
+    target.storage_service_id = aip.storage_service_id
+    target.storage_location_id = aip.storage_location_id
+    target.aip_create_date = aip.create_date
+
+
+@event.listens_for(File, "before_insert")
+def _set_format_id(mapper, connection, target):
+    """Set the format of a file that wasn't created with one."""
+    if target.format_id is None:
+        target.format_id = Format.id_for(
+            target.puid, target.file_format, target.format_version
+        )
+
+
+def aip_file_counts(aip_ids):
+    """Return denormalized file counters for the given AIPs.
+
+    All counters are calculated in a single grouped query.
+
+    :param aip_ids: AIP IDs (list of int)
+
+    :returns: Dict of counter dicts, keyed by AIP ID, with keys matching the
+        AIP model's counter columns
+    """
+    is_original = File.file_type == FileType.original
+    is_preservation = File.file_type == FileType.preservation
+
+    results = (
+        db.session.query(
+            File.aip_id.label("aip_id"),
+            db.func.sum(db.case((is_original, 1), else_=0)).label("originals"),
+            db.func.sum(db.case((is_preservation, 1), else_=0)).label(
+                "preservation_files"
+            ),
+        )
+        .filter(File.aip_id.in_(aip_ids))
+        .group_by(File.aip_id)
+    )
+
+    counts = {
+        aip_id: {
+            "original_file_count": 0,
+            "preservation_file_count": 0,
+        }
+        for aip_id in aip_ids
+    }
+    for result in results:
+        counts[result.aip_id] = {
+            "original_file_count": int(result.originals or 0),
+            "preservation_file_count": int(result.preservation_files or 0),
+        }
+
+    return counts
+
+
+class FacetType(enum.Enum):
+    file_format = "file_format"
+    puid = "puid"
+
+
+# File columns that each facet type lists the distinct values of.
+FACET_COLUMNS = {
+    FacetType.file_format: File.file_format,
+    FacetType.puid: File.puid,
+}
+
+
+class FileFacet(db.Model):
+    """Catalog of distinct file format and PUID values.
+
+    One row is kept per storage location, file type, facet type and value,
+    with the number of files that have that value. Rows are maintained as
+    AIPs are ingested and deleted (see apply_counts) so that the Reports
+    page can populate its dropdowns without scanning the file table.
+    """
+
+    __tablename__ = "file_facet"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "storage_location_id",
+            "file_type",
+            "facet_type",
+            "value",
+            name="uq_file_facet_location_value",
+        ),
+        db.Index(
+            "ix_file_facet_storage_service_value",
+            "storage_service_id",
+            "file_type",
+            "facet_type",
+            "value",
+        ),
+    )
+    id = db.Column(db.Integer(), primary_key=True)
+    storage_service_id = db.Column(
+        db.Integer(), db.ForeignKey("storage_service.id"), nullable=False
+    )
+    storage_location_id = db.Column(
+        db.Integer(), db.ForeignKey("storage_location.id"), nullable=False
+    )
+    file_type = db.Column(db.Enum(FileType), nullable=False)
+    facet_type = db.Column(db.Enum(FacetType), nullable=False)
+    value = db.Column(db.String(255), nullable=False)
+    file_count = db.Column(db.Integer(), nullable=False, default=0)
+
+    def __init__(
+        self,
+        storage_service_id,
+        storage_location_id,
+        file_type,
+        facet_type,
+        value,
+        file_count=0,
+    ):
+        self.storage_service_id = storage_service_id
+        self.storage_location_id = storage_location_id
+        self.file_type = file_type
+        self.facet_type = facet_type
+        self.value = value
+        self.file_count = file_count
+
+    def __repr__(self):
+        return f"<FileFacet '{self.facet_type.value}' - '{self.value}'>"
+
+    @classmethod
+    def apply_counts(cls, storage_service_id, storage_location_id, counts, sign=1):
+        """Add file counts to, or subtract them from, a location's facets.
+
+        Counts are changed in place by the database, so that workers
+        ingesting or deleting AIPs of the same location concurrently don't
+        overwrite each other's counts. Facets are upserted when counts are
+        added and removed once no files have their value. Values are
+        matched case-insensitively, by the unique constraint's collation.
+        The caller is responsible for committing the session.
+
+        :param storage_service_id: Storage Service ID (int)
+        :param storage_location_id: Storage Location ID (int)
+        :param counts: File counts keyed by (FileType, FacetType, value), as
+            returned by file_facet_counts (dict)
+        :param sign: 1 to add counts or -1 to subtract them (int)
+        """
+        if not counts:
+            return
+
+        table = cls.__table__
+        # Rows are always changed in the same order, so that concurrent
+        # workers lock them in the same order too.
+        counts = sorted(
+            counts.items(),
+            key=lambda item: (item[0][0].value, item[0][1].value, item[0][2]),
+        )
+
+        if sign > 0:
+            insert = mysql.insert(table).values(
+                [
+                    {
+                        "storage_service_id": storage_service_id,
+                        "storage_location_id": storage_location_id,
+                        "file_type": file_type,
+                        "facet_type": facet_type,
+                        "value": value,
+                        "file_count": count,
+                    }
+                    for (file_type, facet_type, value), count in counts
+                ]
+            )
+            db.session.execute(
+                insert.on_duplicate_key_update(
+                    file_count=table.c.file_count + insert.inserted.file_count
+                )
+            )
+            return
+
+        for (file_type, facet_type, value), count in counts:
+            db.session.execute(
+                db.update(table)
+                .where(
+                    table.c.storage_location_id == storage_location_id,
+                    table.c.file_type == file_type,
+                    table.c.facet_type == facet_type,
+                    table.c.value == value,
+                )
+                .values(file_count=table.c.file_count - count)
+            )
+        db.session.execute(
+            db.delete(table).where(
+                table.c.storage_location_id == storage_location_id,
+                table.c.file_count <= 0,
+            )
+        )
+
+    @classmethod
+    def all_values(cls, storage_service_id=None, storage_location_id=None):
+        """Return sorted facet values for a Storage Service or Location.
+
+        Values for every file type and facet type are read in one query.
+        Formats are sorted alphabetically and PUIDs in natural order.
+
+        :param storage_service_id: Storage Service ID (int)
+        :param storage_location_id: Storage Location ID (int), which takes
+            precedence over storage_service_id if both are given
+
+        :returns: Dict of lists of (value, file count) tuples, keyed by
+            (FileType, FacetType)
+        """
+        from natsort import natsort_keygen
+
+        query = db.session.query(
+            cls.file_type,
+            cls.facet_type,
+            cls.value,
+            db.func.sum(cls.file_count).label("file_count"),
+        )
+        if storage_location_id:
+            query = query.filter(cls.storage_location_id == storage_location_id)
+        else:
+            query = query.filter(cls.storage_service_id == storage_service_id)
+        query = query.group_by(cls.file_type, cls.facet_type, cls.value)
+
+        values = {}
+        for result in query:
+            values.setdefault((result.file_type, result.facet_type), []).append(
+                (result.value, int(result.file_count))
+            )
+
+        natural_key = natsort_keygen()
+        for (_, facet_type), facet_values in values.items():
+            if facet_type == FacetType.puid:
+                facet_values.sort(key=lambda item: natural_key(item[0]))
+            else:
+                facet_values.sort(key=lambda item: item[0].casefold())
+        return values
+
+    @classmethod
+    def values(
+        cls, file_type, facet_type, storage_service_id=None, storage_location_id=None
+    ):
+        """Return sorted values of a single facet.
+
+        :returns: list of str
+        """
+        values = cls.all_values(storage_service_id, storage_location_id)
+        return [value for value, _ in values.get((file_type, facet_type), [])]
+
+
+def file_facet_counts(*criteria):
+    """Return file counts per facet value for files matching criteria.
+
+    :param criteria: SQLAlchemy filter criteria on the File model, e.g.
+        File.aip_id == aip.id
+
+    :returns: Dict of file counts keyed by (FileType, FacetType, value)
+    """
+    counts = {}
+    for facet_type, column in FACET_COLUMNS.items():
+        results = (
+            db.session.query(File.file_type, column, db.func.count(File.id))
+            .filter(*criteria)
+            .filter(File.file_type.isnot(None), column.isnot(None))
+            .group_by(File.file_type, column)
+        )
+        for file_type, value, count in results:
+            counts[(file_type, facet_type, value)] = count
+    return counts
+
+
 EventAgent = db.Table(
     "event_agents",
     db.Column("event_id", db.Integer, db.ForeignKey("event.id")),
@@ -509,3 +959,55 @@ class Agent(db.Model):
 
     def __repr__(self):
         return f"<Agent '{self.agent_type}: {self.agent_value}'>"
+
+
+class ExportStatus(enum.Enum):
+    pending = "pending"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+class ExportJob(db.Model):
+    """Report exported to a file by a Celery worker.
+
+    Exports are identified by report name and request parameters. A
+    finished export is reused for later requests with the same parameters
+    until the data it was made from changes (see
+    StorageService.data_version_key).
+    """
+
+    __tablename__ = "export_jobs"
+    __table_args__ = (
+        db.Index("ix_export_jobs_report_params", "report", "params_hash"),
+    )
+    id = db.Column(db.Integer(), primary_key=True)
+    report = db.Column(db.String(64), nullable=False)
+    # Request parameters as canonical JSON, and a hash of them to look
+    # exports up by.
+    params = db.Column(db.Text(), nullable=False)
+    params_hash = db.Column(db.String(64), nullable=False)
+    data_version = db.Column(db.String(40), nullable=False)
+    status = db.Column(db.Enum(ExportStatus), nullable=False)
+    task_id = db.Column(db.String(36))
+    rows_written = db.Column(
+        db.Integer(), nullable=False, default=0, server_default="0"
+    )
+    filename = db.Column(db.String(255), nullable=False)
+    error = db.Column(db.Text())
+    created = db.Column(db.DateTime(), nullable=False)
+    started = db.Column(db.DateTime())
+    finished = db.Column(db.DateTime())
+
+    def __init__(self, report, params, params_hash, data_version, filename):
+        self.report = report
+        self.params = params
+        self.params_hash = params_hash
+        self.data_version = data_version
+        self.filename = filename
+        self.status = ExportStatus.pending
+        self.rows_written = 0
+        self.created = datetime.now()
+
+    def __repr__(self):
+        return f"<Export Job '{self.report}' {self.status.value}>"
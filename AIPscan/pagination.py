@@ -0,0 +1,336 @@
+"""Keyset (seek) pagination.
+
+Offset pagination makes the database read and throw away every row before
+the requested page, so deep pages get progressively slower. Keyset
+pagination instead remembers the sort key of the last row shown and asks
+for the rows that sort after it, which an index on the sort key answers
+directly however deep the page is.
+
+Positions are passed around as opaque cursor tokens, which also carry the
+page number so that listings can still show "page N of M".
+"""
+
+import base64
+import binascii
+import json
+import math
+import time
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import and_
+from sqlalchemy import false
+from sqlalchemy import func
+from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy import true
+
+from AIPscan import db
+
+NEXT = "next"
+PREV = "prev"
+LAST = "last"
+DIRECTIONS = (NEXT, PREV, LAST)
+
+COUNT_CACHE_MAX_ENTRIES = 256
+
+_count_cache = {}
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token can't be decoded."""
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, value):
+    if value is not None and column.type.python_type is datetime:
+        return datetime.fromisoformat(value)
+    return value
+
+
+def encode_cursor(direction, columns, values, page):
+    """Return opaque cursor token for a position in a listing.
+
+    :param direction: NEXT, PREV or LAST (str)
+    :param columns: Columns the listing is ordered by (list)
+    :param values: Values of columns for the row to seek from (list)
+    :param page: Number of the page the cursor leads to (int)
+
+    :returns: Cursor token (str)
+    """
+    data = {"d": direction, "k": [_encode_value(value) for value in values], "p": page}
+    token = base64.urlsafe_b64encode(json.dumps(data).encode("utf-8"))
+    return token.decode("ascii").rstrip("=")
+
+
+def decode_cursor(token, columns):
+    """Decode cursor token created by encode_cursor.
+
+    :param token: Cursor token (str)
+    :param columns: Columns the listing is ordered by (list)
+
+    :returns: Tuple of direction (str), key values (list) and page (int)
+
+    :raises InvalidCursor: if the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        direction, values, page = data["d"], data["k"], int(data["p"])
+        if direction not in DIRECTIONS or page < 1:
+            raise ValueError
+        if direction != LAST and len(values) != len(columns):
+            raise ValueError
+        values = [
+            _decode_value(column, value)
+            for column, value in zip(columns, values, strict=False)
+        ]
+    except (
+        binascii.Error,
+        UnicodeError,
+        KeyError,
+        TypeError,
+        ValueError,
+    ) as err:
+        raise InvalidCursor(f"Invalid cursor: {token}") from err
+
+    return direction, values, page
+
+
+def _beyond(column, value, after=True, inclusive=False):
+    """Return criterion selecting rows whose column sorts after (or before) value.
+
+    NULLs sort before any other value, as they do in MySQL's ascending
+    order, so rows with a NULL in a nullable column aren't skipped.
+    """
+    if value is None:
+        if after:
+            return true() if inclusive else column.is_not(None)
+        return column.is_(None) if inclusive else false()
+
+    if after:
+        return column >= value if inclusive else column > value
+
+    beyond = column <= value if inclusive else column < value
+    if column.expression.nullable:
+        beyond = or_(beyond, column.is_(None))
+    return beyond
+
+
+def _seek_criterion(columns, values, after=True, inclusive=False):
+    """Return criterion selecting rows sorting after (or before) values.
+
+    The criterion is written as "a >= x AND (a > x OR (a = x AND b > y))"
+    rather than as a row value comparison, so that MySQL can answer it
+    with a range scan on an index over the columns. If inclusive, the row
+    with exactly these values is selected too.
+    """
+    alternatives = []
+    last = len(columns) - 1
+    for index, column in enumerate(columns):
+        equal = [columns[previous] == values[previous] for previous in range(index)]
+        beyond = _beyond(column, values[index], after, inclusive and index == last)
+        alternatives.append(and_(*equal, beyond))
+
+    bound = _beyond(columns[0], values[0], after, inclusive=True)
+    return and_(bound, or_(*alternatives))
+
+
+def cached_count(query):
+    """Return number of rows matched by query, caching it for a while.
+
+    Counting every matching row is the slowest part of showing a page of a
+    large listing, and the total barely changes between page views. Counts
+    are cached per process for COUNT_CACHE_SECONDS, so totals may lag
+    behind newly fetched data for that long.
+
+    :param query: SQLAlchemy query
+
+    :returns: Count (int)
+    """
+    statement = select(func.count()).select_from(
+        query.order_by(None).statement.subquery()
+    )
+    compiled = statement.compile(dialect=db.engine.dialect)
+    key = (str(compiled), repr(sorted(compiled.params.items())))
+
+    timeout = current_app.config["COUNT_CACHE_SECONDS"]
+    now = time.monotonic()
+
+    cached = _count_cache.get(key)
+    if cached is not None and now - cached[0] < timeout:
+        return cached[1]
+
+    count = db.session.execute(statement).scalar()
+
+    if len(_count_cache) >= COUNT_CACHE_MAX_ENTRIES:
+        _count_cache.clear()
+    _count_cache[key] = (now, count)
+
+    return count
+
+
+class KeysetPagination:
+    """Page of a query fetched using keyset pagination.
+
+    Has the same attributes as a Flask-SQLAlchemy pager (items, page,
+    per_page, total, pages, prev_num and next_num) plus the cursor tokens
+    leading to the previous, next and last pages.
+
+    Without a cursor, pages other than the first are fetched using an
+    offset, so that links to numbered pages keep working.
+
+    :param query: SQLAlchemy query, without ordering
+    :param columns: Columns, ending with a unique non-nullable one, to
+        order by (list)
+    :param per_page: Number of items per page (int)
+    :param cursor: Cursor token (str or None)
+    :param page: Page number, used if there's no cursor (int)
+    :param total: Total number of items or None to count them (int)
+
+    :raises InvalidCursor: if the cursor token is malformed
+    """
+
+    def __init__(self, query, columns, per_page, cursor=None, page=1, total=None):
+        self.columns = columns
+        self.per_page = per_page
+        self.total = cached_count(query) if total is None else total
+
+        values = None
+        if cursor:
+            direction, values, page = decode_cursor(cursor, columns)
+        else:
+            direction = NEXT
+            page = max(page, 1)
+
+        if direction == LAST:
+            page = max(math.ceil(self.total / per_page), 1)
+
+        ascending = [column.asc() for column in columns]
+        descending = [column.desc() for column in columns]
+
+        if direction == NEXT:
+            offset = 0
+            if values is not None:
+                query = query.filter(_seek_criterion(columns, values))
+            else:
+                offset = (page - 1) * per_page
+            query = query.order_by(*ascending).offset(offset)
+            rows = query.limit(per_page + 1).all()
+            self.has_next = len(rows) > per_page
+            self.has_prev = page > 1
+            items = rows[:per_page]
+        else:
+            if direction == PREV:
+                query = query.filter(_seek_criterion(columns, values, after=False))
+                limit = per_page
+            else:
+                limit = self.total - (page - 1) * per_page or per_page
+            rows = query.order_by(*descending).limit(limit + 1).all()
+            self.has_next = direction == PREV
+            self.has_prev = len(rows) > limit
+            items = list(reversed(rows[:limit]))
+
+        self.items = items
+        self.page = page
+
+    def _key(self, item):
+        return [getattr(item, column.key) for column in self.columns]
+
+    @property
+    def pages(self):
+        if not self.total:
+            return 0
+        return max(math.ceil(self.total / self.per_page), self.page)
+
+    @property
+    def prev_num(self):
+        if not self.has_prev:
+            return None
+        return max(self.page - 1, 1)
+
+    @property
+    def next_num(self):
+        if not self.has_next:
+            return None
+        return self.page + 1
+
+    @property
+    def prev_cursor(self):
+        if not self.has_prev or not self.items:
+            return None
+        return encode_cursor(
+            PREV, self.columns, self._key(self.items[0]), self.prev_num
+        )
+
+    @property
+    def next_cursor(self):
+        if not self.has_next or not self.items:
+            return None
+        return encode_cursor(
+            NEXT, self.columns, self._key(self.items[-1]), self.page + 1
+        )
+
+    @property
+    def last_cursor(self):
+        return encode_cursor(LAST, self.columns, [], max(self.pages, 1))
+
+
+class KeysetWindow:
+    """Bounds of one page of a keyset ordered listing, for streaming.
+
+    Rather than fetching a page of items, this works out the criteria
+    selecting them, which can then be applied to the query, or to a query
+    joining further rows to the items, and streamed from the database.
+
+    :param query: SQLAlchemy query for the items, without ordering
+    :param columns: Columns, ending with a unique non-nullable one, to
+        order by (list)
+    :param cursor: Cursor token for the start of the page (str or None)
+    :param limit: Maximum number of items or None for all of them (int)
+
+    :raises InvalidCursor: if the cursor token is malformed
+    """
+
+    def __init__(self, query, columns, cursor=None, limit=None):
+        self.columns = columns
+        self.criteria = []
+        self.next_cursor = None
+
+        page = 1
+        if cursor:
+            direction, values, page = decode_cursor(cursor, columns)
+            if direction != NEXT:
+                raise InvalidCursor(f"Invalid cursor: {cursor}")
+            self.criteria.append(_seek_criterion(columns, values))
+
+        if limit is None:
+            return
+
+        # Find the last item of the page, reading only the sort key
+        # columns, and whether any item follows it
+        keys = (
+            query.filter(*self.criteria)
+            .with_entities(*columns)
+            .order_by(*[column.asc() for column in columns])
+            .offset(limit - 1)
+            .limit(2)
+            .all()
+        )
+        if len(keys) == 2:
+            last = list(keys[0])
+            self.criteria.append(
+                _seek_criterion(columns, last, after=False, inclusive=True)
+            )
+            self.next_cursor = encode_cursor(NEXT, columns, last, page + 1)
+
+    def apply(self, query):
+        """Return query filtered to the page and ordered by the keyset."""
+        return query.filter(*self.criteria).order_by(
+            *[column.asc() for column in self.columns]
+        )
@@ -0,0 +1,237 @@
+"""SQL query profiling for requests and Celery tasks.
+
+While a request or task runs, every statement executed through
+SQLAlchemy is timed and recorded. When it finishes:
+
+- a structured (JSON) log line summarises the query count, total
+  database time, the slowest statements and the statements repeated
+  most often,
+- statements run at least N_PLUS_ONE_THRESHOLD times with different
+  parameters are reported as N+1 query suspects, and
+- in debug mode, request responses get a Server-Timing header with the
+  database time, which browser developer tools display alongside the
+  request.
+
+Statements taking longer than SLOW_QUERY_THRESHOLD_MS are also logged as
+they finish.
+"""
+
+import contextvars
+import heapq
+import json
+import logging
+import re
+import time
+from contextlib import contextmanager
+
+from flask import current_app
+from flask import request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Number of slowest and most repeated statements reported.
+REPORTED_STATEMENTS = 5
+
+_current_profile = contextvars.ContextVar("query_profile", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\?|:\w+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+def fingerprint(statement):
+    """Return statement with literals and parameters replaced by "?".
+
+    Statements that only differ in their parameters, such as those run
+    in a loop to fetch related rows, share a fingerprint.
+
+    :param statement: SQL statement (str)
+
+    :returns: Fingerprint (str)
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _PLACEHOLDER.sub("?", statement)
+    return _PLACEHOLDER_LIST.sub("(?)", statement)
+
+
+class QueryProfile:
+    """Statements executed during a request or Celery task."""
+
+    def __init__(self, name, slow_query_ms, n_plus_one_threshold):
+        self.name = name
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest = []
+        self.fingerprints = {}
+        self.started = time.perf_counter()
+
+    def record(self, statement, duration_ms):
+        self.count += 1
+        self.total_ms += duration_ms
+
+        item = (duration_ms, self.count, statement)
+        if len(self.slowest) < REPORTED_STATEMENTS:
+            heapq.heappush(self.slowest, item)
+        else:
+            heapq.heappushpop(self.slowest, item)
+
+        stats = self.fingerprints.setdefault(fingerprint(statement), [0, 0.0])
+        stats[0] += 1
+        stats[1] += duration_ms
+
+        if self.slow_query_ms is not None and duration_ms >= self.slow_query_ms:
+            logger.warning(
+                "Slow query in %s (%.1f ms): %s", self.name, duration_ms, statement
+            )
+
+    def repeated(self):
+        """Return fingerprints run more than once, most often first."""
+        repeated = [
+            (statement, count, total_ms)
+            for statement, (count, total_ms) in self.fingerprints.items()
+            if count > 1
+        ]
+        return sorted(repeated, key=lambda item: (-item[1], -item[2]))
+
+    def n_plus_one_suspects(self):
+        """Return fingerprints of SELECTs repeated enough to suggest N+1."""
+        return [
+            statement
+            for statement, count, _ in self.repeated()
+            if count >= self.n_plus_one_threshold
+            and statement.upper().startswith("SELECT")
+        ]
+
+    def summary(self):
+        """Return profile summary (dict)."""
+        return {
+            "name": self.name,
+            "duration_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "query_count": self.count,
+            "query_ms": round(self.total_ms, 1),
+            "slowest": [
+                {"statement": statement, "ms": round(duration_ms, 1)}
+                for duration_ms, _, statement in sorted(self.slowest, reverse=True)
+            ],
+            "repeated": [
+                {"statement": statement, "count": count, "ms": round(total_ms, 1)}
+                for statement, count, total_ms in self.repeated()[:REPORTED_STATEMENTS]
+            ],
+            "n_plus_one_suspects": self.n_plus_one_suspects(),
+        }
+
+    def server_timing(self):
+        """Return Server-Timing header value for the database time."""
+        return f'db;dur={self.total_ms:.1f};desc="{self.count} queries"'
+
+
+def current_profile():
+    """Return profile of the running request or task, if any."""
+    return _current_profile.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    start_times = conn.info.get("query_start_time")
+    if profile is None or not start_times:
+        return
+
+    duration_ms = (time.perf_counter() - start_times.pop()) * 1000
+    profile.record(statement, duration_ms)
+
+
+def _listen_for_queries():
+    # Listen on the Engine class so that every engine the app creates is
+    # covered, however many apps or binds there are.
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+    ):
+        if not event.contains(Engine, name, listener):
+            event.listen(Engine, name, listener)
+
+
+def log_profile(profile):
+    """Log summary of a profile, as a warning if N+1 queries are suspected."""
+    summary = profile.summary()
+    level = logging.WARNING if summary["n_plus_one_suspects"] else logging.INFO
+    logger.log(level, "Query profile: %s", json.dumps(summary))
+
+
+def start_profile(name, app=None):
+    """Start profiling queries, returning a token to pass to stop_profile.
+
+    :param name: Name of the request or task being profiled (str)
+    :param app: Flask app, defaulting to the current one
+
+    :returns: Tuple of QueryProfile and token, or None if profiling is
+        disabled
+    """
+    app = app or current_app
+    if not app.config.get("QUERY_PROFILING"):
+        return None
+
+    profile = QueryProfile(
+        name,
+        app.config.get("SLOW_QUERY_THRESHOLD_MS"),
+        app.config.get("N_PLUS_ONE_THRESHOLD"),
+    )
+    return profile, _current_profile.set(profile)
+
+
+def stop_profile(started):
+    """Stop profiling queries started by start_profile and log the result."""
+    if started is None:
+        return
+
+    profile, token = started
+    _current_profile.reset(token)
+    log_profile(profile)
+
+
+@contextmanager
+def profiled(name, app=None):
+    """Profile queries run within the block."""
+    started = start_profile(name, app)
+    try:
+        yield started[0] if started else None
+    finally:
+        stop_profile(started)
+
+
+def _start_request_profile():
+    request.environ["aipscan.query_profile"] = start_profile(
+        f"{request.method} {request.path}"
+    )
+
+
+def _add_server_timing(response):
+    started = request.environ.get("aipscan.query_profile")
+    # Database timings are only disclosed to developers
+    if started is not None and current_app.debug:
+        response.headers.add("Server-Timing", started[0].server_timing())
+    return response
+
+
+def _stop_request_profile(exc):
+    stop_profile(request.environ.pop("aipscan.query_profile", None))
+
+
+def register_query_profiler(app):
+    _listen_for_queries()
+    app.before_request(_start_request_profile)
+    app.after_request(_add_server_timing)
+    app.teardown_request(_stop_request_profile)
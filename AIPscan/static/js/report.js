@@ -46,52 +46,4 @@ $(document).ready(function () {
     url.search = new URLSearchParams(params).toString();
     window.location.href = url.href;
   });
-
-  // Reload storage locations timeseries report on change to metrics or
-  // cumulative selectors
-  $("#metricSelector").on("change", function () {
-    var metric = $("#metricSelector").val();
-    var cumulative = $("#cumulativeSelector").val();
-    var storageServiceId = $("#storageServiceID").text();
-    var startDate = $("#startDate").text();
-    var endDate = $("#endDate").text();
-
-    var url = new URL(
-      "reporter/storage_locations_usage_over_time",
-      $("body").data("url-root"),
-    );
-    const params = {
-      amss_id: storageServiceId,
-      start_date: startDate,
-      end_date: endDate,
-      metric: metric,
-      cumulative: cumulative,
-    };
-
-    url.search = new URLSearchParams(params).toString();
-    window.location.href = url;
-  });
-
-  $("#cumulativeSelector").on("change", function () {
-    var metric = $("#metricSelector").val();
-    var cumulative = $("#cumulativeSelector").val();
-    var storageServiceId = $("#storageServiceID").text();
-    var startDate = $("#startDate").text();
-    var endDate = $("#endDate").text();
-
-    var url = new URL(
-      "reporter/storage_locations_usage_over_time",
-      $("body").data("url-root"),
-    );
-    const params = {
-      amss_id: storageServiceId,
-      start_date: startDate,
-      end_date: endDate,
-      metric: metric,
-      cumulative: cumulative,
-    };
-
-    url.search = new URLSearchParams(params).toString();
-    window.location.href = url.href;
-  });
 });
@@ -0,0 +1,49 @@
+// Draw the ingest log Gantt chart from its JSON chart data.
+document.addEventListener("DOMContentLoaded", function () {
+  var chart = document.getElementById("ingestChart");
+
+  fetch(chart.dataset.url, { headers: { Accept: "application/json" } })
+    .then(function (response) {
+      if (!response.ok) {
+        throw new Error(response.statusText);
+      }
+      return response.json();
+    })
+    .then(function (data) {
+      document.getElementById("transferCount").textContent =
+        data.transfer_count;
+      if (!data.transfer_count) {
+        throw new Error("No data");
+      }
+
+      // Each ingest is a horizontal bar starting at its start date, with a
+      // length of its duration in milliseconds. Dates are "YYYY-MM-DD
+      // HH:MM:SS" strings, which are made ISO 8601 before parsing.
+      function parseDate(value) {
+        return Date.parse(value.replace(" ", "T"));
+      }
+      var durations = data.Start.map(function (start, index) {
+        return parseDate(data.Finish[index]) - parseDate(start);
+      });
+      var trace = {
+        type: "bar",
+        orientation: "h",
+        base: data.Start,
+        x: durations,
+        y: data.User,
+        customdata: data.Finish,
+        hovertemplate:
+          "Start=%{base}<br>Finish=%{customdata}<br>User=%{y}<extra></extra>",
+      };
+      var layout = {
+        barmode: "overlay",
+        xaxis: { type: "date" },
+        yaxis: { title: { text: "User" }, autorange: "reversed" },
+      };
+
+      Plotly.newPlot(chart, [trace], layout);
+    })
+    .catch(function () {
+      document.getElementById("ingestChartError").classList.remove("d-none");
+    });
+});
@@ -0,0 +1,96 @@
+// Draw the storage locations usage timeseries from its JSON chart data.
+//
+// The data holds differential totals for every metric, so switching metric
+// or between differential and cumulative totals is done here without
+// another request. Changing granularity reloads the page.
+document.addEventListener("DOMContentLoaded", function () {
+  var chart = document.getElementById("usageChart");
+  var metricSelector = document.getElementById("metricSelector");
+  var cumulativeSelector = document.getElementById("cumulativeSelector");
+  var granularitySelector = document.getElementById("granularitySelector");
+
+  var METRICS = {
+    aips: { field: "AIPs", title: "aips", scale: 1 },
+    // Display size in GB
+    size: { field: "Size", title: "size", scale: 1000000 },
+    files: { field: "FileCount", title: "files", scale: 1 },
+  };
+
+  var usage = null;
+
+  function cumulativeSum(values) {
+    var total = 0;
+    return values.map(function (value) {
+      total += value;
+      return total;
+    });
+  }
+
+  function updateLocation() {
+    // Keep the URL in step with the chart so that the CSV download and
+    // reloads reflect what is displayed.
+    var url = new URL(window.location.href);
+    url.searchParams.set("metric", metricSelector.value);
+    url.searchParams.set("cumulative", cumulativeSelector.value);
+    url.searchParams.set("granularity", granularitySelector.value);
+    window.history.replaceState(null, "", url.href);
+  }
+
+  function draw() {
+    var metric = METRICS[metricSelector.value] || METRICS.aips;
+    var cumulative = cumulativeSelector.value === "true";
+    var periods = usage.Periods;
+
+    var traces = usage.Locations.map(function (location) {
+      var values = location[metric.field].map(function (value) {
+        return value / metric.scale;
+      });
+      return {
+        x: periods,
+        y: cumulative ? cumulativeSum(values) : values,
+        name: location.StorageLocation + " (" + location.UUID + ")",
+        type: "scatter",
+        mode: "lines+markers",
+      };
+    });
+
+    var layout = {
+      xaxis: { title: { text: "days" } },
+      yaxis: { title: { text: metric.title } },
+      legend: { title: { text: "location" } },
+    };
+
+    Plotly.react(chart, traces, layout);
+  }
+
+  metricSelector.addEventListener("change", function () {
+    updateLocation();
+    draw();
+  });
+  cumulativeSelector.addEventListener("change", function () {
+    updateLocation();
+    draw();
+  });
+  granularitySelector.addEventListener("change", function () {
+    updateLocation();
+    window.location.reload();
+  });
+
+  fetch(chart.dataset.url, { headers: { Accept: "application/json" } })
+    .then(function (response) {
+      if (!response.ok) {
+        throw new Error(response.statusText);
+      }
+      return response.json();
+    })
+    .then(function (data) {
+      usage = data.LocationsUsageOverTime;
+      if (!data.StorageName || !usage.Locations.length) {
+        throw new Error("No data");
+      }
+      draw();
+    })
+    .catch(function () {
+      document.getElementById("usageChartError").classList.remove("d-none");
+    });
+});
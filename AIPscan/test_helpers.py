@@ -15,10 +15,12 @@ from AIPscan.models import Event
 from AIPscan.models import EventAgent
 from AIPscan.models import FetchJob
 from AIPscan.models import File
+from AIPscan.models import FileFacet
 from AIPscan.models import FileType
 from AIPscan.models import Pipeline
 from AIPscan.models import StorageLocation
 from AIPscan.models import StorageService
+from AIPscan.models import file_facet_counts
 from AIPscan.models import index_tasks
 
 TEST_SHA_256 = "79c16fa9573ec46c5f60fd54b34f314159e0623ca53d8d2f00c5875dbb4e0dfd"
@@ -173,6 +175,18 @@ def create_test_file(**kwargs):
         aip_id=aip_id,
     )
     _add_test_object_to_db(file_)
+
+    # Keep the parent AIP's denormalized file counters and the file facet
+    # catalog in step, as the Aggregator does at ingest.
+    aip = db.session.get(AIP, aip_id)
+    aip.update_file_counts()
+    FileFacet.apply_counts(
+        aip.storage_service_id,
+        aip.storage_location_id,
+        file_facet_counts(File.id == file_.id),
+    )
+    db.session.commit()
+
     return file_
 
 
@@ -0,0 +1,64 @@
+import pytest
+
+from AIPscan.benchmarks import results
+
+
+def _results(scale="10k", **durations):
+    return {
+        "scale": scale,
+        "benchmarks": {
+            name: {"median_seconds": seconds, "queries": 1}
+            for name, seconds in durations.items()
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    "seconds, expected",
+    [(1.0, None), (1.2, None), (1.5, pytest.approx(0.5)), (0.5, None)],
+)
+def test_regression(seconds, expected):
+    assert (
+        results.regression({"median_seconds": 1.0}, {"median_seconds": seconds}, 0.2)
+        == expected
+    )
+
+
+def test_compare():
+    baseline = _results(formats=1.0, aips=2.0, removed=1.0)
+    later = _results(formats=1.1, aips=3.0, added=5.0)
+
+    assert results.compare(baseline, later) == {"aips": pytest.approx(0.5)}
+
+
+def test_compare_different_scales():
+    with pytest.raises(ValueError):
+        results.compare(_results("10k"), _results("100k"))
+
+
+def test_measure(app_instance):
+    calls = []
+
+    def report():
+        calls.append(True)
+        yield from range(3)
+
+    measurements = results.measure("report", report, rounds=2)
+
+    assert len(calls) == 3
+    assert measurements["rounds"] == 2
+    assert measurements["queries"] == 0
+    assert measurements["median_seconds"] >= 0
+    assert measurements["peak_memory_bytes"] >= 0
+
+
+def test_main(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    later = tmp_path / "results.json"
+    results.save(baseline, _results(formats=1.0))
+    results.save(later, _results(formats=2.0))
+
+    assert results.main([str(baseline), str(later)]) == 1
+    assert "Regression: formats is 100% slower" in capsys.readouterr().err
+
+    assert results.main([str(baseline), str(baseline)]) == 0
@@ -1,5 +1,10 @@
 """Tests for custom Flask CLI commands."""
 
+from AIPscan import db
+from AIPscan import test_helpers
+from AIPscan.models import FacetType
+from AIPscan.models import FileFacet
+from AIPscan.models import FileType
 from AIPscan.models import StorageService
 
 
@@ -113,3 +118,50 @@ def test_storage_service_bootstrap_updates_existing_credentials(app_instance):
     assert storage_service.url == "https://storage.example.com"
     assert storage_service.user_name == "demo2"
     assert storage_service.api_key == "xyz789"
+
+
+def test_backfill_aip_file_counts(app_instance):
+    aip = test_helpers.create_test_aip()
+    test_helpers.create_test_file(aip_id=aip.id, size=100)
+    test_helpers.create_test_file(aip_id=aip.id, size=250)
+    test_helpers.create_test_file(
+        aip_id=aip.id, size=1000, file_type=FileType.preservation
+    )
+
+    # Simulate an AIP ingested before the counters existed.
+    aip.original_file_count = 0
+    aip.preservation_file_count = 0
+    db.session.commit()
+
+    runner = app_instance.test_cli_runner()
+    result = runner.invoke(args=["backfill-aip-file-counts", "--batch-size", "1"])
+
+    assert result.exit_code == 0
+    assert "Updated file counts for 1 AIPs." in result.output
+
+    db.session.refresh(aip)
+    assert aip.original_file_count == 2
+    assert aip.preservation_file_count == 1
+
+
+def test_rebuild_file_facets(app_instance):
+    aip = test_helpers.create_test_aip()
+    test_helpers.create_test_file(aip_id=aip.id, puid="fmt/10", file_format="TIFF")
+    test_helpers.create_test_file(aip_id=aip.id, puid="fmt/9", file_format="TIFF")
+
+    # Simulate files ingested before the catalog existed.
+    FileFacet.query.delete()
+    db.session.commit()
+
+    runner = app_instance.test_cli_runner()
+    result = runner.invoke(args=["rebuild-file-facets"])
+
+    assert result.exit_code == 0
+    assert "Rebuilt file facets for 1 storage locations." in result.output
+
+    facets = FileFacet.all_values(storage_service_id=aip.storage_service_id)
+    assert facets[(FileType.original, FacetType.file_format)] == [("TIFF", 2)]
+    assert facets[(FileType.original, FacetType.puid)] == [
+        ("fmt/9", 1),
+        ("fmt/10", 1),
+    ]
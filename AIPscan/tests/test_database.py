@@ -0,0 +1,110 @@
+import time
+
+import pytest
+import sqlalchemy as sa
+from flask import session
+
+from AIPscan import create_app
+from AIPscan import database
+from AIPscan import db
+from AIPscan import test_helpers
+from AIPscan.celery import configure_celery
+from AIPscan.config import TestConfig
+from AIPscan.models import AIP
+from AIPscan.models import Pipeline
+
+
+@pytest.fixture
+def read_only_app(app_setup, mocker):
+    mocker.patch.object(
+        TestConfig,
+        "SQLALCHEMY_BINDS",
+        {database.READ_ONLY_BIND: TestConfig.SQLALCHEMY_DATABASE_URI},
+    )
+    app = create_app("test")
+    # Bind tasks to the test app again
+    configure_celery(app_setup)
+
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+def test_routing_session(read_only_app):
+    read_only_engine = db.engines[database.READ_ONLY_BIND]
+    select = sa.select(AIP)
+    update = sa.update(AIP).values(transfer_name="renamed")
+
+    assert db.session.get_bind(clause=select) is db.engine
+    with database.read_only():
+        assert db.session.get_bind(clause=select) is read_only_engine
+        assert db.session.get_bind(clause=update) is db.engine
+    assert db.session.get_bind(clause=select) is db.engine
+
+
+def test_routing_session_without_read_only_engine(app_instance):
+    with database.read_only():
+        assert db.session.get_bind(clause=sa.select(AIP)) is db.engine
+
+
+def test_dispose_engines(read_only_app):
+    pools = [engine.pool for engine in db.engines.values()]
+
+    database.dispose_engines(read_only_app)
+
+    for engine, pool in zip(db.engines.values(), pools, strict=True):
+        assert engine.pool is not pool
+
+
+@pytest.mark.parametrize(
+    "method, path, read_only",
+    [
+        ("GET", "/reporter/aips/", True),
+        ("GET", "/api/swagger.json", True),
+        ("POST", "/reporter/update_dates/", False),
+        ("GET", "/aggregator/storage_services", False),
+    ],
+)
+def test_request_routing(read_only_app, method, path, read_only):
+    expected = db.engines[database.READ_ONLY_BIND] if read_only else db.engine
+
+    with read_only_app.test_request_context(path, method=method):
+        database._start_request_routing()
+        assert db.session.get_bind(clause=sa.select(AIP)) is expected
+        database._stop_request_routing(None)
+
+    assert db.session.get_bind(clause=sa.select(AIP)) is db.engine
+
+
+def test_request_routing_after_write(read_only_app):
+    with read_only_app.test_request_context("/aggregator/storage_services"):
+        db.session.execute(
+            sa.update(Pipeline).where(Pipeline.id == -1).values(dashboard_url="")
+        )
+        db.session.rollback()
+        primary_until = session[database.PRIMARY_UNTIL_KEY]
+
+    assert primary_until > time.time()
+
+    with read_only_app.test_request_context("/reporter/aips/"):
+        session[database.PRIMARY_UNTIL_KEY] = primary_until
+        database._start_request_routing()
+        assert db.session.get_bind(clause=sa.select(AIP)) is db.engine
+        database._stop_request_routing(None)
+
+
+def test_request_routing_after_write_task(read_only_app, mocker):
+    mocker.patch("AIPscan.Aggregator.tasks.delete_fetch_job.delay")
+    fetch_job = test_helpers.create_test_fetch_job()
+
+    with read_only_app.test_client() as client:
+        response = client.get(f"/aggregator/delete_fetch_job/{fetch_job.id}?confirm=1")
+        assert response.status_code == 302
+        with client.session_transaction() as session_:
+            primary_until = session_[database.PRIMARY_UNTIL_KEY]
+
+    with read_only_app.test_request_context("/reporter/aips/"):
+        session[database.PRIMARY_UNTIL_KEY] = primary_until
+        database._start_request_routing()
+        assert db.session.get_bind(clause=sa.select(AIP)) is db.engine
+        database._stop_request_routing(None)
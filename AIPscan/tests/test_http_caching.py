@@ -0,0 +1,86 @@
+"""This module tests answering conditional requests."""
+
+from datetime import datetime
+
+import pytest
+from flask import current_app
+
+from AIPscan import db
+from AIPscan import test_helpers
+from AIPscan.models import StorageService
+
+LAST_FETCH = datetime(2021, 3, 4, 5, 6, 7)
+
+
+@pytest.fixture
+def storage_service(app_instance):
+    storage_service = test_helpers.create_test_storage_service()
+    test_helpers.create_test_fetch_job(
+        storage_service_id=storage_service.id, download_end=LAST_FETCH
+    )
+    return storage_service
+
+
+def test_not_modified(storage_service):
+    with current_app.test_client() as test_client:
+        response = test_client.get("/reporter/aips/")
+        assert response.status_code == 200
+        assert response.headers["ETag"].startswith('W/"')
+        assert "Last-Modified" not in response.headers
+        assert response.cache_control.no_cache
+        assert "Accept" in response.vary
+
+        etag = response.headers["ETag"]
+
+        response = test_client.get("/reporter/aips/", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert not response.data
+
+        # Dates can't tell whether reported data has changed
+        response = test_client.get(
+            "/reporter/aips/",
+            headers={"If-Modified-Since": "Wed, 21 Oct 2099 07:28:00 GMT"},
+        )
+        assert response.status_code == 200
+
+        # Other pages have their own ETags
+        response = test_client.get(
+            "/reporter/aips/?query=test", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+
+def test_modified_when_data_version_changes(storage_service):
+    with current_app.test_client() as test_client:
+        response = test_client.get("/reporter/aips/")
+        etag = response.headers["ETag"]
+
+        StorageService.bump_data_version(storage_service.id)
+        db.session.commit()
+
+        response = test_client.get("/reporter/aips/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+
+def test_etag_depends_on_response_format(storage_service):
+    url = f"/api/data/aip-list/{storage_service.id}"
+
+    with current_app.test_client() as test_client:
+        json_response = test_client.get(url)
+        ndjson_response = test_client.get(
+            url, headers={"Accept": "application/x-ndjson"}
+        )
+
+        assert json_response.status_code == 200
+        assert ndjson_response.status_code == 200
+        assert json_response.headers["ETag"] != ndjson_response.headers["ETag"]
+
+
+def test_uncached_blueprints(storage_service):
+    with current_app.test_client() as test_client:
+        response = test_client.get("/aggregator/storage_services")
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
@@ -0,0 +1,60 @@
+"""This module tests recording metrics and serving them at /metrics."""
+
+import pytest
+from flask import current_app
+
+from AIPscan import metrics
+
+EXPECTED_METRICS = """# HELP aipscan_test_seconds Test histogram.
+# TYPE aipscan_test_seconds histogram
+aipscan_test_seconds_bucket{stage="download",le="0.5"} 1
+aipscan_test_seconds_bucket{stage="download",le="1.0"} 2
+aipscan_test_seconds_bucket{stage="download",le="+Inf"} 3
+aipscan_test_seconds_sum{stage="download"} 7.25
+aipscan_test_seconds_count{stage="download"} 3
+"""
+
+
+@pytest.fixture
+def histogram(app_instance):
+    histogram = metrics.Histogram(
+        "aipscan_test_seconds", "Test histogram.", [1, 0.5], labelnames=("stage",)
+    )
+    yield histogram
+    del metrics.REGISTRY[histogram.name]
+
+
+def _observe(histogram):
+    for value in (0.25, 1, 6):
+        histogram.observe(value, stage="download")
+
+
+def test_generate_latest(histogram, monkeypatch):
+    monkeypatch.setattr(metrics, "REGISTRY", {histogram.name: histogram})
+    _observe(histogram)
+
+    assert metrics.generate_latest() == EXPECTED_METRICS
+
+
+def test_metrics_from_processes_are_added_up(histogram, monkeypatch, tmp_path, mocker):
+    monkeypatch.setattr(metrics, "REGISTRY", {histogram.name: histogram})
+    monkeypatch.setitem(current_app.config, "METRICS_DIR", str(tmp_path))
+
+    # Each process writes its own file
+    for pid in (100, 101):
+        mocker.patch("AIPscan.metrics.os.getpid", return_value=pid)
+        histogram.clear()
+        _observe(histogram)
+        metrics.flush()
+
+    assert len(list(tmp_path.iterdir())) == 2
+
+    with current_app.test_client() as test_client:
+        response = test_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.content_type == metrics.CONTENT_TYPE
+    assert 'aipscan_test_seconds_bucket{stage="download",le="+Inf"} 6' in (
+        response.text
+    )
+    assert 'aipscan_test_seconds_sum{stage="download"} 14.5' in response.text
@@ -15,8 +15,14 @@ from AIPscan.conftest import STORAGE_LOCATION_1_CURRENT_LOCATION
 from AIPscan.conftest import STORAGE_LOCATION_2_CURRENT_LOCATION
 from AIPscan.conftest import TIFF_PUID
 from AIPscan.helpers import parse_datetime_bound
+from AIPscan.models import FacetType
+from AIPscan.models import File
+from AIPscan.models import FileFacet
+from AIPscan.models import FileType
+from AIPscan.models import Format
 from AIPscan.models import StorageLocation
 from AIPscan.models import StorageService
+from AIPscan.models import file_facet_counts
 
 VALID_UUID = "3ce6fbcb-cdfc-4cca-97e4-d19a469ca043"
 VALID_CURRENT_LOCATION = f"/api/v2/location/{VALID_UUID}/"
@@ -302,3 +308,100 @@ def test_pipeline_uuid(app_instance, origin_pipeline, expected_uuid):
     """Test Storage Location uuid property."""
     pipeline = test_helpers.create_test_pipeline(origin_pipeline=origin_pipeline)
     assert pipeline.uuid == expected_uuid
+
+
+def test_file_facet_apply_counts(storage_locations):
+    """Test that facet counts follow AIPs being added and removed."""
+    storage_location = StorageLocation.query.filter_by(
+        current_location=STORAGE_LOCATION_1_CURRENT_LOCATION
+    ).first()
+    storage_service_id = storage_location.storage_service_id
+
+    facets = FileFacet.all_values(storage_location_id=storage_location.id)
+    assert facets[(FileType.original, FacetType.puid)] == [
+        (JPEG_1_01_PUID, 1),
+        (JPEG_1_02_PUID, 1),
+        ("fmt/test-1", 1),
+    ]
+
+    # Subtracting the counts of every file in the location empties it.
+    counts = file_facet_counts(
+        File.aip_id.in_([aip.id for aip in storage_location.aips])
+    )
+    FileFacet.apply_counts(storage_service_id, storage_location.id, counts, sign=-1)
+    db.session.commit()
+
+    assert FileFacet.all_values(storage_location_id=storage_location.id) == {}
+    assert storage_location.unique_original_puids == []
+
+    # Adding them back restores the facets, sorted among the values of the
+    # whole Storage Service.
+    FileFacet.apply_counts(storage_service_id, storage_location.id, counts)
+    db.session.commit()
+
+    assert storage_location.unique_original_puids == [
+        JPEG_1_01_PUID,
+        JPEG_1_02_PUID,
+        "fmt/test-1",
+    ]
+    assert storage_location.unique_preservation_puids == [TIFF_PUID]
+
+
+def test_file_facet_apply_counts_in_place(storage_locations):
+    """Test that counts are added to and subtracted from existing facets."""
+    storage_location = StorageLocation.query.filter_by(
+        current_location=STORAGE_LOCATION_1_CURRENT_LOCATION
+    ).first()
+    storage_service_id = storage_location.storage_service_id
+
+    def apply_counts(value, count, sign=1):
+        FileFacet.apply_counts(
+            storage_service_id,
+            storage_location.id,
+            {(FileType.original, FacetType.puid, value): count},
+            sign=sign,
+        )
+        db.session.commit()
+
+    def file_count(value):
+        facets = FileFacet.all_values(storage_location_id=storage_location.id)
+        return dict(facets[(FileType.original, FacetType.puid)]).get(value)
+
+    apply_counts("fmt/new", 2)
+    apply_counts("FMT/NEW", 2)
+    assert file_count("fmt/new") == 4
+
+    apply_counts("fmt/new", 3, sign=-1)
+    assert file_count("fmt/new") == 1
+
+    apply_counts("fmt/new", 1, sign=-1)
+    assert file_count("fmt/new") is None
+    assert file_count(JPEG_1_01_PUID) == 1
+
+
+def test_format_id_for(app_instance):
+    """Test that formats are added once and their IDs cached."""
+    format_id = Format.id_for(JPEG_1_01_PUID, "JPEG", "1.01")
+
+    assert Format.id_for(JPEG_1_01_PUID, "JPEG", "1.01") == format_id
+    assert Format.id_for(JPEG_1_02_PUID, "JPEG", "1.02") != format_id
+    assert Format.id_for(None, None, None) not in (format_id, None)
+
+    # IDs of formats added by another process are read from the database.
+    Format.id_cache.clear()
+    assert Format.id_for(JPEG_1_01_PUID, "JPEG", "1.01") == format_id
+    assert Format.query.count() == 3
+
+
+def test_file_format_id(app_instance):
+    """Test that files created without a format ID are given one."""
+    file_ = test_helpers.create_test_file(
+        puid=JPEG_1_01_PUID, file_format="JPEG", format_version="1.01"
+    )
+
+    format_ = db.session.get(Format, file_.format_id)
+    assert (format_.puid, format_.name, format_.version) == (
+        JPEG_1_01_PUID,
+        "JPEG",
+        "1.01",
+    )
@@ -0,0 +1,160 @@
+"""This module tests keyset pagination."""
+
+from datetime import datetime
+
+import pytest
+
+from AIPscan import test_helpers
+from AIPscan.models import AIP
+from AIPscan.pagination import InvalidCursor
+from AIPscan.pagination import KeysetPagination
+from AIPscan.pagination import KeysetWindow
+from AIPscan.pagination import decode_cursor
+from AIPscan.pagination import encode_cursor
+
+COLUMNS = [AIP.create_date, AIP.id]
+
+
+@pytest.fixture
+def aips(app_instance):
+    """Create seven AIPs, some of them sharing a creation date."""
+    storage_service = test_helpers.create_test_storage_service()
+    storage_location = test_helpers.create_test_storage_location(
+        storage_service_id=storage_service.id
+    )
+    create_dates = [
+        datetime(2021, 1, 1),
+        datetime(2020, 1, 1),
+        datetime(2020, 1, 1),
+        datetime(2022, 1, 1),
+        datetime(2020, 1, 1),
+        datetime(2023, 1, 1),
+        datetime(2021, 1, 1),
+    ]
+    created = [
+        test_helpers.create_test_aip(
+            create_date=create_date,
+            storage_service_id=storage_service.id,
+            storage_location_id=storage_location.id,
+        )
+        for create_date in create_dates
+    ]
+
+    return sorted(created, key=lambda aip: (aip.create_date, aip.id))
+
+
+def test_keyset_pagination_forwards_and_backwards(aips):
+    query = AIP.query
+
+    first = KeysetPagination(query, COLUMNS, 3)
+    assert first.items == aips[0:3]
+    assert (first.page, first.pages, first.total) == (1, 3, 7)
+    assert first.prev_num is None
+    assert first.prev_cursor is None
+    assert first.next_num == 2
+
+    second = KeysetPagination(query, COLUMNS, 3, cursor=first.next_cursor)
+    assert second.items == aips[3:6]
+    assert second.page == 2
+    assert second.prev_num == 1
+    assert second.next_num == 3
+
+    third = KeysetPagination(query, COLUMNS, 3, cursor=second.next_cursor)
+    assert third.items == aips[6:]
+    assert third.page == 3
+    assert third.next_num is None
+    assert third.next_cursor is None
+
+    back = KeysetPagination(query, COLUMNS, 3, cursor=third.prev_cursor)
+    assert back.items == aips[3:6]
+    assert back.page == 2
+
+    back = KeysetPagination(query, COLUMNS, 3, cursor=back.prev_cursor)
+    assert back.items == aips[0:3]
+    assert back.page == 1
+    assert back.prev_num is None
+
+
+def test_keyset_pagination_last_and_numbered_pages(aips):
+    query = AIP.query
+
+    last = KeysetPagination(
+        query, COLUMNS, 3, cursor=KeysetPagination(query, COLUMNS, 3).last_cursor
+    )
+    assert last.items == aips[6:]
+    assert last.page == 3
+    assert last.prev_num == 2
+    assert last.next_num is None
+
+    numbered = KeysetPagination(query, COLUMNS, 3, page=2)
+    assert numbered.items == aips[3:6]
+    assert numbered.prev_num == 1
+    assert numbered.next_num == 3
+
+
+def test_keyset_pagination_known_total(aips):
+    pager = KeysetPagination(AIP.query, COLUMNS, 5, total=100)
+
+    assert pager.total == 100
+    assert pager.pages == 20
+    assert len(pager.items) == 5
+
+
+def test_keyset_pagination_null_sort_values(app_instance):
+    storage_service = test_helpers.create_test_storage_service()
+    storage_location = test_helpers.create_test_storage_location(
+        storage_service_id=storage_service.id
+    )
+    create_dates = [datetime(2021, 1, 1), None, datetime(2020, 1, 1), None, None]
+    created = [
+        test_helpers.create_test_aip(
+            create_date=create_date,
+            storage_service_id=storage_service.id,
+            storage_location_id=storage_location.id,
+        )
+        for create_date in create_dates
+    ]
+
+    # AIPs without a creation date sort first
+    expected = sorted(
+        created,
+        key=lambda aip: (aip.create_date is not None, aip.create_date or 0, aip.id),
+    )
+
+    first = KeysetPagination(AIP.query, COLUMNS, 2)
+    second = KeysetPagination(AIP.query, COLUMNS, 2, cursor=first.next_cursor)
+    third = KeysetPagination(AIP.query, COLUMNS, 2, cursor=second.next_cursor)
+    assert first.items + second.items + third.items == expected
+
+    back = KeysetPagination(AIP.query, COLUMNS, 2, cursor=third.prev_cursor)
+    assert back.items == expected[2:4]
+    back = KeysetPagination(AIP.query, COLUMNS, 2, cursor=back.prev_cursor)
+    assert back.items == expected[0:2]
+
+    window = KeysetWindow(AIP.query, COLUMNS, limit=2)
+    assert window.apply(AIP.query).all() == expected[0:2]
+    window = KeysetWindow(AIP.query, COLUMNS, window.next_cursor, limit=2)
+    assert window.apply(AIP.query).all() == expected[2:4]
+
+
+def test_cursor_round_trip():
+    values = [datetime(2020, 5, 17, 10, 30), 42]
+    token = encode_cursor("next", COLUMNS, values, 3)
+
+    assert "=" not in token
+    assert decode_cursor(token, COLUMNS) == ("next", values, 3)
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not a cursor",
+        encode_cursor("sideways", COLUMNS, [None, 1], 2),
+        encode_cursor("next", COLUMNS, [1], 2),
+        encode_cursor("next", COLUMNS, ["2020-01-01", 1], 0),
+        encode_cursor("next", COLUMNS, ["not a date", 1], 2),
+    ],
+)
+def test_decode_invalid_cursor(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, COLUMNS)
@@ -0,0 +1,99 @@
+"""This module tests profiling the queries of requests and tasks."""
+
+import json
+import logging
+
+import pytest
+from flask import current_app
+
+from AIPscan import db
+from AIPscan import query_profiler
+from AIPscan import test_helpers
+from AIPscan.models import AIP
+
+
+@pytest.mark.parametrize(
+    "statement, expected",
+    [
+        (
+            "SELECT aip.id FROM aip\n  WHERE aip.id = %(pk_1)s",
+            "SELECT aip.id FROM aip WHERE aip.id = ?",
+        ),
+        (
+            "SELECT file.id FROM file WHERE file.aip_id IN (%s, %s, %s)",
+            "SELECT file.id FROM file WHERE file.aip_id IN (?)",
+        ),
+        (
+            "SELECT aip.id FROM aip WHERE aip.uuid = 'abc' LIMIT 10",
+            "SELECT aip.id FROM aip WHERE aip.uuid = ? LIMIT ?",
+        ),
+    ],
+)
+def test_fingerprint(statement, expected):
+    assert query_profiler.fingerprint(statement) == expected
+
+
+def test_profiled_detects_n_plus_one(app_instance, monkeypatch, caplog):
+    monkeypatch.setitem(current_app.config, "N_PLUS_ONE_THRESHOLD", 3)
+    aip_ids = [test_helpers.create_test_aip().id for _ in range(3)]
+    db.session.expunge_all()
+
+    with caplog.at_level(logging.INFO, logger=query_profiler.logger.name):
+        with query_profiler.profiled("test") as profile:
+            for aip_id in aip_ids:
+                db.session.get(AIP, aip_id)
+
+    assert profile.count == 3
+    assert query_profiler.current_profile() is None
+
+    suspects = profile.n_plus_one_suspects()
+    assert len(suspects) == 1
+    assert suspects[0].startswith("SELECT")
+    assert "aip.id = ?" in suspects[0]
+
+    record = caplog.records[-1]
+    assert record.levelno == logging.WARNING
+    summary = json.loads(record.getMessage().split(": ", 1)[1])
+    assert summary["name"] == "test"
+    assert summary["query_count"] == 3
+    assert summary["n_plus_one_suspects"] == suspects
+
+
+def test_slow_query_log(app_instance, monkeypatch, caplog):
+    monkeypatch.setitem(current_app.config, "SLOW_QUERY_THRESHOLD_MS", 0)
+
+    with caplog.at_level(logging.WARNING, logger=query_profiler.logger.name):
+        with query_profiler.profiled("test"):
+            db.session.execute(db.text("SELECT 1"))
+
+    assert any(
+        record.getMessage().startswith("Slow query in test")
+        for record in caplog.records
+    )
+
+
+def test_server_timing_header(app_instance, monkeypatch):
+    with current_app.test_client() as test_client:
+        response = test_client.get("/reporter/aips/")
+
+    assert "Server-Timing" not in response.headers
+
+    monkeypatch.setitem(current_app.config, "DEBUG", True)
+    with current_app.test_client() as test_client:
+        response = test_client.get("/reporter/aips/")
+
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+
+def test_profiling_disabled(app_instance, monkeypatch):
+    monkeypatch.setitem(current_app.config, "QUERY_PROFILING", False)
+
+    with query_profiler.profiled("test") as profile:
+        db.session.execute(db.text("SELECT 1"))
+
+    assert profile is None
+
+    with current_app.test_client() as test_client:
+        response = test_client.get("/reporter/aips/")
+
+    assert "Server-Timing" not in response.headers
@@ -7,6 +7,7 @@ import typesense
 from AIPscan import test_helpers
 from AIPscan import typesense_helpers as ts_helpers
 from AIPscan import typesense_test_helpers
+from AIPscan.models import AIP
 from AIPscan.models import File
 from AIPscan.models import Pipeline
 
@@ -156,6 +157,29 @@ def test_collection_fields_from_model():
     assert ts_helpers.collection_fields_from_model(Pipeline) == pipeline_fields
 
 
+def test_collection_fields_from_file_model():
+    fields = ts_helpers.collection_fields_from_model(File)
+    names = [field["name"] for field in fields]
+
+    assert len(names) == len(set(names))
+    assert {
+        "name": "storage_location_id",
+        "type": "int32",
+        "facet": True,
+        "optional": True,
+    } in fields
+
+
+def test_collection_fields_from_aip_model():
+    fields = {
+        field["name"]: field["type"]
+        for field in ts_helpers.collection_fields_from_model(AIP)
+    }
+
+    assert fields["size"] == "int64"
+    assert fields["original_file_count"] == "int32"
+
+
 def test_initialize_index(app_instance, enable_typesense, mocker):
     class FakeCollections:
         def create(self):
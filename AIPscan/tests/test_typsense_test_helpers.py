@@ -10,6 +10,14 @@ def test_fake_documents():
     assert fake_documents.search({}) == FAKE_RESULTS
 
 
+def test_fake_documents_export():
+    fake_documents = typesense_test_helpers.FakeDocuments(
+        {"hits": [{"document": {"id": "1"}}, {"document": {"id": "2"}}]}
+    )
+
+    assert fake_documents.export({}) == '{"id": "1"}\n{"id": "2"}'
+
+
 def test_fake_collection():
     fake_collection = typesense_test_helpers.FakeCollection(FAKE_RESULTS)
 
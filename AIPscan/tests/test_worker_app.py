@@ -0,0 +1,21 @@
+from AIPscan import create_worker_app
+from AIPscan.benchmarks import startup
+from AIPscan.celery import configure_celery
+
+
+def test_create_worker_app(app_setup):
+    app = create_worker_app("test")
+    # Bind tasks to the test app again
+    configure_celery(app_setup)
+
+    assert app.blueprints == {}
+    assert "sqlalchemy" in app.extensions
+    assert app.config["TESTING"]
+
+
+def test_create_worker_app_skips_heavy_imports():
+    modules = set(startup.start("create_worker_app")["modules"])
+
+    assert "AIPscan.Aggregator.tasks" in modules
+    assert "AIPscan.Reporter.views" not in modules
+    assert modules.isdisjoint(startup.HEAVY_MODULES)
@@ -1,20 +1,47 @@
 import datetime
+import json
 import math
 
-import typesense
 from flask import current_app
+from sqlalchemy import BigInteger
+from sqlalchemy import and_
 from sqlalchemy import inspect
 
+from AIPscan import db
 from AIPscan.models import AIP
+from AIPscan.models import Agent
+from AIPscan.models import Event
+from AIPscan.models import EventAgent
 from AIPscan.models import File
 from AIPscan.models import FileType
 
 APP_MODELS = [AIP, File]
 
 FACET_FIELDS = {
-    "file": ["file_format", "file_type", "puid", "aip_id", "size", "aip_create_date"]
+    "aip": ["storage_location_id"],
+    "file": [
+        "file_format",
+        "file_type",
+        "puid",
+        "aip_id",
+        "size",
+        "storage_location_id",
+        "aip_create_date",
+    ],
 }
 
+# Upper limit on the number of values returned for a facet
+MAX_FACET_VALUES = 10000
+
+# Number of searches sent to Typesense per multi-search request
+MULTI_SEARCH_BATCH_SIZE = 50
+
+# Number of IDs looked up per document export
+ID_FILTER_BATCH_SIZE = 1000
+
+INGESTION_EVENT_TYPE = "ingestion"
+INGESTION_AGENT_TYPE = "Archivematica user"
+
 AIP_FIELDS_TO_CACHE = {
     "storage_service_id": None,
     "storage_location_id": None,
@@ -29,6 +56,9 @@ def typesense_enabled():
 
 
 def client():
+    # Imported here so that only processes using Typesense pay for it.
+    import typesense
+
     config = current_app.config
     return typesense.Client(
         {
@@ -58,6 +88,76 @@ def collection_prefix(collection):
     return current_app.config["TYPESENSE_COLLECTION_PREFIX"] + collection
 
 
+def multi_search(searches, ts_client=None):
+    """Perform searches, returning a list of their results in order.
+
+    :param searches: Search parameters, including collection (list of dicts)
+
+    :returns: Search results (list of dicts)
+    """
+    if ts_client is None:
+        ts_client = client()
+
+    results = []
+    for start in range(0, len(searches), MULTI_SEARCH_BATCH_SIZE):
+        batch = searches[start : start + MULTI_SEARCH_BATCH_SIZE]
+        response = ts_client.multi_search.perform(
+            {"searches": batch}, {"limit_multi_searches": len(batch)}
+        )
+        results.extend(response["results"])
+
+    return results
+
+
+def export_documents(collection, filter_by, include_fields, ts_client=None):
+    """Yield every document in a collection that matches a filter.
+
+    Exporting returns all matching documents in one response, rather than
+    having to page through search results.
+
+    :param collection: Collection name, without prefix (str)
+    :param filter_by: Typesense filter (str)
+    :param include_fields: Comma separated document fields to return (str)
+
+    :returns: Generator of documents (dicts)
+    """
+    if ts_client is None:
+        ts_client = client()
+
+    export = ts_client.collections[collection_prefix(collection)].documents.export(
+        {"filter_by": filter_by, "include_fields": include_fields}
+    )
+
+    for line in export.splitlines():
+        if line:
+            yield json.loads(line)
+
+
+def documents_by_id(collection, ids, include_fields, ts_client=None):
+    """Return documents with the given IDs.
+
+    :param collection: Collection name, without prefix (str)
+    :param ids: Document IDs (iterable of ints)
+    :param include_fields: Comma separated document fields to return (str)
+
+    :returns: Documents keyed by ID (dict)
+    """
+    if ts_client is None:
+        ts_client = client()
+
+    documents = {}
+    ids = sorted(ids)
+    for start in range(0, len(ids), ID_FILTER_BATCH_SIZE):
+        batch = ids[start : start + ID_FILTER_BATCH_SIZE]
+        filter_by = f"id:[{','.join(str(id_) for id_ in batch)}]"
+        for document in export_documents(
+            collection, filter_by, include_fields, ts_client
+        ):
+            documents[int(document["id"])] = document
+
+    return documents
+
+
 EPOCH_UTC = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
 
 
@@ -95,7 +195,13 @@ def assemble_filter_by(filters):
     return filter_by
 
 
-def file_filters(storage_service_id, storage_location_id, start_date, end_date):
+def file_filters(
+    storage_service_id,
+    storage_location_id,
+    start_date,
+    end_date,
+    file_type=FileType.original,
+):
     start_timestamp = datetime_to_timestamp_int(start_date)
     end_timestamp = datetime_to_timestamp_int(end_date)
 
@@ -103,15 +209,27 @@ def file_filters(storage_service_id, storage_location_id, start_date, end_date):
         ("aip_create_date", ">=", start_timestamp),
         ("aip_create_date", "<", end_timestamp),
         ("storage_service_id", "=", storage_service_id),
-        ("file_type", "=", "'original'"),
     ]
 
+    # Files of all types are included if file_type is None
+    if file_type is not None:
+        filters.append(("file_type", "=", f"'{file_type.value}'"))
+
     if storage_location_id is not None and storage_location_id != "":
         filters.append(("storage_location_id", "=", storage_location_id))
 
     return filters
 
 
+def facet_stats_sum(result, field_name):
+    """Return sum of a numeric facet's values from search results."""
+    for facet_count in result.get("facet_counts", []):
+        if facet_count["field_name"] == field_name:
+            return facet_count.get("stats", {}).get("sum", 0)
+
+    return 0
+
+
 def facet_value_counts(result, field_name=None):
     facet_value_counts = {}
 
@@ -161,8 +279,8 @@ def collection_fields_from_model(model):
                 datetime.datetime: "int64",
             }
 
-            # Use larger number type for size data
-            if c.name == "size":
+            # Use larger number type for BIGINT columns, such as sizes
+            if isinstance(c.type, BigInteger):
                 ts_types[int] = "int64"
 
             if py_type not in ts_types:
@@ -181,15 +299,14 @@ def collection_fields_from_model(model):
 
         fields.append(field)
 
-    # AIP collection documents will be augmented with related data
+    # AIP collection documents will be augmented with ingestion data
     if table == "aip":
-        fields.append({"name": "original_file_count", "type": "int32"})
+        fields.append({"name": "ingestion_date", "type": "int64", "optional": True})
+        fields.append({"name": "ingestion_agent", "type": "string", "optional": True})
 
-    # File collection documents will be augmented with related data
+    # File collection documents will be augmented with related data. The
+    # storage and date columns copied from the AIP are model columns.
     if table == "file":
-        fields.append({"name": "storage_service_id", "type": "int32"})
-        fields.append({"name": "storage_location_id", "type": "int32"})
-        fields.append({"name": "aip_create_date", "type": "int64", "facet": True})
         fields.append({"name": "transfer_name", "type": "string"})
         fields.append({"name": "aip_uuid", "type": "string"})
 
@@ -197,6 +314,8 @@ def collection_fields_from_model(model):
 
 
 def initialize_index():
+    import typesense
+
     ts_client = client()
 
     # Create Typesense collections containing data for each model
@@ -258,6 +377,53 @@ def augment_file_document_with_aip_data(table, document, aip_cache, result):
     document["aip_create_date"] = int(dt.strftime("%s"))
 
 
+def aip_ingestion_cache():
+    """Return date and agent of each AIP's ingestion, keyed by AIP ID.
+
+    As in report_data.agents_transfers, the first ingestion event found
+    for any of an AIP's files is used, along with the Archivematica user
+    linked to it.
+    """
+    first_events = (
+        db.session.query(db.func.min(Event.id))
+        .join(File, Event.file_id == File.id)
+        .filter(Event.type == INGESTION_EVENT_TYPE)
+        .group_by(File.aip_id)
+    )
+    results = (
+        db.session.query(File.aip_id, Event.date, Agent.agent_value)
+        .select_from(Event)
+        .join(File, Event.file_id == File.id)
+        .outerjoin(EventAgent, EventAgent.c.event_id == Event.id)
+        .outerjoin(
+            Agent,
+            and_(
+                Agent.id == EventAgent.c.agent_id,
+                Agent.agent_type == INGESTION_AGENT_TYPE,
+            ),
+        )
+        .filter(Event.id.in_(first_events))
+    )
+
+    ingestions = {}
+    for aip_id, date, agent_value in results:
+        ingestion = ingestions.setdefault(aip_id, {"date": date, "agent": None})
+        if agent_value is not None:
+            ingestion["agent"] = agent_value
+
+    return ingestions
+
+
+def augment_aip_document_with_ingestion_data(document, ingestions, result):
+    ingestion = ingestions.get(result.id)
+    if ingestion is None or ingestion["date"] is None:
+        return
+
+    document["ingestion_date"] = int(ingestion["date"].timestamp())
+    if ingestion["agent"] is not None:
+        document["ingestion_agent"] = ingestion["agent"]
+
+
 def populate_index():
     ts_client = client()
 
@@ -266,6 +432,8 @@ def populate_index():
     for aip_field in AIP_FIELDS_TO_CACHE:
         aip_cache[aip_field] = {}
 
+    ingestions = aip_ingestion_cache()
+
     # Add documents to collections
     for model in APP_MODELS:
         table = get_model_table(model)
@@ -280,6 +448,9 @@ def populate_index():
         for result in results:
             document = model_instance_to_document(model, result, model_fields)
 
+            if model is AIP:
+                augment_aip_document_with_ingestion_data(document, ingestions, result)
+
             if model is File:
                 augment_file_document_with_aip_data(table, document, aip_cache, result)
 
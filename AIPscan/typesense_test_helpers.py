@@ -1,3 +1,5 @@
+import json
+
 FAKE_RESULTS_FORMAT_COUNTS = {
     "facet_counts": [
         {"field_name": "file_format", "counts": [{"value": "wav", "count": 10}]}
@@ -46,6 +48,10 @@ class FakeDocuments:
     def _import(self, search_parameters):
         return {}
 
+    def export(self, export_parameters):
+        hits = self.fake_results.get("hits", [])
+        return "\n".join(json.dumps(hit["document"]) for hit in hits)
+
 
 class FakeCollection:
     def __init__(self, fake_results=None):
@@ -1,12 +1,13 @@
 """This module defines and initalizes a Celery worker.
 
 Since Celery workers are run separately from the Flask application (for
-example via a systemd service), we use our Application Factory function
-to provide application context.
+example via a systemd service), we use an Application Factory function to
+provide application context. create_worker_app leaves out the blueprints
+of the web application, which tasks don't need.
 """
 
-from AIPscan import create_app
+from AIPscan import create_worker_app
 from AIPscan.celery import configure_celery
 
-app = create_app()
+app = create_worker_app()
 celery = configure_celery(app)
@@ -5,7 +5,8 @@ import { defineConfig } from "vite";
 const rawLogLevel = process.env.LOG_LEVEL ?? "warning";
 const logLevel = rawLogLevel === "warning" ? "warn" : rawLogLevel;
 
-const distDir = "AIPscan/static/dist/plot_formats_count";
+// Plotly is shared by every report that draws a Plotly chart.
+const plotlyDistDir = "AIPscan/static/dist/plotly";
 const plotlySource = resolve(
   process.cwd(),
   "node_modules/plotly.js-dist/plotly.js",
@@ -14,7 +15,7 @@ const plotlySource = resolve(
 const copyPlotlyPlugin = () => ({
   name: "copy-plotly-js",
   writeBundle() {
-    const destinationDir = resolve(process.cwd(), distDir);
+    const destinationDir = resolve(process.cwd(), plotlyDistDir);
     mkdirSync(destinationDir, { recursive: true });
     copyFileSync(plotlySource, resolve(destinationDir, "plotly.js"));
   },
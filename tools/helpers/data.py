@@ -1,8 +1,10 @@
 import pathlib
 import random
+import uuid
 from datetime import datetime
 from datetime import timedelta
 
+import numpy as np
 import pandas as pd
 from faker import Faker
 
@@ -13,6 +15,7 @@ from AIPscan.models import Event
 from AIPscan.models import EventAgent
 from AIPscan.models import FetchJob
 from AIPscan.models import File
+from AIPscan.models import Format
 from AIPscan.models import Pipeline
 from AIPscan.models import StorageLocation
 from AIPscan.models import StorageService
@@ -20,6 +23,72 @@ from AIPscan.models import StorageService
 # Initialize Faker instance
 fake = Faker()
 
+# Rows sent to the database in each INSERT by the bulk generator
+BULK_CHUNK_SIZE = 10_000
+
+FIVE_YEARS_IN_SECONDS = 5 * 365 * 24 * 60 * 60
+INGESTION_DURATION_IN_SECONDS = 30 * 60
+
+ORIGINAL_EVENT_TYPES = (
+    "ingestion",
+    "message digest calculation",
+    "format identification",
+    "validation",
+    "fixity check",
+)
+PRESERVATION_EVENT_TYPES = ("creation", "message digest calculation", "validation")
+
+# Columns of the rows built by bulk_rows, in order, keyed by table name.
+# Tables are listed in the order their rows must be inserted.
+BULK_COLUMNS = {
+    "aip": (
+        "id",
+        "uuid",
+        "transfer_name",
+        "create_date",
+        "mets_sha256",
+        "size",
+        "storage_service_id",
+        "storage_location_id",
+        "fetch_job_id",
+        "origin_pipeline_id",
+        "original_file_count",
+        "preservation_file_count",
+    ),
+    "file": (
+        "id",
+        "aip_id",
+        "name",
+        "filepath",
+        "uuid",
+        "file_type",
+        "size",
+        "date_created",
+        "puid",
+        "file_format",
+        "format_version",
+        "checksum_type",
+        "checksum_value",
+        "premis_object",
+        "original_file_id",
+        "storage_service_id",
+        "storage_location_id",
+        "aip_create_date",
+        "format_id",
+    ),
+    "event": (
+        "id",
+        "file_id",
+        "type",
+        "uuid",
+        "date",
+        "detail",
+        "outcome",
+        "outcome_detail",
+    ),
+    "event_agents": ("event_id", "agent_id"),
+}
+
 
 def seed(seed):
     fake.seed_instance(seed)
@@ -30,8 +99,9 @@ def randint(start, end):
 
 
 def format_types_from_csv(filepath):
-    df = pd.read_csv(filepath)
-    return df.to_dict(orient="records")
+    df = pd.read_csv(filepath, dtype=str)
+    # Empty cells are read as NaN, which can't be written to the database
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
 
 
 def create_or_fetch_fake_pipeline():
@@ -131,7 +201,7 @@ def create_fake_aip_files(min_files, max_files, agents, aip, format_types):
         filepath = fake.file_path()
         filepath_obj = pathlib.Path(fake.file_path())
 
-        extension = str(format_type["extensions"]).split(",")[0]
+        extension = (format_type["extensions"] or "bin").split(",")[0]
         filepath = str(filepath_obj.with_suffix("." + extension))
         filename = filepath_obj.name
 
@@ -149,6 +219,12 @@ def create_fake_aip_files(min_files, max_files, agents, aip, format_types):
             checksum_type=fake.text(20)[:-1],
             checksum_value=fake.text(20)[:-1],
             premis_object="",
+            storage_service_id=aip.storage_service_id,
+            storage_location_id=aip.storage_location_id,
+            aip_create_date=aip.create_date,
+            format_id=Format.id_for(
+                format_type["puid"], format_type["name"], format_type["version"]
+            ),
         )
 
         db.session.add(aipfile)
@@ -228,3 +304,299 @@ def create_fake_ingestion_events_for_file(file_id, aip_start_date, agents):
 
         db.session.execute(event_agent)
         db.session.commit()
+
+
+def _uuid4(random_bytes):
+    return str(uuid.UUID(bytes=random_bytes, version=4))
+
+
+def _agent_choices(agents):
+    # Events are linked to one agent of each type, as in
+    # create_fake_ingestion_events_for_file
+    return [
+        [agent.id for agent in agent_or_agents]
+        if type(agent_or_agents) is list
+        else [agent_or_agents.id]
+        for agent_or_agents in agents.values()
+    ]
+
+
+def _next_ids():
+    return {
+        table: db.session.query(db.func.coalesce(db.func.max(model.id), 0)).scalar() + 1
+        for table, model in (("aip", AIP), ("file", File), ("event", Event))
+    }
+
+
+def bulk_rows(
+    rng,
+    next_ids,
+    aip_count,
+    format_types,
+    agent_choices,
+    pipeline_id,
+    storage_service_id,
+    storage_location_id,
+    fetch_job_id,
+    min_files=10,
+    max_files=30,
+    preservation_ratio=0.0,
+    events_per_file=1,
+    min_aip_size=5_000_000,
+    max_aip_size=5_000_000_000,
+):
+    """Build rows for fake AIPs, their files and the files' events.
+
+    Random values are drawn from NumPy a batch at a time and rows are
+    built as tuples, in the column order of BULK_COLUMNS. IDs are
+    allocated from next_ids, which is updated for the next batch.
+
+    :param rng: Random number generator (numpy.random.Generator)
+    :param next_ids: Next free ID of the aip, file and event tables (dict)
+    :param aip_count: Number of AIPs to create (int)
+    :param format_types: Format types to pick from, with the ID of their
+        format (list of dicts)
+    :param agent_choices: Agent IDs to pick one from, for each agent type
+        linked to events (list of lists)
+    :param min_files: Minimum number of original files per AIP (int)
+    :param max_files: Maximum number of original files per AIP (int)
+    :param preservation_ratio: Fraction of original files with a
+        preservation derivative (float)
+    :param events_per_file: Number of events per file (int)
+
+    :returns: Rows keyed by table name (dict)
+    """
+    now = np.datetime64(datetime.now().replace(microsecond=0), "s")
+    create_dates = now - rng.integers(0, FIVE_YEARS_IN_SECONDS, aip_count).astype(
+        "timedelta64[s]"
+    )
+    aip_sizes = rng.integers(min_aip_size, max_aip_size, aip_count, endpoint=True)
+    file_counts = rng.integers(min_files, max_files, aip_count, endpoint=True)
+
+    original_count = int(file_counts.sum())
+    derived = rng.random(original_count) < preservation_ratio
+    file_count = original_count + int(derived.sum())
+    event_count = file_count * events_per_file
+
+    # Per-file and per-event random values, consumed in order
+    format_indexes = iter(rng.integers(0, len(format_types), file_count).tolist())
+    file_sizes = iter(rng.integers(1000, 1_000_000, file_count).tolist())
+    file_uuids = rng.bytes(16 * file_count)
+    checksums = rng.bytes(32 * file_count).hex()
+    event_uuids = rng.bytes(16 * event_count)
+    event_offsets = iter(
+        rng.integers(0, INGESTION_DURATION_IN_SECONDS, event_count).tolist()
+    )
+    agent_picks = [
+        iter(rng.integers(0, len(choices), event_count).tolist())
+        for choices in agent_choices
+    ]
+
+    rows = {table: [] for table in BULK_COLUMNS}
+    originals = []
+    derivatives = []
+    file_index = 0
+    event_index = 0
+
+    def add_events(file_id, create_date, event_types):
+        nonlocal event_index
+        for number in range(events_per_file):
+            event_id = next_ids["event"]
+            next_ids["event"] += 1
+            rows["event"].append(
+                (
+                    event_id,
+                    file_id,
+                    event_types[number % len(event_types)],
+                    _uuid4(event_uuids[16 * event_index : 16 * (event_index + 1)]),
+                    create_date - timedelta(seconds=next(event_offsets)),
+                    "",
+                    "",
+                    "",
+                )
+            )
+            for choices, picks in zip(agent_choices, agent_picks, strict=True):
+                rows["event_agents"].append((event_id, choices[next(picks)]))
+            event_index += 1
+
+    def add_file(aip_id, create_date, file_type, original=None):
+        nonlocal file_index
+        file_id = next_ids["file"]
+        next_ids["file"] += 1
+        format_type = format_types[next(format_indexes)]
+        extension = (format_type["extensions"] or "bin").split(",")[0]
+        file_uuid = _uuid4(file_uuids[16 * file_index : 16 * (file_index + 1)])
+        if original is None:
+            name = f"file-{file_id}.{extension}"
+        else:
+            # Archivematica names derivatives after their original
+            name = f"file-{original[0]}-{file_uuid}.{extension}"
+        row = (
+            file_id,
+            aip_id,
+            name,
+            f"objects/{aip_id}/{name}",
+            file_uuid,
+            file_type,
+            next(file_sizes),
+            create_date,
+            format_type["puid"],
+            format_type["name"],
+            format_type["version"],
+            "sha256",
+            checksums[64 * file_index : 64 * (file_index + 1)],
+            "",
+            None if original is None else original[0],
+            storage_service_id,
+            storage_location_id,
+            create_date,
+            format_type["id"],
+        )
+        file_index += 1
+        return row
+
+    derived_flags = iter(derived.tolist())
+    for create_date, aip_size, aip_file_count in zip(
+        create_dates.tolist(), aip_sizes.tolist(), file_counts.tolist(), strict=True
+    ):
+        aip_id = next_ids["aip"]
+        next_ids["aip"] += 1
+        preservation_file_count = 0
+
+        for _ in range(aip_file_count):
+            original = add_file(aip_id, create_date, "original")
+            originals.append(original)
+            add_events(original[0], create_date, ORIGINAL_EVENT_TYPES)
+
+            if next(derived_flags):
+                derivative = add_file(aip_id, create_date, "preservation", original)
+                derivatives.append(derivative)
+                preservation_file_count += 1
+                add_events(derivative[0], create_date, PRESERVATION_EVENT_TYPES)
+
+        rows["aip"].append(
+            (
+                aip_id,
+                _uuid4(rng.bytes(16)),
+                f"transfer-{aip_id}",
+                create_date,
+                rng.bytes(32).hex(),
+                aip_size,
+                storage_service_id,
+                storage_location_id,
+                fetch_job_id,
+                pipeline_id,
+                aip_file_count,
+                preservation_file_count,
+            )
+        )
+
+    # Originals are inserted first so derivatives' foreign keys resolve
+    rows["file"] = originals + derivatives
+
+    return rows
+
+
+def insert_rows(table, columns, rows, chunk_size=BULK_CHUNK_SIZE):
+    """Insert rows, chunk_size at a time, with the driver's executemany.
+
+    PyMySQL sends each chunk as a single multi-row INSERT statement.
+
+    :param table: Table name (str)
+    :param columns: Column names (tuple)
+    :param rows: Rows of values in column order (list of tuples)
+    :param chunk_size: Rows per executemany call (int)
+    """
+    statement = "INSERT INTO `{}` ({}) VALUES ({})".format(
+        table,
+        ", ".join(f"`{column}`" for column in columns),
+        ", ".join(["%s"] * len(columns)),
+    )
+    connection = db.session.connection()
+    for start in range(0, len(rows), chunk_size):
+        connection.exec_driver_sql(statement, rows[start : start + chunk_size])
+
+
+def bulk_create_fake_aips(
+    pipeline_id,
+    storage_service_id,
+    storage_location_id,
+    fetch_job_id,
+    agents,
+    format_types,
+    aip_count,
+    min_files=10,
+    max_files=30,
+    preservation_ratio=0.0,
+    events_per_file=1,
+    min_aip_size=5_000_000,
+    max_aip_size=5_000_000_000,
+    chunk_size=BULK_CHUNK_SIZE,
+):
+    """Create fake AIPs with their files and events in bulk.
+
+    Unlike create_fake_aip and create_fake_aip_files, which commit every
+    row, IDs are allocated up front and rows are inserted chunk_size at a
+    time, committing after each batch of AIPs. Nothing else may write to
+    the aip, file and event tables meanwhile. The AIPs' file counters are
+    set, but file facets need rebuilding afterwards (flask
+    rebuild-file-facets).
+
+    :param agents: Agents as returned by
+        create_fake_agents_for_storage_service (dict)
+    :param format_types: Format types to pick from (list of dicts)
+    :param aip_count: Number of AIPs to create (int)
+    :param min_files: Minimum number of original files per AIP (int)
+    :param max_files: Maximum number of original files per AIP (int)
+    :param preservation_ratio: Fraction of original files with a
+        preservation derivative (float)
+    :param events_per_file: Number of events per file (int)
+    :param chunk_size: Rows per INSERT statement (int)
+
+    :returns: Number of rows inserted, keyed by table name (dict)
+    """
+    # Derive NumPy's generator from Faker's, so seed() applies to both
+    rng = np.random.default_rng(fake.random.getrandbits(64))
+    format_types = [
+        {
+            **format_type,
+            "id": Format.id_for(
+                format_type["puid"], format_type["name"], format_type["version"]
+            ),
+        }
+        for format_type in format_types
+    ]
+    agent_choices = _agent_choices(agents)
+    next_ids = _next_ids()
+    counts = dict.fromkeys(BULK_COLUMNS, 0)
+
+    rows_per_aip = max(max_files, 1) * (1 + events_per_file * (1 + len(agents)))
+    aips_per_batch = max(chunk_size // rows_per_aip, 1)
+
+    for start in range(0, aip_count, aips_per_batch):
+        rows = bulk_rows(
+            rng,
+            next_ids,
+            min(aips_per_batch, aip_count - start),
+            format_types,
+            agent_choices,
+            pipeline_id,
+            storage_service_id,
+            storage_location_id,
+            fetch_job_id,
+            min_files=min_files,
+            max_files=max_files,
+            preservation_ratio=preservation_ratio,
+            events_per_file=events_per_file,
+            min_aip_size=min_aip_size,
+            max_aip_size=max_aip_size,
+        )
+        for table, columns in BULK_COLUMNS.items():
+            insert_rows(table, columns, rows[table], chunk_size)
+            counts[table] += len(rows[table])
+        db.session.commit()
+
+    StorageService.bump_data_version(storage_service_id)
+    db.session.commit()
+
+    return counts
@@ -1,11 +1,33 @@
 import json
+import os
 import pathlib
+import time
+from datetime import datetime
 
+from AIPscan import db
+from AIPscan.Aggregator import database_helpers
 from AIPscan.Aggregator.downloads import get_download_root
 from AIPscan.Aggregator.task_helpers import format_api_url_with_limit_offset
 from AIPscan.Aggregator.task_helpers import get_packages_directory
 from AIPscan.Aggregator.task_helpers import parse_package_list_file
+from AIPscan.Aggregator.tasks import GET_METS_DOWNLOADED_BYTES
 from AIPscan.Aggregator.tasks import make_request
+from AIPscan.Aggregator.tasks import package_lists_request
+from AIPscan.Aggregator.tasks import process_packages
+from AIPscan.models import AIP
+from AIPscan.models import Agent
+from AIPscan.models import Event
+from AIPscan.models import EventAgent
+from AIPscan.models import File
+
+# Tables written to when fetching AIPs, counted by benchmark_fetch
+FETCHED_TABLES = {
+    "aip": AIP.__table__,
+    "file": File.__table__,
+    "event": Event.__table__,
+    "event_agents": EventAgent,
+    "agent": Agent.__table__,
+}
 
 
 def determine_start_and_end_item(page, packages_per_page, total_packages):
@@ -60,3 +82,72 @@ def get_packages(storage_service, packages_dir):
         packages = fetch_and_write_packages(storage_service, package_filepath)
 
     return packages
+
+
+def _row_counts():
+    return {
+        name: db.session.execute(db.select(db.func.count()).select_from(table)).scalar()
+        for name, table in FETCHED_TABLES.items()
+    }
+
+
+def _downloaded_bytes():
+    return sum(sample[2] for sample in GET_METS_DOWNLOADED_BYTES.state()["samples"])
+
+
+def benchmark_fetch(storage_service_id, timestamp_str):
+    """Fetch every package of a Storage Service, measuring throughput.
+
+    The steps of the workflow_coordinator task are run in this process:
+    package lists are requested with the package_lists_request task and
+    each AIP's METS file is fetched with the get_mets task, without a
+    Celery broker or workers.
+
+    :param storage_service_id: Storage Service ID (int)
+    :param timestamp_str: Name of the fetch job's download directory (str)
+
+    :returns: Measurements (dict)
+    """
+    rows_before = _row_counts()
+    bytes_before = _downloaded_bytes()
+    start = time.perf_counter()
+
+    fetch_job = database_helpers.create_fetch_job(
+        datetime.now().replace(microsecond=0), timestamp_str, storage_service_id
+    )
+    fetch_job_id = fetch_job.id
+    packages_dir = create_packages_directory(timestamp_str)
+    create_mets_directory(timestamp_str)
+
+    package_lists = package_lists_request.apply(
+        args=(storage_service_id, timestamp_str, packages_dir)
+    ).get()
+
+    processed_packages = []
+    for package_list_no in range(1, package_lists["totalPackageLists"] + 1):
+        packages = parse_package_list_file(
+            os.path.join(packages_dir, f"packages{package_list_no}.json"), None, True
+        )
+        processed_packages += process_packages(
+            packages, storage_service_id, timestamp_str, package_list_no, fetch_job_id
+        )
+
+    database_helpers.update_fetch_job(
+        fetch_job_id, processed_packages, package_lists["totalPackages"]
+    )
+
+    seconds = time.perf_counter() - start
+    rows_after = _row_counts()
+    rows = {name: rows_after[name] - rows_before[name] for name in FETCHED_TABLES}
+    megabytes = (_downloaded_bytes() - bytes_before) / 10**6
+
+    return {
+        "seconds": seconds,
+        "packages": package_lists["totalPackages"],
+        "aips": rows["aip"],
+        "aips_per_second": rows["aip"] / seconds,
+        "megabytes": megabytes,
+        "megabytes_per_second": megabytes / seconds,
+        "rows": rows,
+        "rows_per_second": sum(rows.values()) / seconds,
+    }
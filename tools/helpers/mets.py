@@ -0,0 +1,375 @@
+"""Generate synthetic Archivematica AIP METS files.
+
+The METS files have the structure AIPscan reads from Archivematica's: an
+intellectual entity naming the transfer, and an amdSec for each original
+and preservation file holding its PREMIS object, events and agents.
+Generation is deterministic for a given package UUID.
+"""
+
+import math
+import random
+import uuid
+from datetime import datetime
+from datetime import timedelta
+from xml.sax.saxutils import escape
+
+METS_NAMESPACES = (
+    'xmlns:mets="http://www.loc.gov/METS/" '
+    'xmlns:premis="http://www.loc.gov/premis/v3" '
+    'xmlns:xlink="http://www.w3.org/1999/xlink" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"'
+)
+
+# The first three agents are the ones Archivematica links to every event
+AGENTS = (
+    ("preservation system", "Archivematica-1.15.1", "Archivematica", "software"),
+    ("repository code", "test", "test", "organization"),
+    (
+        "Archivematica user pk",
+        "1",
+        'username="admin", first_name="", last_name=""',
+        "Archivematica user",
+    ),
+)
+
+ORIGINAL_EVENT_TYPES = (
+    "ingestion",
+    "message digest calculation",
+    "format identification",
+    "validation",
+    "fixity check",
+    "virus check",
+)
+PRESERVATION_EVENT_TYPES = (
+    "creation",
+    "message digest calculation",
+    "format identification",
+    "validation",
+)
+
+DEFAULT_FORMAT_TYPES = (
+    {"puid": "fmt/43", "name": "JPEG", "version": "1.01", "extensions": "jpg"},
+    {"puid": "fmt/354", "name": "PDF/A", "version": "1b", "extensions": "pdf"},
+    {"puid": "fmt/101", "name": "XML", "version": "1.0", "extensions": "xml"},
+    {
+        "puid": "x-fmt/111",
+        "name": "Plain Text File",
+        "version": None,
+        "extensions": "txt",
+    },
+)
+PRESERVATION_FORMAT_TYPE = {
+    "puid": "fmt/353",
+    "name": "Tagged Image File Format",
+    "version": None,
+    "extensions": "tif",
+}
+
+
+def _agents(agent_count):
+    agents = list(AGENTS[:agent_count])
+    for number in range(len(agents), agent_count):
+        agents.append(
+            (
+                "Archivematica user pk",
+                str(number),
+                f'username="user{number}", first_name="", last_name=""',
+                "Archivematica user",
+            )
+        )
+    return agents
+
+
+def _premis_object(file_):
+    original = file_["original"]
+    relationship = ""
+    if original is not None:
+        relationship = f"""
+<premis:relationship>
+<premis:relationshipType>derivation</premis:relationshipType>
+<premis:relationshipSubType>has source</premis:relationshipSubType>
+<premis:relatedObjectIdentifier>
+<premis:relatedObjectIdentifierType>UUID</premis:relatedObjectIdentifierType>
+<premis:relatedObjectIdentifierValue>{original["uuid"]}</premis:relatedObjectIdentifierValue>
+</premis:relatedObjectIdentifier>
+</premis:relationship>"""
+
+    format_type = file_["format_type"]
+    version = ""
+    if format_type["version"]:
+        version = f"<premis:formatVersion>{escape(format_type['version'])}</premis:formatVersion>"
+
+    return f"""<mets:techMD ID="techMD_{file_["amdsec"]}">
+<mets:mdWrap MDTYPE="PREMIS:OBJECT">
+<mets:xmlData>
+<premis:object xsi:type="premis:file" version="3.0">
+<premis:objectIdentifier>
+<premis:objectIdentifierType>UUID</premis:objectIdentifierType>
+<premis:objectIdentifierValue>{file_["uuid"]}</premis:objectIdentifierValue>
+</premis:objectIdentifier>
+<premis:objectCharacteristics>
+<premis:compositionLevel>0</premis:compositionLevel>
+<premis:fixity>
+<premis:messageDigestAlgorithm>sha256</premis:messageDigestAlgorithm>
+<premis:messageDigest>{file_["checksum"]}</premis:messageDigest>
+</premis:fixity>
+<premis:size>{file_["size"]}</premis:size>
+<premis:format>
+<premis:formatDesignation>
+<premis:formatName>{escape(format_type["name"])}</premis:formatName>{version}
+</premis:formatDesignation>
+<premis:formatRegistry>
+<premis:formatRegistryName>PRONOM</premis:formatRegistryName>
+<premis:formatRegistryKey>{escape(format_type["puid"])}</premis:formatRegistryKey>
+</premis:formatRegistry>
+</premis:format>
+<premis:creatingApplication>
+<premis:dateCreatedByApplication>{file_["date"]:%Y-%m-%dT%H:%M:%S}</premis:dateCreatedByApplication>
+</premis:creatingApplication>
+</premis:objectCharacteristics>
+<premis:originalName>%transferDirectory%{escape(file_["path"])}</premis:originalName>{relationship}
+</premis:object>
+</mets:xmlData>
+</mets:mdWrap>
+</mets:techMD>"""
+
+
+def _premis_event(number, event_uuid, event_type, date, agents, padding):
+    linking_agents = "".join(
+        f"""
+<premis:linkingAgentIdentifier>
+<premis:linkingAgentIdentifierType>{escape(identifier_type)}</premis:linkingAgentIdentifierType>
+<premis:linkingAgentIdentifierValue>{escape(identifier_value)}</premis:linkingAgentIdentifierValue>
+</premis:linkingAgentIdentifier>"""
+        for identifier_type, identifier_value, _, _ in agents
+    )
+    return f"""<mets:digiprovMD ID="digiprovMD_{number}">
+<mets:mdWrap MDTYPE="PREMIS:EVENT">
+<mets:xmlData>
+<premis:event version="3.0">
+<premis:eventIdentifier>
+<premis:eventIdentifierType>UUID</premis:eventIdentifierType>
+<premis:eventIdentifierValue>{event_uuid}</premis:eventIdentifierValue>
+</premis:eventIdentifier>
+<premis:eventType>{event_type}</premis:eventType>
+<premis:eventDateTime>{date:%Y-%m-%dT%H:%M:%S}+00:00</premis:eventDateTime>
+<premis:eventDetailInformation>
+<premis:eventDetail>program="AIPscan"; version="1.0"</premis:eventDetail>
+</premis:eventDetailInformation>
+<premis:eventOutcomeInformation>
+<premis:eventOutcome>pass</premis:eventOutcome>
+<premis:eventOutcomeDetail>
+<premis:eventOutcomeDetailNote>{padding}</premis:eventOutcomeDetailNote>
+</premis:eventOutcomeDetail>
+</premis:eventOutcomeInformation>{linking_agents}
+</premis:event>
+</mets:xmlData>
+</mets:mdWrap>
+</mets:digiprovMD>"""
+
+
+def _premis_agent(number, agent):
+    identifier_type, identifier_value, name, agent_type = agent
+    return f"""<mets:digiprovMD ID="digiprovMD_{number}">
+<mets:mdWrap MDTYPE="PREMIS:AGENT">
+<mets:xmlData>
+<premis:agent version="3.0">
+<premis:agentIdentifier>
+<premis:agentIdentifierType>{escape(identifier_type)}</premis:agentIdentifierType>
+<premis:agentIdentifierValue>{escape(identifier_value)}</premis:agentIdentifierValue>
+</premis:agentIdentifier>
+<premis:agentName>{escape(name)}</premis:agentName>
+<premis:agentType>{escape(agent_type)}</premis:agentType>
+</premis:agent>
+</mets:xmlData>
+</mets:mdWrap>
+</mets:digiprovMD>"""
+
+
+class _Builder:
+    """Build a METS document's parts from a package UUID's random stream."""
+
+    def __init__(self, package_uuid, format_types):
+        self.rng = random.Random(package_uuid)
+        self.format_types = format_types
+        self.create_date = datetime(2015, 1, 1) + timedelta(
+            seconds=self.rng.randrange(10 * 365 * 24 * 60 * 60)
+        )
+        self.transfer_name = f"transfer-{package_uuid[:8]}"
+
+    def uuid(self):
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def file(self, number, original=None):
+        file_uuid = self.uuid()
+        if original is None:
+            format_type = self.rng.choice(self.format_types)
+            extension = (format_type["extensions"] or "bin").split(",")[0]
+            path = f"objects/file-{number}.{extension}"
+        else:
+            format_type = PRESERVATION_FORMAT_TYPE
+            path = f"objects/file-{number}-{file_uuid}.tif"
+        return {
+            "uuid": file_uuid,
+            "type": "original" if original is None else "preservation",
+            "original": original,
+            "path": path,
+            "format_type": format_type,
+            "size": self.rng.randint(1000, 10_000_000),
+            "checksum": f"{self.rng.getrandbits(256):064x}",
+            "date": self.create_date - timedelta(days=self.rng.randrange(3650)),
+        }
+
+
+def _render(
+    package_uuid,
+    file_count,
+    events_per_file,
+    agent_count,
+    preservation_ratio,
+    format_types,
+    padding,
+):
+    builder = _Builder(package_uuid, format_types)
+    agents = _agents(agent_count)
+
+    files = []
+    for number in range(1, file_count + 1):
+        original = builder.file(number)
+        files.append(original)
+        if builder.rng.random() < preservation_ratio:
+            files.append(builder.file(number, original))
+
+    amdsecs = []
+    digiprov_number = 0
+    for amdsec_number, file_ in enumerate(files, start=1):
+        file_["amdsec"] = amdsec_number
+        if file_["original"] is None:
+            event_types = ORIGINAL_EVENT_TYPES
+        else:
+            event_types = PRESERVATION_EVENT_TYPES
+
+        parts = [_premis_object(file_)]
+        for event_number in range(events_per_file):
+            digiprov_number += 1
+            parts.append(
+                _premis_event(
+                    digiprov_number,
+                    builder.uuid(),
+                    event_types[event_number % len(event_types)],
+                    builder.create_date
+                    - timedelta(seconds=builder.rng.randrange(30 * 60)),
+                    agents,
+                    padding,
+                )
+            )
+        for agent in agents:
+            digiprov_number += 1
+            parts.append(_premis_agent(digiprov_number, agent))
+
+        amdsecs.append(
+            f'<mets:amdSec ID="amdSec_{amdsec_number}">\n'
+            + "\n".join(parts)
+            + "\n</mets:amdSec>"
+        )
+
+    file_groups = []
+    struct_items = []
+    for file_type in ("original", "preservation"):
+        group_files = [file_ for file_ in files if file_["type"] == file_type]
+        if not group_files:
+            continue
+        file_groups.append(
+            f'<mets:fileGrp USE="{file_type}">\n'
+            + "\n".join(
+                f'<mets:file GROUPID="Group-{file_["uuid"]}" '
+                f'ID="file-{file_["uuid"]}" ADMID="amdSec_{file_["amdsec"]}">\n'
+                f'<mets:FLocat xlink:href="{escape(file_["path"])}" '
+                'LOCTYPE="OTHER" OTHERLOCTYPE="SYSTEM"/>\n'
+                "</mets:file>"
+                for file_ in group_files
+            )
+            + "\n</mets:fileGrp>"
+        )
+        struct_items.extend(
+            f'<mets:div LABEL="{escape(file_["path"].split("/")[-1])}" TYPE="Item">\n'
+            f'<mets:fptr FILEID="file-{file_["uuid"]}"/>\n'
+            "</mets:div>"
+            for file_ in group_files
+        )
+
+    name = f"{builder.transfer_name}-{package_uuid}"
+    amdsecs = "\n".join(amdsecs)
+    file_groups = "\n".join(file_groups)
+    struct_items = "\n".join(struct_items)
+    return f"""<?xml version='1.0' encoding='UTF-8'?>
+<mets:mets {METS_NAMESPACES}>
+<mets:metsHdr CREATEDATE="{builder.create_date:%Y-%m-%dT%H:%M:%S}"/>
+<mets:dmdSec ID="dmdSec_1">
+<mets:mdWrap MDTYPE="PREMIS:OBJECT">
+<mets:xmlData>
+<premis:object xsi:type="premis:intellectualEntity" version="3.0">
+<premis:objectIdentifier>
+<premis:objectIdentifierType>UUID</premis:objectIdentifierType>
+<premis:objectIdentifierValue>{package_uuid}</premis:objectIdentifierValue>
+</premis:objectIdentifier>
+<premis:originalName>{name}</premis:originalName>
+</premis:object>
+</mets:xmlData>
+</mets:mdWrap>
+</mets:dmdSec>
+{amdsecs}
+<mets:fileSec>
+{file_groups}
+</mets:fileSec>
+<mets:structMap ID="structMap_1" LABEL="Archivematica default" TYPE="physical">
+<mets:div LABEL="{name}" TYPE="Directory" DMDID="dmdSec_1">
+<mets:div LABEL="objects" TYPE="Directory">
+{struct_items}
+</mets:div>
+</mets:div>
+</mets:structMap>
+</mets:mets>
+"""
+
+
+def generate_mets(
+    package_uuid,
+    file_count=10,
+    events_per_file=3,
+    agent_count=3,
+    preservation_ratio=0.0,
+    payload_size=0,
+    format_types=DEFAULT_FORMAT_TYPES,
+):
+    """Return a synthetic AIP METS document.
+
+    :param package_uuid: AIP UUID, which also seeds the random values (str)
+    :param file_count: Number of original files (int)
+    :param events_per_file: Number of PREMIS events per file (int)
+    :param agent_count: Number of PREMIS agents, linked to every event (int)
+    :param preservation_ratio: Fraction of original files with a
+        preservation derivative (float)
+    :param payload_size: Minimum size of the document in bytes, reached by
+        padding event outcome notes (int)
+    :param format_types: Format types to pick from (sequence of dicts)
+
+    :returns: METS document (bytes)
+    """
+    args = (
+        package_uuid,
+        file_count,
+        events_per_file,
+        agent_count,
+        preservation_ratio,
+        format_types,
+    )
+    mets = _render(*args, padding="").encode("utf-8")
+
+    missing = payload_size - len(mets)
+    if missing <= 0 or events_per_file == 0:
+        return mets
+
+    event_count = mets.count(b"<premis:event ")
+    padding = "x" * math.ceil(missing / event_count)
+    return _render(*args, padding=padding).encode("utf-8")
@@ -0,0 +1,238 @@
+"""A stand-in for the Archivematica Storage Service API.
+
+MockStorageService is a WSGI application answering the requests AIPscan
+makes when fetching packages: paginated package listings, location and
+pipeline details, and AIP METS files, which are generated on the fly
+(see tools.helpers.mets). It can be served from a background thread with
+serve, for tests and benchmarks, or on its own with
+tools/mock-storage-service.
+"""
+
+import json
+import random
+import re
+import threading
+import uuid
+
+from werkzeug.serving import make_server
+from werkzeug.wrappers import Request
+from werkzeug.wrappers import Response
+
+from . import mets
+
+FILE_LIST_PATH = re.compile(r"^/api/v2/file$")
+EXTRACT_FILE_PATH = re.compile(r"^/api/v2/file/(?P<uuid>[0-9a-f-]{36})/extract_file$")
+LOCATION_PATH = re.compile(r"^/api/v2/location/(?P<uuid>[0-9a-f-]{36})$")
+PIPELINE_PATH = re.compile(r"^/api/v2/pipeline/(?P<uuid>[0-9a-f-]{36})$")
+
+DEFAULT_PAGE_SIZE = 20
+
+
+def _json_response(data, status=200):
+    return Response(json.dumps(data), status=status, mimetype="application/json")
+
+
+class MockStorageService:
+    """WSGI application serving a Storage Service's AIPs.
+
+    Packages, locations and the pipeline are derived from seed, so two
+    services with the same seed serve the same AIPs, while the METS of
+    every AIP is different.
+    """
+
+    def __init__(
+        self,
+        package_count=100,
+        location_count=2,
+        file_count=10,
+        events_per_file=3,
+        agent_count=3,
+        preservation_ratio=0.0,
+        payload_size=0,
+        format_types=mets.DEFAULT_FORMAT_TYPES,
+        username="test",
+        api_key="test",
+        seed=None,
+    ):
+        rng = random.Random(seed)
+
+        def random_uuid():
+            return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+        self.mets_options = {
+            "file_count": file_count,
+            "events_per_file": events_per_file,
+            "agent_count": agent_count,
+            "preservation_ratio": preservation_ratio,
+            "payload_size": payload_size,
+            "format_types": format_types,
+        }
+        self.username = username
+        self.api_key = api_key
+
+        self.pipeline_uuid = random_uuid()
+        self.locations = [random_uuid() for _ in range(max(location_count, 1))]
+        self.packages = {}
+        for number in range(package_count):
+            package_uuid = random_uuid()
+            self.packages[package_uuid] = self._package(
+                package_uuid,
+                self.locations[number % len(self.locations)],
+                rng.randint(10**6, 10**10),
+            )
+        self._package_list = list(self.packages.values())
+
+        self.bytes_served = 0
+        self.requests_served = 0
+        self._lock = threading.Lock()
+
+    def _package(self, package_uuid, location, size):
+        # Archivematica stores AIPs in a pair tree of their UUID
+        pair_tree = "".join(
+            f"{package_uuid.replace('-', '')[index : index + 4]}/"
+            for index in range(0, 32, 4)
+        )
+        current_path = f"{pair_tree}transfer-{package_uuid}.7z"
+        return {
+            "current_full_path": f"/var/archivematica/AIPsStore/{current_path}",
+            "current_location": f"/api/v2/location/{location}/",
+            "current_path": current_path,
+            "encrypted": False,
+            "misc_attributes": {},
+            "origin_pipeline": f"/api/v2/pipeline/{self.pipeline_uuid}/",
+            "package_type": "AIP",
+            "related_packages": [],
+            "replicas": [],
+            "replicated_package": None,
+            "resource_uri": f"/api/v2/file/{package_uuid}/",
+            "size": size,
+            "status": "UPLOADED",
+            "uuid": package_uuid,
+        }
+
+    def mets(self, package_uuid):
+        """Return METS document of a package (bytes)."""
+        return mets.generate_mets(package_uuid, **self.mets_options)
+
+    def _authenticated(self, request):
+        return (
+            request.args.get("username") == self.username
+            and request.args.get("api_key") == self.api_key
+        )
+
+    def _page_url(self, limit, offset):
+        return (
+            f"/api/v2/file/?limit={limit}&offset={offset}"
+            f"&username={self.username}&api_key={self.api_key}"
+        )
+
+    def file_list(self, request):
+        limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+        offset = request.args.get("offset", 0, type=int)
+        total = len(self._package_list)
+
+        next_url = None
+        if offset + limit < total:
+            next_url = self._page_url(limit, offset + limit)
+        previous_url = None
+        if offset > 0:
+            previous_url = self._page_url(limit, max(offset - limit, 0))
+
+        return _json_response(
+            {
+                "meta": {
+                    "limit": limit,
+                    "next": next_url,
+                    "offset": offset,
+                    "previous": previous_url,
+                    "total_count": total,
+                },
+                "objects": self._package_list[offset : offset + limit],
+            }
+        )
+
+    def extract_file(self, request, package_uuid):
+        relative_path = request.args.get("relative_path_to_file", "")
+        if package_uuid not in self.packages or not relative_path.endswith(
+            f"/data/METS.{package_uuid}.xml"
+        ):
+            return _json_response({"error": "File not found"}, status=404)
+
+        document = self.mets(package_uuid)
+        with self._lock:
+            self.bytes_served += len(document)
+        return Response(document, mimetype="application/xml")
+
+    def location(self, request, location_uuid):
+        if location_uuid not in self.locations:
+            return _json_response({"error": "Location not found"}, status=404)
+
+        number = self.locations.index(location_uuid) + 1
+        return _json_response(
+            {
+                "description": f"AIP Storage {number}",
+                "purpose": "AS",
+                "resource_uri": f"/api/v2/location/{location_uuid}/",
+                "uuid": location_uuid,
+            }
+        )
+
+    def pipeline(self, request, pipeline_uuid):
+        if pipeline_uuid != self.pipeline_uuid:
+            return _json_response({"error": "Pipeline not found"}, status=404)
+
+        return _json_response(
+            {
+                "description": "Archivematica",
+                "remote_name": "http://archivematica.example.com",
+                "resource_uri": f"/api/v2/pipeline/{pipeline_uuid}/",
+                "uuid": pipeline_uuid,
+            }
+        )
+
+    def dispatch(self, request):
+        if request.method != "GET":
+            return _json_response({"error": "Method not allowed"}, status=405)
+        if not self._authenticated(request):
+            return _json_response({"error": "Unauthorized"}, status=401)
+
+        path = request.path.rstrip("/")
+        if FILE_LIST_PATH.match(path):
+            return self.file_list(request)
+        for pattern, view in (
+            (EXTRACT_FILE_PATH, self.extract_file),
+            (LOCATION_PATH, self.location),
+            (PIPELINE_PATH, self.pipeline),
+        ):
+            match = pattern.match(path)
+            if match:
+                return view(request, match.group("uuid"))
+
+        return _json_response({"error": "Not found"}, status=404)
+
+    def __call__(self, environ, start_response):
+        with self._lock:
+            self.requests_served += 1
+        response = self.dispatch(Request(environ))
+        return response(environ, start_response)
+
+
+def serve(app, host="127.0.0.1", port=0):
+    """Serve a WSGI application from a background thread.
+
+    Call shutdown on the returned server to stop it.
+
+    :param app: WSGI application
+    :param host: Host to listen on (str)
+    :param port: Port to listen on, or 0 for any free port (int)
+
+    :returns: Server, whose URL is url_for(server)
+    """
+    server = make_server(host, port, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def url_for(server):
+    return f"http://{server.host}:{server.server_port}"
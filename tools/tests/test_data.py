@@ -1,5 +1,6 @@
 import datetime
 
+import numpy as np
 import pytest
 
 from tools.helpers import data
@@ -87,3 +88,93 @@ def test_create_fake_aip(mock_db_add):
     assert aip.fetch_job_id == 4
     assert aip.origin_pipeline_id == 1
     assert aip.size == 100
+
+
+def test_bulk_rows():
+    rng = np.random.default_rng(1)
+    next_ids = {"aip": 10, "file": 100, "event": 1000}
+    format_types = [
+        {
+            "id": 7,
+            "puid": "fmt/43",
+            "name": "JPEG",
+            "version": "1.01",
+            "extensions": "jpg",
+        }
+    ]
+    agent_choices = [[1], [2], [3, 4, 5]]
+
+    rows = data.bulk_rows(
+        rng,
+        next_ids,
+        4,
+        format_types,
+        agent_choices,
+        1,
+        2,
+        3,
+        4,
+        min_files=5,
+        max_files=5,
+        preservation_ratio=1.0,
+        events_per_file=2,
+    )
+
+    for table, columns in data.BULK_COLUMNS.items():
+        assert all(len(row) == len(columns) for row in rows[table])
+
+    assert len(rows["aip"]) == 4
+    assert len(rows["file"]) == 40
+    assert len(rows["event"]) == 80
+    assert len(rows["event_agents"]) == 240
+    assert next_ids == {"aip": 14, "file": 140, "event": 1080}
+
+    aip = dict(zip(data.BULK_COLUMNS["aip"], rows["aip"][0], strict=True))
+    assert aip["id"] == 10
+    assert aip["original_file_count"] == 5
+    assert aip["preservation_file_count"] == 5
+    assert aip["storage_service_id"] == 2
+    assert aip["storage_location_id"] == 3
+
+    files = [
+        dict(zip(data.BULK_COLUMNS["file"], row, strict=True)) for row in rows["file"]
+    ]
+    originals = [file_ for file_ in files if file_["file_type"] == "original"]
+    derivatives = [file_ for file_ in files if file_["file_type"] == "preservation"]
+
+    # Originals come first, so derivatives' foreign keys resolve on insert
+    assert files == originals + derivatives
+    original_ids = {file_["id"] for file_ in originals}
+    assert all(file_["original_file_id"] in original_ids for file_ in derivatives)
+    assert all(file_["date_created"] == aip["create_date"] for file_ in files[:5])
+    assert all(file_["aip_create_date"] == aip["create_date"] for file_ in files[:5])
+    assert {
+        (file_["storage_service_id"], file_["storage_location_id"]) for file_ in files
+    } == {(2, 3)}
+    assert {file_["format_id"] for file_ in files} == {7}
+
+    events = [
+        dict(zip(data.BULK_COLUMNS["event"], row, strict=True)) for row in rows["event"]
+    ]
+    ingestion_events = [event for event in events if event["type"] == "ingestion"]
+    assert len(ingestion_events) == len(originals)
+    assert {agent_id for _, agent_id in rows["event_agents"]} <= {1, 2, 3, 4, 5}
+
+
+def test_format_types_from_csv(tmp_path):
+    csv_path = tmp_path / "format_types.csv"
+    csv_path.write_text(
+        "puid,name,version,extensions\n"
+        "fmt/43,JPEG,1.01,jpg\n"
+        'x-fmt/3,Online Description Tool Format,,"odt,odf"\n'
+    )
+
+    assert data.format_types_from_csv(str(csv_path)) == [
+        {"puid": "fmt/43", "name": "JPEG", "version": "1.01", "extensions": "jpg"},
+        {
+            "puid": "x-fmt/3",
+            "name": "Online Description Tool Format",
+            "version": None,
+            "extensions": "odt,odf",
+        },
+    ]
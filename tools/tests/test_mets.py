@@ -0,0 +1,70 @@
+import metsrw
+import pytest
+
+from AIPscan.Aggregator import database_helpers
+from AIPscan.Aggregator.mets_parse_helpers import get_aip_original_name
+from tools.helpers import mets
+
+PACKAGE_UUID = "91940daf-5c33-4670-bfc8-9108f32bca7b"
+
+
+def _files(mets_document, use):
+    return [file_ for file_ in mets_document.all_files() if file_.use == use]
+
+
+@pytest.mark.parametrize(
+    "file_count, preservation_ratio, expected_preservation_files",
+    [(5, 0.0, 0), (5, 1.0, 5)],
+)
+def test_generate_mets(file_count, preservation_ratio, expected_preservation_files):
+    mets_document = metsrw.METSDocument.fromstring(
+        mets.generate_mets(
+            PACKAGE_UUID,
+            file_count=file_count,
+            events_per_file=2,
+            agent_count=4,
+            preservation_ratio=preservation_ratio,
+        )
+    )
+
+    assert get_aip_original_name(mets_document) == "transfer-91940daf"
+
+    original_files = _files(mets_document, "original")
+    preservation_files = _files(mets_document, "preservation")
+    assert len(original_files) == file_count
+    assert len(preservation_files) == expected_preservation_files
+
+    for file_ in original_files + preservation_files:
+        events = file_.get_premis_events()
+        assert len(events) == 2
+        assert all(len(event.linking_agent_identifier) == 4 for event in events)
+
+    assert len(database_helpers.collect_mets_agents(mets_document)) == 4
+
+    properties = database_helpers._get_file_properties(original_files[0])
+    assert properties["puid"]
+    assert properties["file_format"]
+    assert properties["size"]
+    assert properties["checksum_type"] == "sha256"
+
+    original_uuids = {file_.file_uuid for file_ in original_files}
+    for file_ in preservation_files:
+        properties = database_helpers._get_file_properties(file_)
+        assert properties["related_uuid"] in original_uuids
+        assert file_.get_premis_events()[0].event_type == "creation"
+
+
+def test_generate_mets_is_deterministic():
+    assert mets.generate_mets(PACKAGE_UUID) == mets.generate_mets(PACKAGE_UUID)
+    assert mets.generate_mets(PACKAGE_UUID) != mets.generate_mets(
+        "902192d9-6232-4d5f-b6c4-dfa7b8733960"
+    )
+
+
+def test_generate_mets_payload_size():
+    unpadded = mets.generate_mets(PACKAGE_UUID)
+    padded = mets.generate_mets(PACKAGE_UUID, payload_size=len(unpadded) * 10)
+
+    assert len(padded) >= len(unpadded) * 10
+    assert len(padded) < len(unpadded) * 11
+    metsrw.METSDocument.fromstring(padded)
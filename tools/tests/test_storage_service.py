@@ -0,0 +1,89 @@
+import metsrw
+import pytest
+from werkzeug.test import Client
+
+from AIPscan.Aggregator.task_helpers import process_package_object
+from tools.helpers import storage_service
+
+CREDENTIALS = {"username": "test", "api_key": "test"}
+
+
+@pytest.fixture
+def mock_storage_service():
+    return storage_service.MockStorageService(
+        package_count=5, location_count=2, file_count=2, seed=1
+    )
+
+
+@pytest.fixture
+def client(mock_storage_service):
+    return Client(mock_storage_service)
+
+
+def test_file_list_pages(client):
+    response = client.get("/api/v2/file/", query_string={"limit": 2, **CREDENTIALS})
+    assert response.status_code == 200
+
+    packages = response.get_json()
+    assert packages["meta"]["total_count"] == 5
+    assert packages["meta"]["previous"] is None
+    assert len(packages["objects"]) == 2
+
+    seen = [package["uuid"] for package in packages["objects"]]
+    while packages["meta"]["next"] is not None:
+        packages = client.get(packages["meta"]["next"]).get_json()
+        seen += [package["uuid"] for package in packages["objects"]]
+
+    assert len(seen) == len(set(seen)) == 5
+
+
+def test_unauthorized(client):
+    response = client.get("/api/v2/file/", query_string={"username": "test"})
+    assert response.status_code == 401
+
+
+def test_location_and_pipeline(client, mock_storage_service):
+    package = client.get("/api/v2/file/", query_string=CREDENTIALS).get_json()[
+        "objects"
+    ][0]
+
+    # AIPscan requests these URLs without the trailing slash
+    location = client.get(
+        package["current_location"].rstrip("/"), query_string=CREDENTIALS
+    ).get_json()
+    assert location["description"] == "AIP Storage 1"
+
+    pipeline = client.get(
+        package["origin_pipeline"].rstrip("/"), query_string=CREDENTIALS
+    ).get_json()
+    assert pipeline["uuid"] == mock_storage_service.pipeline_uuid
+    assert pipeline["remote_name"]
+
+
+def test_extract_file(client, mock_storage_service):
+    package_obj = client.get("/api/v2/file/", query_string=CREDENTIALS).get_json()[
+        "objects"
+    ][0]
+    package = process_package_object(package_obj)
+
+    response = client.get(
+        f"/api/v2/file/{package.uuid}/extract_file/",
+        query_string={
+            "relative_path_to_file": package.get_relative_path(),
+            **CREDENTIALS,
+        },
+    )
+    assert response.status_code == 200
+    assert response.data == mock_storage_service.mets(package.uuid)
+    assert mock_storage_service.bytes_served == len(response.data)
+
+    mets_document = metsrw.METSDocument.fromstring(response.data)
+    assert len(mets_document.all_files()) > 2
+
+
+def test_extract_file_not_found(client):
+    response = client.get(
+        "/api/v2/file/91940daf-5c33-4670-bfc8-9108f32bca7b/extract_file/",
+        query_string={"relative_path_to_file": "METS.xml", **CREDENTIALS},
+    )
+    assert response.status_code == 404